@@ -1,24 +1,67 @@
-from flask import Flask, send_from_directory
+import os
+from flask import Flask
 from flask_cors import CORS
 from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
 from config import Config
 from models import db
+from models.engine import engine_options, apply_sqlite_profile
+from models.routing import replica_router, RoutingSession
+from models.recommendations import opportunity_index
+from utils.auth import user_cache, BatchJWTManager
+from utils.passwords import password_hasher
+from utils.file_utils import send_stored_file
+from utils.response_cache import configure_response_caches
+from utils.metrics import install_request_metrics
+from utils.query_detector import install_query_detector
+from utils.json_provider import configure_json
 from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.alumni import alumni_bp
 from routes.student import student_bp
 from routes.profile import profile_bp
+from routes.batch import batch_bp
+from commands import register_commands, init_db, seed_default_users
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
+    configure_json(app)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    # From the final FILE_SERVE_MODE, so subclasses and env overrides apply
+    app.config['USE_X_SENDFILE'] = app.config['FILE_SERVE_MODE'] == 'x-sendfile'
+    replica_binds = [f'replica_{i}' for i in range(len(app.config['DATABASE_REPLICA_URLS']))]
+    if replica_binds:
+        app.config['SQLALCHEMY_BINDS'] = {
+            **(app.config.get('SQLALCHEMY_BINDS') or {}),
+            **dict(zip(replica_binds, app.config['DATABASE_REPLICA_URLS']))
+        }
     
     
     db.init_app(app)
-    migrate = Migrate(app, db)
+    with app.app_context():
+        # Registers connect hooks only; no connection is opened here
+        for engine in db.engines.values():
+            apply_sqlite_profile(engine, app.config)
+        install_request_metrics(app, db.engines.values())
+        install_query_detector(app, db.engines.values(), RoutingSession)
+    replica_router.configure(
+        replica_binds, app.config['REPLICA_READ_ENDPOINTS'], app.config['REPLICA_STICKY_SECONDS'],
+        app.config['REPLICA_STICKY_PATH']
+    )
+    # Absolute, so init-db finds the migrations whatever the working directory
+    migrate = Migrate(app, db, directory=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations'))
     CORS(app)  
-    jwt = JWTManager(app)  
+    jwt = BatchJWTManager(app)  
+    user_cache.configure(app.config['USER_CACHE_SIZE'], app.config['USER_CACHE_TTL'])
+    password_hasher.configure(
+        app.config['BCRYPT_LOG_ROUNDS'],
+        app.config['BCRYPT_WORKERS'],
+        app.config['BCRYPT_MAX_PENDING'],
+        app.config['BCRYPT_TIMEOUT'],
+        app.config['BCRYPT_RETRY_AFTER']
+    )
+    configure_response_caches(app.config)
+    opportunity_index.configure(app.config['RECOMMENDATION_MAX_AGE'])
     
     
     app.register_blueprint(auth_bp)
@@ -26,78 +69,24 @@ def create_app():
     app.register_blueprint(alumni_bp)
     app.register_blueprint(student_bp)
     app.register_blueprint(profile_bp)
+    app.register_blueprint(batch_bp)
 
     
+    register_commands(app)
+    
     @app.route('/api/files/<path:filename>')
     def serve_file(filename):
-        from config import Config
-        return send_from_directory(Config.UPLOAD_FOLDER, filename, as_attachment=False)
+        return send_stored_file(filename)
     
     
-    with app.app_context():
-        db.create_all()
-        
-        
-        from models import User, AlumniProfile, StudentProfile
-        admin_user = User.query.filter_by(email='admin@alumni.com').first()
-        if not admin_user:
-            admin_user = User(
-                name='Admin User',
-                email='admin@alumni.com',
-                role='admin'
-            )
-            admin_user.set_password('admin123')
-            db.session.add(admin_user)
-            db.session.commit()
-            print("Default admin user created: admin@alumni.com / admin123")
-        
-      
-        alumni_user = User.query.filter_by(email='john@alumni.com').first()
-        if not alumni_user:
-            alumni_user = User(
-                name='John Alumni',
-                email='john@alumni.com',
-                role='alumni'
-            )
-            alumni_user.set_password('admin123')
-            db.session.add(alumni_user)
-            db.session.flush()  
-            
-           
-            alumni_profile = AlumniProfile(
-                user_id=alumni_user.id,
-                occupation='Software Engineer',
-                company='Tech Corp',
-                domain='Computer Science'
-            )
-            db.session.add(alumni_profile)
-            db.session.commit()
-            print("Test alumni user created: john@alumni.com / admin123")
-        
-        
-        student_user = User.query.filter_by(email='jane@student.com').first()
-        if not student_user:
-            student_user = User(
-                name='Jane Student',
-                email='jane@student.com',
-                role='student'
-            )
-            student_user.set_password('admin123')
-            db.session.add(student_user)
-            db.session.flush()  
-            
-            
-            student_profile = StudentProfile(
-                user_id=student_user.id,
-                cgpa=8.5,
-                category='General'
-            )
-            db.session.add(student_profile)
-            db.session.commit()
-            print("Test student user created: jane@student.com / admin123")
-    
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    # Development convenience: applies pending migrations (e.g. users.token_version)
+    # to an existing database; deployments run `flask init-db` / `flask db upgrade` once
+    with app.app_context():
+        init_db()
+        for email in seed_default_users():
+            print(f"Created {email} / admin123")
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Latency, throughput and SQL statements per request for every API endpoint.
+
+Fills a temporary SQLite database with the synthetic generator (or copies a
+snapshot given with ``--database``), then calls each endpoint of the auth,
+admin, alumni, student, profile, batch and files blueprints ``--requests`` times,
+either through the Flask test client (default) or over HTTP against a
+server started in this process (``--server``). Alumni and student routes
+run as the busiest alumnus and student. Endpoints that consume what they
+touch (delete, apply, withdraw) get one prepared row per request.
+
+Prints a table and, with ``--output``, writes JSON that ``--compare``
+diffs against an earlier run. Run from the backend directory:
+
+    python benchmarks/endpoints.py --output before.json
+    python benchmarks/endpoints.py --output after.json --compare before.json
+    python benchmarks/endpoints.py --database /tmp/large.db --requests 20
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import make_server
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity, Application
+from models.stats import recount_stats
+from utils.file_utils import store_content
+from utils.synthetic import generate_dataset
+from utils.query_counter import count_queries
+
+PASSWORD = 'admin123'
+
+
+def seed(args):
+    """Generate the dataset unless a snapshot was given; returns the benchmark accounts' ids"""
+    if not args.database:
+        generate_dataset(args.users, args.opportunities, args.applications, rounds=args.bcrypt_rounds)
+    # The busiest alumnus and student, so listings are as large as the dataset makes them
+    busiest_alumnus = (db.session.query(Opportunity.alumni_id).group_by(Opportunity.alumni_id)
+                       .order_by(db.func.count().desc()).limit(1).scalar())
+    busiest_student = (db.session.query(Application.student_id).group_by(Application.student_id)
+                       .order_by(db.func.count().desc()).limit(1).scalar())
+    default_id = dict(db.session.query(User.email, User.id).filter(
+        User.email.in_(['admin@alumni.com', 'john@alumni.com', 'jane@student.com'])))
+    return {
+        'admin': default_id['admin@alumni.com'],
+        'alumni': busiest_alumnus or default_id['john@alumni.com'],
+        'student': busiest_student or default_id['jane@student.com'],
+    }
+
+
+def prepare_pools(accounts, count, upload_dir):
+    """Rows consumed one per request by destructive endpoints, plus a stored file"""
+    now = datetime.utcnow()
+    source = os.path.join(upload_dir, 'resume.pdf')
+    os.makedirs(upload_dir, exist_ok=True)
+    with open(source, 'wb') as f:
+        f.write(os.urandom(200 * 1024))
+    with open(source, 'rb') as f:
+        stored_file = store_content(f, 'pdf', upload_dir)
+
+    def new_opportunities(alumni_id, label):
+        db.session.execute(Opportunity.__table__.insert(), [
+            {'alumni_id': alumni_id, 'type': 'internship', 'title': f'{label} {i}',
+             'description': 'Benchmark fixture', 'created_at': now} for i in range(count)])
+        return [row[0] for row in db.session.query(Opportunity.id).filter(Opportunity.title.like(f'{label} %'))]
+
+    pools = {
+        'delete_opportunity': new_opportunities(accounts['alumni'], 'Delete me'),
+        'apply': new_opportunities(accounts['admin'], 'Apply to me'),
+    }
+    withdraw = new_opportunities(accounts['admin'], 'Withdraw from me')
+    db.session.execute(Application.__table__.insert(), [
+        {'student_id': accounts['student'], 'opportunity_id': o, 'status': 'pending', 'applied_at': now}
+        for o in withdraw])
+    pools['withdraw'] = [row[0] for row in db.session.query(Application.id).filter(
+        Application.opportunity_id.in_(withdraw))]
+    db.session.execute(User.__table__.insert(), [
+        {'name': f'Victim {i}', 'email': f'victim{i}@example.com', 'role': 'student',
+         'password_hash': 'x', 'token_version': 1, 'created_at': now} for i in range(count)])
+    pools['delete_user'] = [row[0] for row in db.session.query(User.id).filter(User.email.like('victim%'))]
+    pools['alumni_applications'] = [row[0] for row in db.session.query(Application.id).join(Opportunity)
+                                  .filter(Opportunity.alumni_id == accounts['alumni']).limit(count)] or [0]
+    pools['alumni_opportunity'] = db.session.query(Opportunity.id).filter_by(
+        alumni_id=accounts['alumni']).first()[0]
+    pools['file'] = '/api/files/' + quote(stored_file, safe='')
+    recount_stats()
+    db.session.commit()
+    return pools
+
+
+def scenarios(accounts, pools, run_id):
+    """(name, role, method, request builder) for every endpoint; builders take the iteration"""
+    student, alumni = accounts['student'], accounts['alumni']
+    statuses = ['accepted', 'declined', 'pending']
+    dashboard = [{'method': 'GET', 'path': path} for path in (
+        '/api/student/opportunities?limit=20&type=internship', '/api/student/applications', '/api/student/profile')]
+
+    def fixed(path, body=None):
+        return lambda i: (path, body)
+
+    return [
+        # Registration checks the domain over DNS, so it needs a resolvable one
+        ('auth.register', None, 'POST', lambda i: ('/api/auth/register', {
+            'name': f'New {i}', 'email': f'new{run_id}_{i}@gmail.com', 'password': PASSWORD,
+            'role': 'student', 'cgpa': 8.0})),
+        ('auth.login', None, 'POST', fixed('/api/auth/login', {'email': 'jane@student.com', 'password': PASSWORD})),
+        ('auth.me', 'student', 'GET', fixed('/api/auth/me')),
+        ('admin.users', 'admin', 'GET', fixed('/api/admin/users')),
+        ('admin.users_page', 'admin', 'GET', fixed('/api/admin/users?page=2&per_page=20&sort=-created_at')),
+        ('admin.users_export', 'admin', 'GET', fixed('/api/admin/users/export?format=ndjson&role=alumni')),
+        ('admin.users_import', 'admin', 'POST', lambda i: ('/api/admin/users/import', {'users': [
+            {'name': f'Imported {i}-{j}', 'email': f'imported{run_id}_{i}_{j}@example.com',
+             'password': PASSWORD, 'role': 'student', 'cgpa': '7.5'} for j in range(5)]})),
+        ('admin.delete_user', 'admin', 'DELETE', lambda i: (f"/api/admin/users/{pools['delete_user'][i]}", None)),
+        ('admin.stats', 'admin', 'GET', fixed('/api/admin/stats')),
+        ('admin.cache_stats', 'admin', 'GET', fixed('/api/admin/cache-stats')),
+        ('admin.metrics', 'admin', 'GET', fixed('/api/admin/metrics')),
+        ('alumni.opportunities', 'alumni', 'GET', fixed('/api/alumni/opportunities')),
+        ('alumni.create_opportunity', 'alumni', 'POST', lambda i: ('/api/alumni/opportunities', {
+            'type': 'internship', 'title': f'Created {i}', 'description': 'Benchmark', 'category': 'General'})),
+        ('alumni.update_opportunity', 'alumni', 'PUT', lambda i: (
+            f"/api/alumni/opportunities/{pools['alumni_opportunity']}", {'description': f'Updated {i}'})),
+        ('alumni.delete_opportunity', 'alumni', 'DELETE', lambda i: (
+            f"/api/alumni/opportunities/{pools['delete_opportunity'][i]}", None)),
+        ('alumni.applications', 'alumni', 'GET', fixed('/api/alumni/applications')),
+        ('alumni.summary', 'alumni', 'GET', fixed('/api/alumni/summary')),
+        ('alumni.application_status', 'alumni', 'PUT', lambda i: (
+            f"/api/alumni/applications/{pools['alumni_applications'][i % len(pools['alumni_applications'])]}/status",
+            {'status': statuses[i % 3]})),
+        ('alumni.application_statuses', 'alumni', 'PUT', lambda i: ('/api/alumni/applications/status', {
+            'status': statuses[i % 3], 'filter': {'opportunity_id': pools['alumni_opportunity']}})),
+        ('alumni.profile', 'alumni', 'GET', fixed('/api/alumni/profile')),
+        ('alumni.update_profile', 'alumni', 'PUT', lambda i: ('/api/alumni/profile', {'company': f'Corp {i}'})),
+        ('student.opportunities', 'student', 'GET', fixed('/api/student/opportunities')),
+        ('student.opportunities_page', 'student', 'GET', fixed('/api/student/opportunities?limit=20&type=internship')),
+        ('student.search', 'student', 'GET', fixed('/api/student/opportunities/search?q=python')),
+        ('student.recommendations', 'student', 'GET', fixed('/api/student/recommendations')),
+        ('student.apply', 'student', 'POST', lambda i: (
+            f"/api/student/opportunities/{pools['apply'][i]}/apply", None)),
+        ('student.applications', 'student', 'GET', fixed('/api/student/applications')),
+        ('student.summary', 'student', 'GET', fixed('/api/student/summary')),
+        ('student.withdraw', 'student', 'DELETE', lambda i: (f"/api/student/applications/{pools['withdraw'][i]}", None)),
+        ('student.profile', 'student', 'GET', fixed('/api/student/profile')),
+        ('student.update_profile', 'student', 'PUT', lambda i: ('/api/student/profile', {'cgpa': 8.5})),
+        ('profile.get', 'student', 'GET', fixed(f'/api/profile?type=student&id={student}')),
+        ('profile.batch', 'alumni', 'GET', fixed(
+            f"/api/profiles?type=student&ids={','.join(str(student + i) for i in range(50))}")),
+        ('files.get', 'student', 'GET', fixed(pools['file'])),
+        ('profile.update', 'alumni', 'PUT', lambda i: (
+            f'/api/profile?type=alumni&id={alumni}', {'location': f'City {i % 5}'})),
+        # The student dashboard's page load as one round trip; compare with the three GETs above
+        ('batch.student_dashboard', 'student', 'POST', fixed('/api/batch', {'requests': dashboard})),
+        ('batch.student_dashboard_concurrent', 'student', 'POST', fixed(
+            '/api/batch', {'requests': dashboard, 'concurrency': len(dashboard)})),
+    ]
+
+
+class HTTPClient:
+    """Minimal stand-in for the test client that talks to a real server"""
+
+    def __init__(self, port):
+        self.port = port
+        self.conn = http.client.HTTPConnection('127.0.0.1', port)
+
+    def open(self, path, method, headers, json=None):
+        body = None
+        if json is not None:
+            body = globals()['json'].dumps(json)
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        self.conn.request(method, path, body=body, headers=headers)
+        response = self.conn.getresponse()
+        response.read()
+        response.status_code = response.status
+        return response
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    tmp = tempfile.mkdtemp()
+
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        RESPONSE_CACHE_BACKEND = args.response_cache
+        RESPONSE_CACHE_PATH = os.path.join(tmp, 'response_cache.db')
+        UPLOAD_FOLDER = os.path.join(tmp, 'uploads')
+        BCRYPT_LOG_ROUNDS = args.bcrypt_rounds
+        BCRYPT_WORKERS = 0
+        IMPORT_WORKERS = 1
+
+    if args.database:
+        shutil.copy(args.database, os.path.join(tmp, 'bench.db'))
+    app = create_app(BenchConfig)
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        accounts = seed(args)
+        pools = prepare_pools(accounts, args.requests + args.warmup, BenchConfig.UPLOAD_FOLDER)
+        tokens = {role: create_access_token(identity=str(user_id)) for role, user_id in accounts.items()}
+        engine = db.engine
+
+    if args.server:
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        server = make_server('127.0.0.1', 0, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = HTTPClient(server.port)
+    else:
+        client = app.test_client()
+
+    results = {}
+    for name, role, method, build in scenarios(accounts, pools, int(time.time())):
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        headers = {'Authorization': f'Bearer {tokens[role]}'} if role else {}
+        latencies, statements, errors = [], [], 0
+        started = time.perf_counter()
+        for i in range(args.warmup + args.requests):
+            path, body = build(i)
+            with count_queries(engine) as counter:
+                request_started = time.perf_counter()
+                response = client.open(path, method=method, headers=headers, json=body)
+                if not args.server:
+                    response.get_data()  # streamed bodies are produced while being read
+                elapsed = time.perf_counter() - request_started
+            response.close()
+            if i < args.warmup:
+                started = time.perf_counter()
+                continue
+            if response.status_code >= 400:
+                errors += 1
+            latencies.append(elapsed * 1000)
+            statements.append(counter.count)
+        total = time.perf_counter() - started
+        results[name] = {
+            'method': method,
+            'requests': len(latencies),
+            'errors': errors,
+            'p50_ms': round(percentile(latencies, 50), 3),
+            'p95_ms': round(percentile(latencies, 95), 3),
+            'p99_ms': round(percentile(latencies, 99), 3),
+            'rps': round(len(latencies) / total, 1),
+            'statements_per_request': round(sum(statements) / len(statements), 2),
+        }
+        print(f"{name:<30} {results[name]['p50_ms']:8.2f} {results[name]['p95_ms']:8.2f} "
+              f"{results[name]['p99_ms']:8.2f} {results[name]['rps']:8.1f} "
+              f"{results[name]['statements_per_request']:6.1f} {errors:5d}")
+
+    if args.server:
+        server.shutdown()
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'mode': 'server' if args.server else 'test_client',
+            'dataset': args.database or {'users': args.users, 'opportunities': args.opportunities,
+                                         'applications': args.applications},
+            'requests': args.requests,
+            'bcrypt_rounds': args.bcrypt_rounds,
+            'response_cache': args.response_cache,
+        },
+        'endpoints': results,
+    }
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)['endpoints']
+    print(f"\n{'compared to ' + baseline_path:<30} {'p50':>9} {'p95':>9} {'stmts':>9}")
+    for name, result in current['endpoints'].items():
+        old = baseline.get(name)
+        if not old:
+            print(f'{name:<30} (new)')
+            continue
+
+        def delta(key):
+            return f"{(result[key] - old[key]) / old[key] * 100:+8.1f}%" if old[key] else '      n/a'
+        print(f"{name:<30} {delta('p50_ms')} {delta('p95_ms')} "
+              f"{result['statements_per_request'] - old['statements_per_request']:+9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=50, help='measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--opportunities', type=int, default=1000)
+    parser.add_argument('--applications', type=int, default=5000)
+    parser.add_argument('--database', help='copy of this SQLite file (e.g. built with flask generate-data) '
+                                           'instead of generating a dataset')
+    parser.add_argument('--bcrypt-rounds', type=int, default=Config.BCRYPT_LOG_ROUNDS)
+    parser.add_argument('--response-cache', default='lru', choices=['lru', 'sqlite', 'none'])
+    parser.add_argument('--server', action='store_true', help='go over HTTP to a local threaded server')
+    parser.add_argument('--only', nargs='+', help='endpoint name prefixes, e.g. student. auth.login')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--compare', help='JSON from an earlier run to diff against')
+    args = parser.parse_args()
+
+    print(f"{'endpoint':<30} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8} {'stmts':>6} {'err':>5}")
+    result = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Resume download throughput: Flask streaming vs. X-Accel-Redirect offload.
+
+Starts the app on a local port twice: once serving files itself, once in
+x-accel-redirect mode behind a small threaded proxy that stands in for nginx
+(it forwards the request, and when the app answers with X-Accel-Redirect it
+sends the file from disk itself). Client threads then download full files,
+revalidate them with If-None-Match and fetch byte ranges. Run from the
+backend directory:
+
+    python benchmarks/file_serving.py --threads 8 --requests 50 --size-mb 2
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.serving import make_server
+from app import create_app
+from commands import init_db
+from config import Config
+from utils.file_utils import store_content
+
+
+def start_app(tmp, mode, upload_dir):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, mode + '.db')}"
+        UPLOAD_FOLDER = upload_dir
+        FILE_SERVE_MODE = mode
+        BCRYPT_WORKERS = 0
+        BCRYPT_LOG_ROUNDS = 4
+    app = create_app(BenchConfig)
+    with app.app_context():
+        init_db()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_proxy(backend_port, upload_dir, prefix):
+    """A minimal stand-in for nginx honouring X-Accel-Redirect"""
+
+    class ProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            upstream = http.client.HTTPConnection('127.0.0.1', backend_port)
+            headers = {k: v for k, v in self.headers.items() if k.lower() != 'host'}
+            upstream.request('GET', self.path, headers=headers)
+            response = upstream.getresponse()
+            body = response.read()
+            redirect = response.getheader('X-Accel-Redirect')
+            upstream.close()
+
+            if response.status != 200 or not redirect:
+                self.send_response(response.status)
+                for key, value in response.getheaders():
+                    if key.lower() not in ('connection', 'transfer-encoding', 'content-length'):
+                        self.send_header(key, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            path = os.path.join(upload_dir, redirect[len(prefix):])
+            size = os.path.getsize(path)
+            start, end = 0, size - 1
+            range_header = self.headers.get('Range')
+            if range_header and range_header.startswith('bytes='):
+                first, _, last = range_header[6:].partition('-')
+                start, end = int(first), int(last) if last else size - 1
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+            else:
+                self.send_response(200)
+            for key, value in response.getheaders():
+                if key.lower() in ('content-type', 'etag', 'last-modified', 'cache-control'):
+                    self.send_header(key, value)
+            self.send_header('Content-Length', str(end - start + 1))
+            self.end_headers()
+            with open(path, 'rb') as f:
+                f.seek(start)
+                remaining = end - start + 1
+                while remaining:
+                    chunk = f.read(min(remaining, 256 * 1024))
+                    self.wfile.write(chunk)
+                    remaining -= len(chunk)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ProxyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def drive(port, paths, threads, requests, headers_for):
+    """Issue requests from several threads; return (requests/s, MB/s)"""
+    total_bytes = [0]
+    lock = threading.Lock()
+
+    def worker(n):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        received = 0
+        for i in range(requests):
+            path = paths[(n + i) % len(paths)]
+            conn.request('GET', path, headers=headers_for(path))
+            response = conn.getresponse()
+            received += len(response.read())
+            if response.getheader('Connection', '').lower() == 'close' or response.version == 10:
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.close()
+        with lock:
+            total_bytes[0] += received
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return threads * requests / elapsed, total_bytes[0] / elapsed / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=30, help='requests per thread')
+    parser.add_argument('--files', type=int, default=4)
+    parser.add_argument('--size-mb', type=float, default=2)
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    tmp = tempfile.mkdtemp()
+    try:
+        upload_dir = os.path.join(tmp, 'uploads')
+        names = []
+        for i in range(args.files):
+            with open(os.path.join(tmp, 'src'), 'wb') as f:
+                f.write(os.urandom(int(args.size_mb * 1024 * 1024)))
+            with open(os.path.join(tmp, 'src'), 'rb') as f:
+                names.append(store_content(f, 'pdf', upload_dir))
+        paths = ['/api/files/' + quote(name, safe='') for name in names]
+
+        direct = start_app(tmp, 'flask', upload_dir)
+        offload_app = start_app(tmp, 'x-accel-redirect', upload_dir)
+        proxy = start_proxy(offload_app.server_port, upload_dir, Config.X_ACCEL_REDIRECT_PREFIX)
+
+        # Learn the ETags once for the revalidation scenario
+        etags = {}
+        for path in paths:
+            conn = http.client.HTTPConnection('127.0.0.1', direct.server_port)
+            conn.request('GET', path)
+            response = conn.getresponse()
+            response.read()
+            etags[path] = response.getheader('ETag')
+            conn.close()
+
+        scenarios = [
+            ('full download', lambda path: {}),
+            ('If-None-Match', lambda path: {'If-None-Match': etags[path]}),
+            ('Range 64KB', lambda path: {'Range': 'bytes=0-65535'}),
+        ]
+        print(f"{'scenario':<15} {'setup':<22} {'req/s':>9} {'MB/s':>9}")
+        for label, headers_for in scenarios:
+            for setup, port in [('flask streams', direct.server_port),
+                                ('proxy + X-Accel', proxy.server_port)]:
+                rps, mbps = drive(port, paths, args.threads, args.requests, headers_for)
+                print(f"{label:<15} {setup:<22} {rps:>9.1f} {mbps:>9.1f}")
+
+        for server in (direct, offload_app, proxy):
+            server.shutdown()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Login throughput under concurrency, with and without the bcrypt process pool.
+
+A number of client threads log in as fast as they can while a probe thread
+keeps calling a cheap endpoint; the probe latency shows how much a login
+burst slows down everything else. Run from the backend directory:
+
+    python benchmarks/login_throughput.py --threads 16 --logins 20 --workers 0 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db
+from config import Config
+from models import db, User
+from utils.passwords import password_hasher
+
+PASSWORD = 'benchmark-password'
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def make_app(database_path, workers, rounds, max_pending):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+        BCRYPT_WORKERS = workers
+        BCRYPT_LOG_ROUNDS = rounds
+        BCRYPT_MAX_PENDING = max_pending
+    return create_app(BenchConfig)
+
+
+def run(workers, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = make_app(os.path.join(tmp, 'bench.db'), workers, args.rounds, args.max_pending)
+        with app.app_context():
+            init_db()
+            password_hash = password_hasher.hash(PASSWORD)
+            db.session.add_all([
+                User(name=f'Bench {i}', email=f'bench{i}@example.com', role='student',
+                     password_hash=password_hash)
+                for i in range(args.threads)
+            ])
+            db.session.commit()
+            probe_user = User.query.filter_by(email='bench0@example.com').first()
+            probe_token = create_access_token(identity=str(probe_user.id))
+
+        login_times, probe_times = [], []
+        rejected = [0]
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def login_worker(i):
+            client = app.test_client()
+            for _ in range(args.logins):
+                start = time.perf_counter()
+                response = client.post('/api/auth/login',
+                                       json={'email': f'bench{i}@example.com', 'password': PASSWORD})
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if response.status_code == 503:
+                        rejected[0] += 1
+                    else:
+                        login_times.append(elapsed)
+
+        def probe_worker():
+            client = app.test_client()
+            headers = {'Authorization': f'Bearer {probe_token}'}
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get('/api/student/opportunities?limit=5', headers=headers)
+                probe_times.append(time.perf_counter() - start)
+                time.sleep(0.005)
+
+        probe = threading.Thread(target=probe_worker)
+        probe.start()
+        threads = [threading.Thread(target=login_worker, args=(i,)) for i in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+        done.set()
+        probe.join()
+        password_hasher.shutdown()
+
+    return {
+        'workers': workers,
+        'logins_per_sec': len(login_times) / wall,
+        'login_p50_ms': statistics.median(login_times) * 1000 if login_times else 0.0,
+        'login_p95_ms': percentile(login_times, 95) * 1000,
+        'rejected_503': rejected[0],
+        'probe_p50_ms': statistics.median(probe_times) * 1000 if probe_times else 0.0,
+        'probe_p95_ms': percentile(probe_times, 95) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, default=8, help='concurrent login clients')
+    parser.add_argument('--logins', type=int, default=10, help='logins per client')
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4],
+                        help='BCRYPT_WORKERS values to compare (0 = hash inline)')
+    parser.add_argument('--rounds', type=int, default=Config.BCRYPT_LOG_ROUNDS)
+    parser.add_argument('--max-pending', type=int, default=Config.BCRYPT_MAX_PENDING)
+    args = parser.parse_args()
+
+    print(f"{'workers':>7} {'logins/s':>9} {'login p50':>10} {'login p95':>10} "
+          f"{'503s':>5} {'probe p50':>10} {'probe p95':>10}")
+    for workers in args.workers:
+        r = run(workers, args)
+        print(f"{r['workers']:>7} {r['logins_per_sec']:>9.1f} {r['login_p50_ms']:>8.1f}ms "
+              f"{r['login_p95_ms']:>8.1f}ms {r['rejected_503']:>5} "
+              f"{r['probe_p50_ms']:>8.1f}ms {r['probe_p95_ms']:>8.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Recommendation latency over a large opportunity table.
+
+Fills a temporary SQLite database with synthetic opportunities, times the
+initial feature-matrix build, the scoring call for varied student profiles
+and the full GET /api/student/recommendations request, then an incremental
+update after an opportunity edit. Run from the backend directory:
+
+    python benchmarks/recommendations.py --opportunities 100000 --requests 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity
+from models.recommendations import opportunity_index
+
+WORDS = ('python machine learning data science react frontend backend cloud devops '
+         'security research finance marketing design embedded robotics analytics mobile '
+         'android sql java golang rust networking writing sales operations').split()
+CATEGORIES = ['General', 'OBC', 'SC', 'ST', 'EWS']
+CITIES = ['Pune', 'Delhi', 'Mumbai', 'Bangalore', 'Chennai', 'Remote', 'Hyderabad']
+TYPES = ['internship', 'scholarship', 'mentorship', 'success_story']
+
+
+def seed(count, alumni_id):
+    rng = random.Random(42)
+    today = date.today()
+    now = datetime.utcnow()
+    rows = []
+    for i in range(count):
+        rows.append({
+            'alumni_id': alumni_id,
+            'type': rng.choice(TYPES),
+            'title': ' '.join(rng.sample(WORDS, 3)).title(),
+            'description': ' '.join(rng.choices(WORDS, k=40)),
+            'requirements': ' '.join(rng.sample(WORDS, 5)),
+            'min_cgpa': rng.choice([None, 6.0, 7.0, 8.0, 9.0]),
+            'category': rng.choice(CATEGORIES),
+            'location': rng.choice(CITIES),
+            'deadline': rng.choice([None, today + timedelta(days=rng.randint(-30, 120))]),
+            'created_at': now - timedelta(minutes=i),
+        })
+        if len(rows) == 5000:
+            db.session.execute(Opportunity.__table__.insert(), rows)
+            rows = []
+    if rows:
+        db.session.execute(Opportunity.__table__.insert(), rows)
+    db.session.commit()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, samples):
+    print(f'{label:<28} p50={percentile(samples, 50):7.2f} ms  p95={percentile(samples, 95):7.2f} ms  '
+          f'max={max(samples):7.2f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opportunities', type=int, default=100000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+            RESPONSE_CACHE_BACKEND = 'none'
+            BCRYPT_WORKERS = 0
+            BCRYPT_LOG_ROUNDS = 4
+
+        app = create_app(BenchConfig)
+        client = app.test_client()
+        rng = random.Random(7)
+
+        with app.app_context():
+            init_db()
+            seed_default_users()
+            alumni_id = User.query.filter_by(email='john@alumni.com').first().id
+            student_id = User.query.filter_by(email='jane@student.com').first().id
+            token = create_access_token(identity=str(student_id))
+            started = time.perf_counter()
+            seed(args.opportunities, alumni_id)
+            print(f'seeded {args.opportunities} opportunities in {time.perf_counter() - started:.1f} s')
+
+            started = time.perf_counter()
+            opportunity_index._build()
+            print(f'feature matrix build          {(time.perf_counter() - started) * 1000:9.1f} ms')
+
+            samples = []
+            for _ in range(args.requests):
+                profile = {
+                    'cgpa': rng.choice([None, 6.5, 7.5, 8.5, 9.5]),
+                    'category': rng.choice(CATEGORIES),
+                    'location': rng.choice(CITIES),
+                    'bio': ' '.join(rng.sample(WORDS, 6)),
+                }
+                started = time.perf_counter()
+                opportunity_index.recommend(profile, args.k)
+                samples.append((time.perf_counter() - started) * 1000)
+            report('score + top-k', samples)
+
+            opportunity = Opportunity.query.filter(Opportunity.type != 'success_story').first()
+            opportunity.description = 'rust embedded robotics'
+            started = time.perf_counter()
+            db.session.commit()
+            print(f'commit with incremental update {(time.perf_counter() - started) * 1000:8.2f} ms')
+
+        headers = {'Authorization': f'Bearer {token}'}
+        samples = []
+        for _ in range(args.requests):
+            started = time.perf_counter()
+            response = client.get(f'/api/student/recommendations?limit={args.k}', headers=headers)
+            samples.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.get_json()
+        report('GET /recommendations', samples)
+
+
+if __name__ == '__main__':
+    main()
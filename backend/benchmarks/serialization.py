@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Time building the opportunity listing response body, step by step.
+
+Compares ORM objects with ``to_dict()`` against the column serializer, the
+standard library encoder against orjson, and a full listing against a
+sparse fieldset, on an in-memory database. Each variant produces the body
+the endpoint would send; the time covers the query, dict building and
+encoding. Run from the backend directory:
+
+    python benchmarks/serialization.py --opportunities 5000
+
+The list view fields are those a listing page renders (LIST_FIELDS).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity
+from models.query_shapes import with_opportunity_relations
+from models.serializers import opportunity_serializer
+from utils.json_provider import OrjsonProvider, orjson
+
+LIST_FIELDS = 'id,type,title,company,location,deadline,alumni_name'
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    RESPONSE_CACHE_BACKEND = 'none'
+    BCRYPT_LOG_ROUNDS = 4
+
+
+def seed(count):
+    alumni_id = User.query.filter_by(email='john@alumni.com').first().id
+    now = datetime.utcnow()
+    db.session.execute(Opportunity.__table__.insert(), [{
+        'alumni_id': alumni_id, 'type': 'internship', 'title': f'Software Engineering Intern {i}',
+        'description': 'Work with the platform team on services and tooling. ' * 12,
+        'requirements': 'Python, SQL, and an interest in distributed systems. ' * 4,
+        'company': 'Tech Corp', 'location': 'Bengaluru', 'category': 'General', 'min_cgpa': 7.0,
+        'deadline': (now + timedelta(days=30)).date(), 'created_at': now - timedelta(minutes=i),
+    } for i in range(count)])
+    db.session.commit()
+
+
+def variants(app):
+    stdlib, fast = DefaultJSONProvider(app), OrjsonProvider(app) if orjson else None
+    fields = opportunity_serializer.parse_fields(LIST_FIELDS)
+
+    def orm(provider):
+        opportunities = with_opportunity_relations(Opportunity.query).all()
+        return provider.response({'opportunities': [opp.to_dict() for opp in opportunities]}).get_data()
+
+    def rows(provider, names=None):
+        query = opportunity_serializer.query(names)
+        return provider.response({'opportunities': list(opportunity_serializer.dump(query, names))}).get_data()
+
+    yield 'orm + to_dict + json', lambda: orm(stdlib)
+    yield 'rows + json', lambda: rows(stdlib)
+    if fast:
+        yield 'orm + to_dict + orjson', lambda: orm(fast)
+        yield 'rows + orjson', lambda: rows(fast)
+        yield 'rows + orjson, list view fields', lambda: rows(fast, fields)
+    else:
+        print('orjson is not installed; skipping the orjson variants')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--opportunities', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        seed(args.opportunities)
+
+        print(f'{"variant":<34} {"median":>9} {"min":>9} {"body":>10}')
+        baseline = None
+        for name, build in variants(app):
+            body = build()
+            times = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                build()
+                times.append(time.perf_counter() - started)
+                db.session.expire_all()
+            median = statistics.median(times)
+            baseline = baseline or median
+            print(f'{name:<34} {median * 1000:7.1f}ms {min(times) * 1000:7.1f}ms {len(body) / 1024:8.0f}KB'
+                  f'  x{baseline / median:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write throughput on SQLite: default journaling vs. the WAL profile.
+
+Starts the app on a local port once per profile, each with its own database
+file, and runs reader threads (opportunity listing and applications) next
+to writer threads (creating and editing opportunities) against the real
+routes for a fixed time. Reports requests per second, latency percentiles
+and failed requests ("database is locked" surfaces as a 500). Run from the
+backend directory:
+
+    python benchmarks/sqlite_concurrency.py --readers 8 --writers 4 --seconds 10
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import make_server
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity
+
+PROFILES = {
+    # What the app did before: SQLite's defaults on every connection
+    'default': {
+        'SQLITE_JOURNAL_MODE': None, 'SQLITE_SYNCHRONOUS': None, 'SQLITE_BUSY_TIMEOUT': None,
+        'SQLITE_MMAP_SIZE': None, 'SQLITE_CACHE_SIZE': None,
+    },
+    # The values from Config
+    'wal': {},
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def start_app(tmp, profile, pool_size, opportunities):
+    settings = dict(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(tmp, profile + '.db')}",
+        RESPONSE_CACHE_BACKEND='none',
+        BCRYPT_WORKERS=0,
+        BCRYPT_LOG_ROUNDS=4,
+        DB_POOL_SIZE=pool_size,
+        **PROFILES[profile]
+    )
+    app = create_app(type('BenchConfig', (Config,), settings))
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        alumni_id = User.query.filter_by(email='john@alumni.com').first().id
+        student_id = User.query.filter_by(email='jane@student.com').first().id
+        db.session.execute(Opportunity.__table__.insert(), [
+            {'alumni_id': alumni_id, 'type': 'internship', 'title': f'Internship {i}',
+             'description': 'Seeded for the benchmark', 'created_at': datetime.utcnow()}
+            for i in range(opportunities)
+        ])
+        db.session.commit()
+        tokens = {
+            'alumni': create_access_token(identity=str(alumni_id)),
+            'student': create_access_token(identity=str(student_id)),
+        }
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, tokens
+
+
+def run(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        server, tokens = start_app(tmp, profile, args.pool_size, args.opportunities)
+        results = {'read': [], 'write': []}
+        failures = {'read': 0, 'write': 0}
+        lock = threading.Lock()
+        deadline = time.time() + args.seconds
+
+        def request(conn, method, path, role, body=None):
+            headers = {'Authorization': f'Bearer {tokens[role]}', 'Content-Type': 'application/json'}
+            conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+
+        def reader(i):
+            conn = http.client.HTTPConnection('127.0.0.1', server.port)
+            paths = [('/api/student/opportunities?limit=20', 'student'),
+                     ('/api/alumni/applications', 'alumni')]
+            n = 0
+            while time.time() < deadline:
+                path, role = paths[n % len(paths)]
+                n += 1
+                started = time.perf_counter()
+                status, _ = request(conn, 'GET', path, role)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    if status >= 500:
+                        failures['read'] += 1
+                    else:
+                        results['read'].append(elapsed)
+
+        def writer(i):
+            conn = http.client.HTTPConnection('127.0.0.1', server.port)
+            created = None
+            n = 0
+            while time.time() < deadline:
+                n += 1
+                started = time.perf_counter()
+                if created is None or n % 2:
+                    status, body = request(conn, 'POST', '/api/alumni/opportunities', 'alumni', {
+                        'type': 'internship', 'title': f'Writer {i} #{n}', 'description': 'Benchmark'})
+                    if status == 201:
+                        created = json.loads(body)['opportunity']['id']
+                else:
+                    status, _ = request(conn, 'PUT', f'/api/alumni/opportunities/{created}', 'alumni',
+                                        {'description': f'Edited {n}'})
+                elapsed = time.perf_counter() - started
+                with lock:
+                    if status >= 500:
+                        failures['write'] += 1
+                    else:
+                        results['write'].append(elapsed)
+
+        threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        server.shutdown()
+
+        for kind in ('read', 'write'):
+            times = results[kind]
+            print(f'{profile:<8} {kind:<6} {len(times) / elapsed:9.1f} {percentile(times, 50) * 1000:8.1f}ms '
+                  f'{percentile(times, 95) * 1000:8.1f}ms {percentile(times, 99) * 1000:8.1f}ms {failures[kind]:7d}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--opportunities', type=int, default=2000)
+    parser.add_argument('--pool-size', type=int, default=Config.DB_POOL_SIZE)
+    parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    print(f'{"profile":<8} {"kind":<6} {"req/s":>9} {"p50":>10} {"p95":>10} {"p99":>10} {"failed":>7}')
+    for profile in args.profiles:
+        run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
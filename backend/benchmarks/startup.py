@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Process startup time: importing the app module and calling create_app().
+
+Each run is a fresh interpreter, like a new gunicorn worker, so import costs
+are not hidden by module caching. Prints the median and worst time of each
+phase, or one JSON object with --json for tracking over time. Run from the
+backend directory:
+
+    python benchmarks/startup.py --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter and prints its timings as JSON
+PROBE = """
+import json, time
+started = time.perf_counter()
+from app import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'create_app_ms': (created - imported) * 1000}))
+"""
+
+
+def measure():
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    # Point at a database that does not exist: create_app must not touch it
+    env.setdefault('DATABASE_URL', 'sqlite:////nonexistent/startup-benchmark.db')
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--json', action='store_true', help='print one machine-readable result')
+    args = parser.parse_args()
+
+    measure()  # warm the OS file cache and .pyc files
+    runs = [measure() for _ in range(args.runs)]
+
+    result = {'runs': args.runs}
+    for phase in ('import_ms', 'create_app_ms'):
+        values = [run[phase] for run in runs]
+        result[phase] = {'median': round(statistics.median(values), 2), 'max': round(max(values), 2)}
+    totals = [run['import_ms'] + run['create_app_ms'] for run in runs]
+    result['total_ms'] = {'median': round(statistics.median(totals), 2), 'max': round(max(totals), 2)}
+
+    if args.json:
+        print(json.dumps(result))
+        return
+    for phase in ('import_ms', 'create_app_ms', 'total_ms'):
+        print(f"{phase[:-3]:<12} median={result[phase]['median']:8.2f} ms  max={result[phase]['max']:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Check that every list endpoint runs a constant number of SQL statements.
+
+Each endpoint is called against a small and a larger in-memory dataset. The
+statement count must not grow with the number of rows and must stay within
+the budget declared below. The N+1 detector runs in raise mode as well, so a
+repeated SELECT shape fails the endpoint with the statement and the lazy
+load that issued it. Exits non-zero on any regression.
+"""
+
+import sys
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, AlumniProfile, StudentProfile, Opportunity, Application
+from utils.query_counter import count_queries
+from utils.query_detector import QueryProblem
+
+
+class QueryCountConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    RESPONSE_CACHE_BACKEND = 'none'
+    BCRYPT_LOG_ROUNDS = 4
+    TESTING = True  # let QueryProblem reach the test client
+    QUERY_DETECTOR = True
+    QUERY_DETECTOR_RAISE = True
+    QUERY_DETECTOR_SLOW_MS = 1000
+
+
+# (role, path, max statements per request)
+ENDPOINTS = [
+    ('student', '/api/student/opportunities', 2),
+    ('student', '/api/student/applications', 2),
+    ('alumni', '/api/alumni/opportunities', 2),
+    ('alumni', '/api/alumni/applications', 2),
+    ('student', '/api/student/summary', 4),
+    ('alumni', '/api/alumni/summary', 4),
+    ('admin', '/api/admin/users', 4),
+]
+
+
+def seed(rows):
+    """Add ``rows`` alumni, students, opportunities and applications"""
+    alumni, students = [], []
+    for i in range(rows):
+        alumnus = User(name=f'Alumni {i}', email=f'alumni{rows}_{i}@example.com', role='alumni',
+                       password_hash='x')
+        student = User(name=f'Student {i}', email=f'student{rows}_{i}@example.com', role='student',
+                       password_hash='x')
+        alumnus.alumni_profile = AlumniProfile(company='Tech Corp')
+        student.student_profile = StudentProfile(cgpa=8.0, category='General')
+        alumni.append(alumnus)
+        students.append(student)
+    db.session.add_all(alumni + students)
+    db.session.flush()
+
+    for i, alumnus in enumerate(alumni):
+        opportunity = Opportunity(alumni_id=alumnus.id, type='internship',
+                                  title=f'Internship {i}', description='Description')
+        db.session.add(opportunity)
+        db.session.flush()
+        db.session.add(Application(student_id=students[i].id, opportunity_id=opportunity.id))
+    db.session.commit()
+
+
+def measure(app, client, tokens):
+    counts = {}
+    with app.app_context():
+        engine = db.engine
+    for role, path, _ in ENDPOINTS:
+        headers = {'Authorization': f'Bearer {tokens[role]}'}
+        try:
+            with count_queries(engine) as counter:
+                response = client.get(path, headers=headers)
+        except QueryProblem as e:
+            print(f'{path}: {e}')
+            counts[path] = None
+            continue
+        if response.status_code != 200:
+            raise RuntimeError(f'{path} returned {response.status_code}: {response.get_data(as_text=True)}')
+        counts[path] = counter.count
+    return counts
+
+
+def main():
+    app = create_app(QueryCountConfig)
+    client = app.test_client()
+    failures = []
+
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        user_ids = {
+            role: str(User.query.filter_by(email=email).first().id)
+            for role, email in [('admin', 'admin@alumni.com'),
+                                ('alumni', 'john@alumni.com'),
+                                ('student', 'jane@student.com')]
+        }
+        tokens = {role: create_access_token(identity=user_id) for role, user_id in user_ids.items()}
+        seed(5)
+
+    small = measure(app, client, tokens)
+
+    with app.app_context():
+        # Give the logged-in users many rows of their own as well
+        seed(50)
+        john_id, jane_id = int(user_ids['alumni']), int(user_ids['student'])
+        for opportunity in Opportunity.query.limit(50).all():
+            opportunity.alumni_id = john_id
+            db.session.add(Application(student_id=jane_id, opportunity_id=opportunity.id))
+        db.session.commit()
+
+    large = measure(app, client, tokens)
+
+    for role, path, budget in ENDPOINTS:
+        status = 'ok'
+        if small[path] is None or large[path] is None:
+            status = 'FAIL (query problem, see above)'
+        elif large[path] > small[path]:
+            status = 'FAIL (grows with rows)'
+        elif large[path] > budget:
+            status = f'FAIL (budget {budget})'
+        if status != 'ok':
+            failures.append(path)
+        print(f'{path:35} small={small[path]!s:>4} large={large[path]!s:>4} {status}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Run EXPLAIN on every query the API routes issue and fail on full table scans.
+
+Each route is called through the test client against a seeded in-memory
+database. Every SELECT it executes is explained with its real parameters
+(EXPLAIN QUERY PLAN on SQLite, EXPLAIN on MySQL). Routes that read a whole
+table by design are listed in ALLOWED_SCANS. Exits non-zero on any
+unexpected scan or non-2xx response. The N+1 detector runs in raise mode
+too, so a route that repeats a SELECT shape fails as well.
+
+Set DATABASE_URL to check against another database instead.
+"""
+
+import os
+import sys
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity
+from utils.query_counter import count_queries
+from utils.query_detector import QueryProblem
+from check_query_counts import seed
+
+
+class QueryPlanConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite://'
+    RESPONSE_CACHE_BACKEND = 'none'
+    BCRYPT_LOG_ROUNDS = 4
+    TESTING = True  # let QueryProblem reach the test client
+    QUERY_DETECTOR = True
+    QUERY_DETECTOR_RAISE = True
+    QUERY_DETECTOR_SLOW_MS = 1000
+
+
+# (role, method, path, json body)
+ROUTES = [
+    ('student', 'GET', '/api/student/opportunities', None),
+    ('student', 'GET', '/api/student/opportunities?type=internship&category=General&min_cgpa=8', None),
+    ('student', 'GET', '/api/student/opportunities?limit=5', None),
+    ('student', 'GET', '/api/student/opportunities/search?q=internship', None),
+    ('student', 'GET', '/api/student/recommendations', None),
+    ('student', 'POST', '/api/student/opportunities/{opportunity_id}/apply', None),
+    ('student', 'GET', '/api/student/applications', None),
+    ('student', 'GET', '/api/student/summary', None),
+    ('student', 'GET', '/api/student/profile', None),
+    ('alumni', 'GET', '/api/alumni/opportunities', None),
+    ('alumni', 'GET', '/api/alumni/applications', None),
+    ('alumni', 'GET', '/api/alumni/summary', None),
+    ('alumni', 'GET', '/api/alumni/profile', None),
+    ('alumni', 'PUT', '/api/alumni/applications/status', {'status': 'pending', 'ids': [1, 2]}),
+    ('admin', 'GET', '/api/admin/users?page=2&per_page=5&role=student', None),
+    ('admin', 'GET', '/api/admin/users?page=1&per_page=5&sort=-created_at', None),
+    ('admin', 'GET', '/api/admin/stats', None),
+    ('student', 'GET', '/api/auth/me', None),
+    ('alumni', 'GET', '/api/profile?type=student&id={student_id}', None),
+    ('alumni', 'GET', '/api/profiles?type=student&ids={student_id},1,2,3', None),
+]
+
+# Routes that return or count every row of a table (recommendations build
+# their feature matrix from the whole table on first use)
+ALLOWED_SCANS = {
+    '/api/student/recommendations': {'opportunities'},
+    '/api/admin/stats': {'stats_counters'},
+}
+
+
+def full_scans(conn, statement, parameters):
+    """Return the tables a statement reads with a full table scan"""
+    if conn.dialect.name == 'sqlite':
+        plan = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+        scans = set()
+        # Scanning a materialized subquery reads its (limited) result, not a table
+        materialized = {row[-1].split()[1] for row in plan if row[-1].startswith('MATERIALIZE ')}
+        for row in plan:
+            detail = row[-1]
+            if detail.startswith('SCAN ') and ' USING ' not in detail \
+                    and 'VIRTUAL TABLE' not in detail and 'CONSTANT ROW' not in detail:
+                scans.add(detail.split()[1])
+        return scans - materialized
+    plan = conn.exec_driver_sql(f'EXPLAIN {statement}', parameters).mappings().fetchall()
+    return {row['table'] for row in plan if row['type'] == 'ALL'}
+
+
+def main():
+    app = create_app(QueryPlanConfig)
+    client = app.test_client()
+    failures = []
+
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        seed(20)
+        user_ids = {
+            role: User.query.filter_by(email=email).first().id
+            for role, email in [('admin', 'admin@alumni.com'),
+                                ('alumni', 'john@alumni.com'),
+                                ('student', 'jane@student.com')]
+        }
+        tokens = {role: create_access_token(identity=str(user_id)) for role, user_id in user_ids.items()}
+        opportunity_id = Opportunity.query.first().id
+        engine = db.engine
+
+    for role, method, path, body in ROUTES:
+        path = path.format(opportunity_id=opportunity_id, student_id=user_ids['student'])
+        headers = {'Authorization': f'Bearer {tokens[role]}'}
+        try:
+            with count_queries(engine) as counter:
+                response = client.open(path, method=method, headers=headers, json=body)
+        except QueryProblem as e:
+            failures.append(path)
+            print(f'FAIL {method} {path}: {e}')
+            continue
+        if not 200 <= response.status_code < 300:
+            failures.append(path)
+            print(f'FAIL {method} {path}: returned {response.status_code}')
+            continue
+
+        allowed = ALLOWED_SCANS.get(path.split('?')[0], set())
+        with engine.connect() as conn:
+            for statement, parameters in zip(counter.statements, counter.parameters):
+                if not statement.lstrip().upper().startswith('SELECT'):
+                    continue
+                scans = full_scans(conn, statement, parameters) - allowed
+                if scans:
+                    failures.append(path)
+                    print(f'FAIL {method} {path}: full scan of {", ".join(sorted(scans))}')
+                    print(f'     {" ".join(statement.split())}')
+        if path not in failures:
+            print(f'ok   {method} {path}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Check read-replica routing with two local SQLite files.
+
+The replica starts as a copy of the primary and then never receives
+updates, which stands in for replication lag. Each check makes a request
+through the test client and looks at which file answered. Exits non-zero if
+reads of a listed GET endpoint hit the primary, writes hit the replica, or
+a user does not see their own write right after making it (on any worker).
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from flask_jwt_extended import create_access_token
+from app import create_app
+from commands import init_db, seed_default_users
+from config import Config
+from models import db, User, Opportunity
+from models.routing import ReplicaRouter
+from utils.query_counter import count_queries
+
+
+def check_routing(tmp):
+    primary_path = os.path.join(tmp, 'primary.db')
+    replica_path = os.path.join(tmp, 'replica.db')
+
+    class ReplicaConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary_path}'
+        DATABASE_REPLICA_URLS = [f'sqlite:///{replica_path}']
+        REPLICA_STICKY_SECONDS = 1
+        REPLICA_STICKY_PATH = os.path.join(tmp, 'replica_pins.db')
+        RESPONSE_CACHE_BACKEND = 'none'
+        BCRYPT_LOG_ROUNDS = 4
+
+    app = create_app(ReplicaConfig)
+    client = app.test_client()
+    failures = []
+
+    with app.app_context():
+        init_db()
+        seed_default_users()
+        tokens = {
+            role: create_access_token(identity=str(User.query.filter_by(email=email).first().id))
+            for role, email in [('alumni', 'john@alumni.com'), ('student', 'jane@student.com')]
+        }
+        alumni_id = User.query.filter_by(email='john@alumni.com').first().id
+        db.engine.dispose()
+        with sqlite3.connect(primary_path) as src, sqlite3.connect(replica_path) as dst:
+            src.backup(dst)
+
+        # Written after the copy: only the primary has it
+        db.session.add(Opportunity(alumni_id=alumni_id, type='internship',
+                                   title='Primary only', description='Not replicated'))
+        db.session.commit()
+        primary, replica = db.engines[None], db.engines['replica_0']
+
+    def call(role, method, path, json=None):
+        headers = {'Authorization': f'Bearer {tokens[role]}'}
+        with count_queries(primary) as on_primary, count_queries(replica) as on_replica:
+            response = client.open(path, method=method, headers=headers, json=json)
+        return response, on_primary.count, on_replica.count
+
+    def check(name, ok, detail=''):
+        print(f'{"ok  " if ok else "FAIL"} {name}{": " + detail if detail and not ok else ""}')
+        if not ok:
+            failures.append(name)
+
+    def titles(response):
+        return {o['title'] for o in response.get_json()['opportunities']}
+
+    response, reads_primary, reads_replica = call('student', 'GET', '/api/student/opportunities')
+    check('listing reads from the replica', reads_primary == 0 and reads_replica > 0
+          and 'Primary only' not in titles(response), f'primary={reads_primary} replica={reads_replica}')
+
+    # The ranking (raw SQL) and the row load must read the same snapshot
+    response, reads_primary, reads_replica = call('student', 'GET', '/api/student/opportunities/search?q=primary')
+    check('search reads from the replica', response.status_code == 200 and reads_primary == 0
+          and reads_replica > 0, f'primary={reads_primary} replica={reads_replica}')
+
+    response, _, writes_replica = call('alumni', 'POST', '/api/alumni/opportunities', {
+        'type': 'internship', 'title': 'Fresh write', 'description': 'Just created'})
+    check('writes go to the primary', response.status_code == 201 and writes_replica == 0,
+          f'status={response.status_code} replica={writes_replica}')
+
+    response, reads_primary, reads_replica = call('alumni', 'GET', '/api/alumni/opportunities')
+    check('writer reads their own write', 'Fresh write' in titles(response) and reads_replica == 0,
+          f'replica={reads_replica}')
+
+    # Another worker process has a router of its own; it must see the same pin
+    other_worker = ReplicaRouter()
+    other_worker.configure(['replica_0'], [], 60, ReplicaConfig.REPLICA_STICKY_PATH)
+    check('other workers see the pin', other_worker.is_sticky(alumni_id))
+
+    response, _, reads_replica = call('student', 'GET', '/api/student/opportunities')
+    check('other users keep reading the replica', reads_replica > 0 and 'Fresh write' not in titles(response))
+
+    response, _, reads_replica = call('student', 'GET', '/api/auth/me')
+    check('endpoints not listed read the primary', reads_replica == 0)
+
+    time.sleep(ReplicaConfig.REPLICA_STICKY_SECONDS + 0.1)
+    response, _, reads_replica = call('alumni', 'GET', '/api/alumni/opportunities')
+    check('stickiness expires', reads_replica > 0 and 'Fresh write' not in titles(response))
+
+    return 1 if failures else 0
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        return check_routing(tmp)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Database setup and maintenance commands.
+
+Schema creation and demo data live here rather than in ``create_app`` so that
+building the app does no database I/O. Run them once per database:
+
+    flask --app app init-db
+    flask --app app seed
+
+``generate-data`` appends a synthetic dataset of any size for benchmarks.
+"""
+
+import time
+import click
+from flask_migrate import upgrade, stamp
+from sqlalchemy import inspect
+from models import db, User, AlumniProfile, StudentProfile
+from models.search import install_search_index
+
+DEFAULT_USERS = [
+    {
+        'name': 'Admin User', 'email': 'admin@alumni.com', 'role': 'admin',
+        'password': 'admin123',
+    },
+    {
+        'name': 'John Alumni', 'email': 'john@alumni.com', 'role': 'alumni',
+        'password': 'admin123',
+        'profile': {'occupation': 'Software Engineer', 'company': 'Tech Corp',
+                    'domain': 'Computer Science'},
+    },
+    {
+        'name': 'Jane Student', 'email': 'jane@student.com', 'role': 'student',
+        'password': 'admin123',
+        'profile': {'cgpa': 8.5, 'category': 'General'},
+    },
+]
+
+
+def init_db():
+    """
+    Bring the database schema up to date.
+
+    An empty database is built from the models (tables and search index) and
+    stamped at the newest migration; any other one, whether stamped or built
+    by an older init-db, is upgraded with the migrations.
+    """
+    if inspect(db.engine).get_table_names():
+        upgrade()
+        return
+    db.create_all()
+    install_search_index(db.engine)
+    stamp()
+
+
+def seed_default_users():
+    """Create the default admin and demo users that do not exist yet; returns their emails"""
+    created = []
+    for spec in DEFAULT_USERS:
+        # Only select the id so this also runs before pending migrations
+        if db.session.query(User.id).filter_by(email=spec['email']).first():
+            continue
+        user = User(name=spec['name'], email=spec['email'], role=spec['role'])
+        user.set_password(spec['password'])
+        if spec['role'] == 'alumni':
+            user.alumni_profile = AlumniProfile(**spec['profile'])
+        elif spec['role'] == 'student':
+            user.student_profile = StudentProfile(**spec['profile'])
+        db.session.add(user)
+        db.session.commit()
+        created.append(spec['email'])
+    return created
+
+
+def register_commands(app):
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create a new database, or apply pending migrations to an existing one"""
+        init_db()
+        print("Database initialized")
+
+    @app.cli.command('seed')
+    def seed_command():
+        """Create the default admin and demo users"""
+        for email in seed_default_users():
+            print(f"Created {email} / admin123")
+
+    @app.cli.command('recount-stats')
+    def recount_stats_command():
+        """Rebuild the admin dashboard counters from the tables"""
+        from models.stats import recount_stats
+        counts = recount_stats()
+        db.session.commit()
+        for name, value in sorted(counts.items()):
+            print(f"{name}: {value}")
+
+    @app.cli.command('import-users')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--chunk-size', type=int, default=None, help='Rows per transaction')
+    @click.option('--workers', type=int, default=None, help='Hashing processes (default: one per CPU)')
+    @click.option('--rounds', type=int, default=None,
+                  help='bcrypt cost for imported hashes; upgraded on first login')
+    def import_users_command(path, chunk_size, workers, rounds):
+        """Create users and profiles from a CSV or JSON file"""
+        from utils.bulk_import import parse_rows, import_users
+        with open(path, 'rb') as f:
+            rows = parse_rows(f.read(), path)
+        report = import_users(
+            rows,
+            chunk_size=chunk_size or app.config['IMPORT_CHUNK_SIZE'],
+            workers=workers or app.config['IMPORT_WORKERS'],
+            rounds=rounds
+        )
+        for error in report['errors']:
+            print(f"row {error['row']} ({error['email']}): {error['error']}")
+        print(f"{report['created']} of {report['total']} users imported, {report['failed']} failed")
+
+    @app.cli.command('generate-data')
+    @click.option('--users', type=int, default=10000, show_default=True)
+    @click.option('--opportunities', type=int, default=2000, show_default=True)
+    @click.option('--applications', type=int, default=50000, show_default=True)
+    @click.option('--chunk-size', type=int, default=None, help='Rows per transaction')
+    @click.option('--seed', type=int, default=0, show_default=True, help='Random seed')
+    @click.option('--rounds', type=int, default=4, show_default=True,
+                  help='bcrypt cost of the shared password hash; upgraded on first login')
+    def generate_data_command(users, opportunities, applications, chunk_size, seed, rounds):
+        """Append a synthetic dataset of the given size (password admin123)"""
+        from utils.synthetic import generate_dataset, DEFAULT_CHUNK_SIZE
+        started = time.perf_counter()
+        counts = generate_dataset(
+            users, opportunities, applications,
+            chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+            seed=seed,
+            rounds=rounds,
+            progress=lambda message: print(f"Generating {message}")
+        )
+        for name, value in counts.items():
+            print(f"{name}: {value}")
+        print(f"Done in {time.perf_counter() - started:.1f}s")
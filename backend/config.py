@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -8,8 +9,95 @@ class Config:
     # Use SQLite for easy setup, can be changed to MySQL later
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///alumni_connect.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Connection pool per worker process (not used for in-memory SQLite)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))  # seconds
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'True').lower() == 'true'
+    # SQLALCHEMY_ENGINE_OPTIONS defaults to the DB_POOL_* values above; set it
+    # in a subclass or the environment (JSON) to pass engine options directly
+    if os.environ.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        SQLALCHEMY_ENGINE_OPTIONS = json.loads(os.environ['SQLALCHEMY_ENGINE_OPTIONS'])
+    # Read replicas (comma-separated URLs). SELECTs of the GET endpoints below go
+    # to a replica; a user who just wrote reads from the primary for
+    # REPLICA_STICKY_SECONDS so they see their own changes. The pins live in
+    # REPLICA_STICKY_PATH, shared by the workers on one host
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',')
+                             if url.strip()]
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+    REPLICA_STICKY_PATH = os.environ.get('REPLICA_STICKY_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'instance', 'replica_pins.db')
+    REPLICA_READ_ENDPOINTS = [
+        'student.get_opportunities', 'student.search', 'student.get_recommendations',
+        'student.get_my_applications', 'student.get_summary', 'student.get_profile',
+        'alumni.get_my_opportunities', 'alumni.get_applications', 'alumni.get_summary',
+        'alumni.get_profile', 'admin.get_all_users', 'admin.export_users',
+        'profile.get_profile', 'profile.get_profiles',
+    ]
+    # SQLite profile applied to every pooled connection: WAL lets readers run
+    # alongside a writer, busy_timeout makes writers wait instead of failing
+    # with "database is locked". mmap_size is in bytes, cache_size in KiB
+    # when negative. Set a value to None in a subclass to keep SQLite's default.
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -64 * 1024))
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = False  # Tokens don't expire for simplicity
+    # Per-worker cache used by the role decorators
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 10000))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))  # seconds
+    # Response cache for the student opportunity listing: 'lru' (bodies per
+    # worker), 'sqlite' (bodies shared by the workers on one host) or 'none'.
+    # Both keep the invalidation generation in RESPONSE_CACHE_PATH (created on
+    # first use), so a write on any worker retires the cached listings of all
+    # of them within a second
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'lru')
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 256))  # entries
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))  # seconds
+    RESPONSE_CACHE_PATH = os.environ.get('RESPONSE_CACHE_PATH') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'instance', 'response_cache.db')
+    # Password hashing: bcrypt cost, process pool size (0 = hash inline) and
+    # how many hashes may be pending before requests get a 503
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', 2))
+    BCRYPT_MAX_PENDING = int(os.environ.get('BCRYPT_MAX_PENDING', 32))
+    BCRYPT_TIMEOUT = int(os.environ.get('BCRYPT_TIMEOUT', 30))  # seconds
+    BCRYPT_RETRY_AFTER = int(os.environ.get('BCRYPT_RETRY_AFTER', 1))  # seconds
+    # Rebuild each worker's recommendation matrix after this many seconds so
+    # it picks up opportunity changes made by other workers
+    RECOMMENDATION_MAX_AGE = int(os.environ.get('RECOMMENDATION_MAX_AGE', 300))
+    # Bulk user import: hashing processes for the CLI (0 = one per CPU), rows
+    # per transaction, and the most rows the HTTP route accepts (it hashes
+    # through the shared BCRYPT_WORKERS pool; larger files go to the CLI)
+    IMPORT_WORKERS = int(os.environ.get('IMPORT_WORKERS', 0))
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_MAX_ROWS = int(os.environ.get('IMPORT_MAX_ROWS', 200))
+    # Per-endpoint latency/SQL/size histograms served at /api/admin/metrics
+    # (per worker process), and an optional Server-Timing header on responses
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'False').lower() == 'true'
+    # Development aid: log SELECT shapes repeated this often in one request
+    # (likely N+1) and statements slower than QUERY_DETECTOR_SLOW_MS with their
+    # EXPLAIN plan; QUERY_DETECTOR_RAISE fails the request instead
+    QUERY_DETECTOR = os.environ.get('QUERY_DETECTOR', 'False').lower() == 'true'
+    QUERY_DETECTOR_REPEAT_THRESHOLD = int(os.environ.get('QUERY_DETECTOR_REPEAT_THRESHOLD', 5))
+    QUERY_DETECTOR_SLOW_MS = int(os.environ.get('QUERY_DETECTOR_SLOW_MS', 100))
+    QUERY_DETECTOR_RAISE = os.environ.get('QUERY_DETECTOR_RAISE', 'False').lower() == 'true'
+    # JSON encoder for responses: 'orjson' when the package is installed
+    # (same output, several times faster on large listings) or 'default'
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'orjson')
+    # POST /api/batch: sub-requests per batch, and how many GET items may run
+    # at once when a batch asks for "concurrency" (each on its own session)
+    BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+    BATCH_MAX_CONCURRENCY = int(os.environ.get('BATCH_MAX_CONCURRENCY', 4))
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+    # How /api/files responses are delivered: 'flask' streams them from the
+    # worker, 'x-accel-redirect' (nginx) or 'x-sendfile' hand off to the proxy
+    FILE_SERVE_MODE = os.environ.get('FILE_SERVE_MODE', 'flask')
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('X_ACCEL_REDIRECT_PREFIX', '/protected-uploads/')
+    UPLOAD_MAX_AGE = 7 * 24 * 3600  # seconds, for content-addressed files
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'pdf', 'doc', 'docx'}
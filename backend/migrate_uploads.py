@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Migration script to move uploads into content-addressed storage.
+
+Every file directly inside uploads/ (the old uuid_filename layout) is hashed
+and copied to uploads/ab/cd/<sha256>.<ext>; byte-identical files collapse
+into one copy. Applications are repointed before the old file is removed,
+so the script is safe to interrupt and rerun. Use --dry-run to only report
+what would change.
+"""
+
+import argparse
+import os
+from app import create_app
+from models import db, Application
+from utils.file_utils import content_path, file_digest, store_content
+
+
+def migrate(dry_run=False):
+    app = create_app()
+    with app.app_context():
+        upload_dir = app.config['UPLOAD_FOLDER']
+        if not os.path.isdir(upload_dir):
+            print("Upload folder not found at:", upload_dir)
+            return
+
+        moved = duplicates = bytes_saved = 0
+        seen = set()
+        for name in sorted(os.listdir(upload_dir)):
+            path = os.path.join(upload_dir, name)
+            # Shard directories and in-flight temp files are already new-style
+            if not os.path.isfile(path) or name.startswith('.upload-'):
+                continue
+
+            extension = name.rsplit('.', 1)[1].lower() if '.' in name else 'bin'
+            stored = content_path(file_digest(path), extension)
+            if stored in seen or os.path.exists(os.path.join(upload_dir, stored)):
+                duplicates += 1
+                bytes_saved += os.path.getsize(path)
+            seen.add(stored)
+
+            references = Application.query.filter_by(resume_file=name).all()
+            print(f"{name} -> {stored} ({len(references)} application(s))")
+            if dry_run:
+                continue
+
+            with open(path, 'rb') as f:
+                store_content(f, extension, upload_dir)
+            for application in references:
+                application.resume_file = stored
+            db.session.commit()
+            os.remove(path)
+            moved += 1
+
+        action = "would be freed" if dry_run else "freed"
+        print(f"{moved} file(s) moved, {duplicates} duplicate(s), {bytes_saved} bytes {action}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplicate the uploads folder")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would change")
+    args = parser.parse_args()
+    print("Starting uploads migration...")
+    migrate(dry_run=args.dry_run)
+    print("Migration completed!")
@@ -0,0 +1,100 @@
+"""initial schema
+
+Revision ID: 0c8e5d2a4b19
+Revises: 
+Create Date: 2026-10-18 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c8e5d2a4b19'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _has_table(table):
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def upgrade():
+    # The tables as init-db created them before migrations existed; databases
+    # built that way already have them and only get the later revisions
+    if not _has_table('users'):
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(100), nullable=False),
+            sa.Column('email', sa.String(120), nullable=False, unique=True),
+            sa.Column('password_hash', sa.String(128), nullable=False),
+            sa.Column('role', sa.Enum('admin', 'alumni', 'student'), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+    if not _has_table('alumni_profiles'):
+        op.create_table(
+            'alumni_profiles',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('occupation', sa.String(100), nullable=True),
+            sa.Column('company', sa.String(100), nullable=True),
+            sa.Column('domain', sa.String(100), nullable=True),
+            sa.Column('phone', sa.String(50), nullable=True),
+            sa.Column('location', sa.String(100), nullable=True),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('linkedin', sa.String(255), nullable=True),
+            sa.Column('github', sa.String(255), nullable=True),
+            sa.Column('profile_pic', sa.String(255), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+    if not _has_table('student_profiles'):
+        op.create_table(
+            'student_profiles',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('cgpa', sa.Float(), nullable=True),
+            sa.Column('category', sa.String(50), nullable=True),
+            sa.Column('phone', sa.String(50), nullable=True),
+            sa.Column('location', sa.String(100), nullable=True),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('linkedin', sa.String(255), nullable=True),
+            sa.Column('github', sa.String(255), nullable=True),
+            sa.Column('profile_pic', sa.String(255), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+    if not _has_table('opportunities'):
+        op.create_table(
+            'opportunities',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('alumni_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('type', sa.Enum('internship', 'scholarship', 'mentorship', 'success_story'), nullable=False),
+            sa.Column('title', sa.String(200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('min_cgpa', sa.Float(), nullable=True),
+            sa.Column('category', sa.String(50), nullable=True),
+            sa.Column('company', sa.String(100), nullable=True),
+            sa.Column('location', sa.String(100), nullable=True),
+            sa.Column('duration', sa.String(50), nullable=True),
+            sa.Column('stipend', sa.String(100), nullable=True),
+            sa.Column('requirements', sa.Text(), nullable=True),
+            sa.Column('deadline', sa.Date(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+        )
+    if not _has_table('applications'):
+        op.create_table(
+            'applications',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('student_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+            sa.Column('opportunity_id', sa.Integer(), sa.ForeignKey('opportunities.id'), nullable=False),
+            sa.Column('status', sa.Enum('pending', 'accepted', 'declined'), nullable=True),
+            sa.Column('resume_file', sa.String(255), nullable=True),
+            sa.Column('applied_at', sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade():
+    for table in ('applications', 'opportunities', 'student_profiles', 'alumni_profiles', 'users'):
+        if _has_table(table):
+            op.drop_table(table)
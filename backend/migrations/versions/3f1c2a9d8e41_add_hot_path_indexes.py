@@ -0,0 +1,57 @@
+"""add hot path indexes
+
+Revision ID: 3f1c2a9d8e41
+Revises: 0c8e5d2a4b19
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d8e41'
+down_revision = '0c8e5d2a4b19'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns, unique)
+INDEXES = [
+    ('uq_applications_student_opportunity', 'applications', ['student_id', 'opportunity_id'], True),
+    ('ix_applications_opportunity_id', 'applications', ['opportunity_id'], False),
+    ('ix_opportunities_alumni_id', 'opportunities', ['alumni_id'], False),
+    ('ix_opportunities_type_category_min_cgpa', 'opportunities', ['type', 'category', 'min_cgpa'], False),
+    ('ix_opportunities_created_at_id', 'opportunities', ['created_at', 'id'], False),
+    ('ix_alumni_profiles_user_id', 'alumni_profiles', ['user_id'], False),
+    ('ix_student_profiles_user_id', 'student_profiles', ['user_id'], False),
+]
+
+
+def _existing_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Databases built by db.create_all() may already have some of these
+    existing = {table: _existing_indexes(table) for _, table, _, _ in INDEXES}
+
+    # Duplicate applications could slip in before the unique index existed;
+    # keep the earliest one so the index can be built.
+    if 'uq_applications_student_opportunity' not in existing['applications']:
+        op.execute(
+            'DELETE FROM applications WHERE id NOT IN ('
+            'SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM applications '
+            'GROUP BY student_id, opportunity_id) AS keepers)'
+        )
+
+    for name, table, columns, unique in INDEXES:
+        if name not in existing[table]:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, _, _ in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
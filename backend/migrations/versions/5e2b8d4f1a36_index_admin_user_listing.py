@@ -0,0 +1,35 @@
+"""index admin user listing
+
+Revision ID: 5e2b8d4f1a36
+Revises: a7c3e9f1b258
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b8d4f1a36'
+down_revision = 'a7c3e9f1b258'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(table, name):
+    inspector = sa.inspect(op.get_bind())
+    return name in {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Pages of GET /api/admin/users filtered by role, and newest-first pages
+    if not _has_index('users', 'ix_users_role_id'):
+        op.create_index('ix_users_role_id', 'users', ['role', 'id'])
+    if not _has_index('users', 'ix_users_created_at_id'):
+        op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'])
+
+
+def downgrade():
+    for name in ('ix_users_created_at_id', 'ix_users_role_id'):
+        if _has_index('users', name):
+            op.drop_index(name, table_name='users')
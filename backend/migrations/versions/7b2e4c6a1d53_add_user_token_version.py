@@ -0,0 +1,32 @@
+"""add user token version
+
+Revision ID: 7b2e4c6a1d53
+Revises: 3f1c2a9d8e41
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e4c6a1d53'
+down_revision = '3f1c2a9d8e41'
+branch_labels = None
+depends_on = None
+
+
+def _has_column(table, column):
+    inspector = sa.inspect(op.get_bind())
+    return column in {c['name'] for c in inspector.get_columns(table)}
+
+
+def upgrade():
+    if not _has_column('users', 'token_version'):
+        op.add_column('users', sa.Column('token_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    if _has_column('users', 'token_version'):
+        with op.batch_alter_table('users') as batch_op:
+            batch_op.drop_column('token_version')
@@ -0,0 +1,37 @@
+"""covering index for application summaries
+
+Revision ID: 9d4f6b2e8c15
+Revises: e5a9b3c7d210
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4f6b2e8c15'
+down_revision = 'e5a9b3c7d210'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(table, name):
+    inspector = sa.inspect(op.get_bind())
+    return name in {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Extends the opportunity_id index so the alumni summary reads it alone
+    if not _has_index('applications', 'ix_applications_opportunity_status_applied_at'):
+        op.create_index('ix_applications_opportunity_status_applied_at', 'applications',
+                        ['opportunity_id', 'status', 'applied_at'])
+    if _has_index('applications', 'ix_applications_opportunity_id'):
+        op.drop_index('ix_applications_opportunity_id', table_name='applications')
+
+
+def downgrade():
+    if not _has_index('applications', 'ix_applications_opportunity_id'):
+        op.create_index('ix_applications_opportunity_id', 'applications', ['opportunity_id'])
+    if _has_index('applications', 'ix_applications_opportunity_status_applied_at'):
+        op.drop_index('ix_applications_opportunity_status_applied_at', table_name='applications')
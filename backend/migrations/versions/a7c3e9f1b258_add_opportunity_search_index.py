@@ -0,0 +1,26 @@
+"""add opportunity search index
+
+Revision ID: a7c3e9f1b258
+Revises: 9d4f6b2e8c15
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+from models.search import create_search_index, drop_search_index
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9f1b258'
+down_revision = '9d4f6b2e8c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 table, sync triggers and a 'rebuild' of existing rows on SQLite, a
+    # FULLTEXT index on MySQL; does nothing if init-db already created them
+    create_search_index(op.get_bind())
+
+
+def downgrade():
+    drop_search_index(op.get_bind())
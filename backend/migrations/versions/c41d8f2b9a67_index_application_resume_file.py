@@ -0,0 +1,32 @@
+"""index application resume file
+
+Revision ID: c41d8f2b9a67
+Revises: 7b2e4c6a1d53
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41d8f2b9a67'
+down_revision = '7b2e4c6a1d53'
+branch_labels = None
+depends_on = None
+
+
+def _has_index(table, name):
+    inspector = sa.inspect(op.get_bind())
+    return name in {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Resume reference counts are looked up by file name
+    if not _has_index('applications', 'ix_applications_resume_file'):
+        op.create_index('ix_applications_resume_file', 'applications', ['resume_file'])
+
+
+def downgrade():
+    if _has_index('applications', 'ix_applications_resume_file'):
+        op.drop_index('ix_applications_resume_file', table_name='applications')
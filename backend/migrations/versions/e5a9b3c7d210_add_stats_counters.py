@@ -0,0 +1,50 @@
+"""add stats counters
+
+Revision ID: e5a9b3c7d210
+Revises: c41d8f2b9a67
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a9b3c7d210'
+down_revision = 'c41d8f2b9a67'
+branch_labels = None
+depends_on = None
+
+
+# (table, counter prefix, grouping column)
+COUNTED_TABLES = [
+    ('users', 'users', 'role'),
+    ('opportunities', 'opportunities', 'type'),
+    ('applications', 'applications', 'status'),
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    if 'stats_counters' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'stats_counters',
+            sa.Column('name', sa.String(length=64), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+    elif bind.execute(sa.text('SELECT 1 FROM stats_counters LIMIT 1')).first():
+        return
+    # Seed the counters from the current rows (db.create_all() leaves the table empty)
+    for table, prefix, column in COUNTED_TABLES:
+        if bind.dialect.name == 'mysql':
+            name = f"CONCAT('{prefix}.{column}.', {column})"
+        else:
+            name = f"'{prefix}.{column}.' || {column}"
+        op.execute(f"INSERT INTO stats_counters (name, value) SELECT '{prefix}', COUNT(*) FROM {table}")
+        op.execute(f"INSERT INTO stats_counters (name, value) SELECT {name}, COUNT(*) "
+                   f"FROM {table} WHERE {column} IS NOT NULL GROUP BY {column}")
+
+
+def downgrade():
+    op.drop_table('stats_counters')
@@ -1,17 +1,25 @@
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-import bcrypt
+from utils.passwords import password_hasher
+from models.routing import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Paged admin listing, filtered by role or newest first
+        db.Index('ix_users_role_id', 'role', 'id'),
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     role = db.Column(db.Enum('admin', 'alumni', 'student'), nullable=False)
+    # Bumped whenever existing access tokens must stop working (e.g. password change)
+    token_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -21,12 +29,21 @@ class User(db.Model):
     applications = db.relationship('Application', backref='student', lazy=True)
     
     def set_password(self, password):
-        """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        """Hash and set password, revoking tokens issued for the old one"""
+        if self.password_hash:
+            self.token_version = (self.token_version or 1) + 1
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Check if provided password matches hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
+    
+    def rehash_password_if_needed(self, password):
+        """Re-hash with the configured cost; call only after a successful check"""
+        if password_hasher.needs_rehash(self.password_hash):
+            self.password_hash = password_hasher.hash(password)
+            return True
+        return False
     
     def to_dict(self):
         """Convert user to dictionary for JSON serialization"""
@@ -42,7 +59,7 @@ class AlumniProfile(db.Model):
     __tablename__ = 'alumni_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     occupation = db.Column(db.String(100), nullable=True)
     company = db.Column(db.String(100), nullable=True)
     domain = db.Column(db.String(100), nullable=True)
@@ -74,7 +91,7 @@ class StudentProfile(db.Model):
     __tablename__ = 'student_profiles'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     cgpa = db.Column(db.Float, nullable=True)
     category = db.Column(db.String(50), nullable=True)
     phone = db.Column(db.String(50), nullable=True)
@@ -102,9 +119,13 @@ class StudentProfile(db.Model):
 
 class Opportunity(db.Model):
     __tablename__ = 'opportunities'
+    __table_args__ = (
+        db.Index('ix_opportunities_type_category_min_cgpa', 'type', 'category', 'min_cgpa'),
+        db.Index('ix_opportunities_created_at_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    alumni_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    alumni_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     type = db.Column(db.Enum('internship', 'scholarship', 'mentorship', 'success_story'), nullable=False)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -142,12 +163,18 @@ class Opportunity(db.Model):
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        # One application per student per opportunity; also serves lookups by student_id
+        db.Index('uq_applications_student_opportunity', 'student_id', 'opportunity_id', unique=True),
+        # Lookups by opportunity, and covers the alumni summary's status counts and newest-first slice
+        db.Index('ix_applications_opportunity_status_applied_at', 'opportunity_id', 'status', 'applied_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     opportunity_id = db.Column(db.Integer, db.ForeignKey('opportunities.id'), nullable=False)
     status = db.Column(db.Enum('pending', 'accepted', 'declined'), default='pending')
-    resume_file = db.Column(db.String(255), nullable=True)
+    resume_file = db.Column(db.String(255), nullable=True, index=True)
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -161,3 +188,13 @@ class Application(db.Model):
             'student_name': self.student.name if self.student else None,
             'opportunity_title': self.opportunity.title if self.opportunity else None
         }
+
+class StatsCounter(db.Model):
+    __tablename__ = 'stats_counters'
+    
+    # e.g. 'users', 'users.role.alumni', 'applications.status.pending'
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+# Registers the hooks that keep stats_counters up to date
+from models import stats  # noqa: E402,F401
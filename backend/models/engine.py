@@ -0,0 +1,59 @@
+"""
+Engine setup: connection pool sizing and the SQLite connection profile.
+
+SQLite defaults (rollback journal, synchronous=FULL, small page cache) make
+writers block readers, which shows up as "database is locked" under
+concurrent requests. The profile switches the file to WAL and applies the
+SQLITE_* settings to every new pooled connection.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# pragma -> config key; a value of None leaves SQLite's default in place
+SQLITE_PRAGMAS = {
+    'journal_mode': 'SQLITE_JOURNAL_MODE',
+    'synchronous': 'SQLITE_SYNCHRONOUS',
+    'busy_timeout': 'SQLITE_BUSY_TIMEOUT',
+    'mmap_size': 'SQLITE_MMAP_SIZE',
+    'cache_size': 'SQLITE_CACHE_SIZE',
+}
+
+
+def is_memory_sqlite(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def engine_options(config):
+    """Default SQLALCHEMY_ENGINE_OPTIONS; in-memory SQLite keeps its static pool"""
+    if is_memory_sqlite(config['SQLALCHEMY_DATABASE_URI']):
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def sqlite_pragmas(config):
+    return [(pragma, config.get(key)) for pragma, key in SQLITE_PRAGMAS.items()
+            if config.get(key) is not None]
+
+
+def apply_sqlite_profile(engine, config):
+    """Run the configured PRAGMAs on every new connection of a SQLite engine"""
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma, value in pragmas:
+            cursor.execute(f'PRAGMA {pragma}={value}')
+        cursor.close()
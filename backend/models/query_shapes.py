@@ -0,0 +1,26 @@
+"""
+Loading strategies for list queries.
+
+Every ``to_dict()`` that reaches across a relationship (``Opportunity.alumni``,
+``Application.student``, ``Application.opportunity``, the user profiles) would
+otherwise issue one lazy SELECT per row. Routes pass their base query through
+one of these helpers so a listing runs in a fixed number of statements no
+matter how many rows it returns. The opportunity and application listings
+skip ORM objects altogether; see models/serializers.py.
+"""
+
+from sqlalchemy.orm import joinedload, selectinload
+from models import User, Opportunity
+
+
+def with_opportunity_relations(query):
+    """Attach the alumni (author) row used by ``Opportunity.to_dict()``"""
+    return query.options(joinedload(Opportunity.alumni))
+
+
+def with_user_profiles(query):
+    """Bulk-load both profile relationships for a list of users"""
+    return query.options(
+        selectinload(User.alumni_profile),
+        selectinload(User.student_profile)
+    )
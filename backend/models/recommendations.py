@@ -0,0 +1,306 @@
+"""
+Opportunity recommendations for students.
+
+Each opportunity is encoded once into a column of an in-memory feature
+matrix: minimum CGPA, category, location, deadline, creation time and a
+hashed bag of keywords from its text. A request scores every column
+against the student's profile with a few vectorized NumPy operations and
+returns the top k.
+
+ORM writes to opportunities update their column after commit. Each worker
+process holds its own matrix, so it is also rebuilt in the background once
+it is older than RECOMMENDATION_MAX_AGE, which picks up writes made by
+other workers. Writes that bypass the ORM must call ``invalidate()``.
+"""
+
+import re
+import threading
+import time
+import zlib
+from datetime import date
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from models import db, Opportunity
+
+KEYWORD_BITS = 256
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in is it its of on or our that the
+    this to we will with you your i am my me who what how can all also any into
+""".split())
+# Relative weight of each signal; keyword overlap is normalized to [0, 1]
+WEIGHTS = {'category': 3.0, 'location': 1.5, 'keywords': 4.0, 'recency': 0.5}
+# Success stories are not something a student can apply to
+EXCLUDED_TYPES = ('success_story',)
+FEATURE_COLUMNS = (
+    Opportunity.id, Opportunity.type, Opportunity.min_cgpa, Opportunity.category,
+    Opportunity.location, Opportunity.deadline, Opportunity.created_at,
+    Opportunity.title, Opportunity.description, Opportunity.requirements,
+)
+NO_DEADLINE = np.iinfo(np.int32).max
+
+
+def keywords(*texts):
+    """Lowercased word tokens without stop words and very short words"""
+    words = set()
+    for value in texts:
+        if value:
+            words.update(re.findall(r'[a-z0-9][a-z0-9+#]+', value.lower()))
+    return words - STOP_WORDS
+
+
+def keyword_bits(*texts):
+    """Hash keywords into sorted, unique feature-bit positions"""
+    return sorted({zlib.crc32(word.encode('utf-8')) % KEYWORD_BITS for word in keywords(*texts)})
+
+
+def _normalize(value):
+    return value.strip().lower() if value else None
+
+
+class _Matrix:
+    """Column-per-opportunity feature arrays with room to grow"""
+
+    # name -> (dtype, fill value for empty columns)
+    ARRAYS = {
+        'ids': (np.int64, 0),
+        'active': (bool, False),
+        'min_cgpa': (np.float32, np.nan),
+        'category': (np.int32, -1),
+        'location': (np.int32, -1),
+        'deadline': (np.int32, NO_DEADLINE),
+        'created': (np.float64, 0),
+        'keywords': (bool, False),
+    }
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.capacity = 0
+        self.rows = {}
+        self.free = []
+        self.codes = {'category': {}, 'location': {}}
+        self.document_frequency = np.zeros(KEYWORD_BITS, dtype=np.int64)
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        for name, (dtype, fill) in self.ARRAYS.items():
+            shape = (KEYWORD_BITS, capacity) if name == 'keywords' else capacity
+            array = np.full(shape, fill, dtype=dtype)
+            if self.capacity:
+                array[..., :self.capacity] = getattr(self, name)
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def code(self, kind, value, create=False):
+        value = _normalize(value)
+        if value is None:
+            return -1
+        codes = self.codes[kind]
+        if value not in codes:
+            if not create:
+                return -1
+            codes[value] = len(codes)
+        return codes[value]
+
+    def upsert(self, row):
+        if row['type'] in EXCLUDED_TYPES:
+            self.remove(row['id'])
+            return
+        index = self.rows.get(row['id'])
+        if index is None:
+            if self.free:
+                index = self.free.pop()
+            else:
+                if self.size == self.capacity:
+                    self._allocate(self.capacity * 2)
+                index = self.size
+                self.size += 1
+            self.rows[row['id']] = index
+        else:
+            self.document_frequency -= self.keywords[:, index]
+
+        self.ids[index] = row['id']
+        self.active[index] = True
+        self.min_cgpa[index] = np.nan if row['min_cgpa'] is None else row['min_cgpa']
+        self.category[index] = self.code('category', row['category'], create=True)
+        self.location[index] = self.code('location', row['location'], create=True)
+        self.deadline[index] = row['deadline'].toordinal() if row['deadline'] else NO_DEADLINE
+        self.created[index] = row['created_at'].timestamp() if row['created_at'] else 0
+        self.keywords[:, index] = False
+        self.keywords[keyword_bits(row['title'], row['description'], row['requirements']), index] = True
+        self.document_frequency += self.keywords[:, index]
+
+    def remove(self, opportunity_id):
+        index = self.rows.pop(opportunity_id, None)
+        if index is None:
+            return
+        self.document_frequency -= self.keywords[:, index]
+        self.active[index] = False
+        self.keywords[:, index] = False
+        self.free.append(index)
+
+    def score(self, profile, exclude_ids, today):
+        """Score every column for a student profile; ineligible columns get -inf"""
+        n = self.size
+        eligible = self.active[:n] & (self.deadline[:n] >= today)
+        # Same rule as apply_to_opportunity: no CGPA on file means no CGPA check
+        if profile.get('cgpa'):
+            eligible &= ~(self.min_cgpa[:n] > profile['cgpa'])
+        for opportunity_id in exclude_ids:
+            index = self.rows.get(opportunity_id)
+            if index is not None:
+                eligible[index] = False
+
+        scores = np.zeros(n, dtype=np.float32)
+        category = self.code('category', profile.get('category'))
+        if category >= 0:
+            scores += WEIGHTS['category'] * (self.category[:n] == category)
+        location = self.code('location', profile.get('location'))
+        if location >= 0:
+            scores += WEIGHTS['location'] * (self.location[:n] == location)
+
+        bits = keyword_bits(profile.get('bio'), profile.get('category'))
+        if bits:
+            # Rare keywords count for more than ones most opportunities share
+            idf = np.log1p(len(self.rows) / (1 + self.document_frequency[bits])).astype(np.float32)
+            overlap = idf @ self.keywords[bits, :n]
+            scores += WEIGHTS['keywords'] * overlap / idf.sum()
+
+        if eligible.any():
+            created = self.created[:n]
+            oldest, newest = created[eligible].min(), created[eligible].max()
+            if newest > oldest:
+                scores += WEIGHTS['recency'] * ((created - oldest) / (newest - oldest)).astype(np.float32)
+
+        scores[~eligible] = -np.inf
+        return scores
+
+
+class OpportunityIndex:
+    """Process-wide feature matrix with incremental updates and periodic rebuilds"""
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self._matrix = None
+        self._built_at = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._building = False
+        self._refreshing = False
+        self._replay = []
+
+    def configure(self, max_age):
+        self.max_age = max_age
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop the matrix; the next request rebuilds it from the table"""
+        with self._lock:
+            self._matrix = None
+            self._generation += 1
+
+    @staticmethod
+    def _load():
+        matrix = _Matrix()
+        query = select(*FEATURE_COLUMNS).where(Opportunity.type.notin_(EXCLUDED_TYPES))
+        with db.engine.connect() as conn:
+            for row in conn.execute(query.execution_options(yield_per=1000)).mappings():
+                matrix.upsert(row)
+        return matrix
+
+    def _build(self):
+        """Load a matrix from the table and install it unless invalidated meanwhile"""
+        with self._build_lock:
+            with self._lock:
+                generation = self._generation
+                self._building = True
+                self._replay = []
+            try:
+                matrix = self._load()
+            finally:
+                with self._lock:
+                    replay, self._replay, self._building = self._replay, [], False
+            with self._lock:
+                # Changes committed while the table was being read
+                for change in replay:
+                    self._apply(matrix, change)
+                if generation == self._generation:
+                    self._matrix, self._built_at = matrix, time.time()
+            return matrix
+
+    def _refresh(self, app):
+        try:
+            with app.app_context():
+                self._build()
+        finally:
+            self._refreshing = False
+
+    @staticmethod
+    def _apply(matrix, change):
+        opportunity_id, row = change
+        if row is None:
+            matrix.remove(opportunity_id)
+        else:
+            matrix.upsert(row)
+
+    def apply_changes(self, changes):
+        with self._lock:
+            if self._building:
+                self._replay.extend(changes)
+            if self._matrix is not None:
+                for change in changes:
+                    self._apply(self._matrix, change)
+
+    def recommend(self, profile, k, exclude_ids=()):
+        """Top-k (opportunity_id, score) pairs for a student profile dict, best first"""
+        with self._lock:
+            matrix = self._matrix
+            if matrix is not None and not self._refreshing \
+                    and time.time() - self._built_at > self.max_age:
+                # Keep serving the current matrix while a fresh one loads
+                self._refreshing = True
+                threading.Thread(target=self._refresh, args=(current_app._get_current_object(),),
+                                 daemon=True).start()
+        if matrix is None:
+            matrix = self._build()
+
+        with self._lock:
+            scores = matrix.score(profile, exclude_ids, date.today().toordinal())
+            k = min(k, int(np.isfinite(scores).sum()))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [(int(matrix.ids[i]), round(float(scores[i]), 4)) for i in top]
+
+
+opportunity_index = OpportunityIndex()
+
+
+def _snapshot(opportunity):
+    return {column.key: getattr(opportunity, column.key) for column in FEATURE_COLUMNS}
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    changes = session.info.setdefault('opportunity_index_changes', [])
+    for obj in session.new | session.dirty:
+        if isinstance(obj, Opportunity):
+            changes.append((obj.id, _snapshot(obj)))
+    for obj in session.deleted:
+        if isinstance(obj, Opportunity):
+            changes.append((obj.id, None))
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_changes(session):
+    changes = session.info.pop('opportunity_index_changes', None)
+    if changes:
+        opportunity_index.apply_changes(changes)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changes(session):
+    session.info.pop('opportunity_index_changes', None)
@@ -0,0 +1,105 @@
+"""
+Read-replica routing.
+
+``RoutingSession`` sends the SELECTs of allow-listed GET endpoints to a
+replica bind and everything else to the primary. Once a session has written,
+the rest of its transaction stays on the primary. A user whose request
+committed a write is also pinned to the primary for REPLICA_STICKY_SECONDS,
+so their next reads see their own changes despite replication lag. Pins are
+kept in a SQLite file shared by the workers on the host, so the next request
+sees the pin whichever worker serves it.
+"""
+
+import random
+import time
+from flask import has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+from utils.shared_file import SharedFile
+
+PIN_SCHEMA = ['CREATE TABLE IF NOT EXISTS pins (user_id TEXT PRIMARY KEY, until REAL NOT NULL)']
+# Share of writes that also delete expired pins
+PRUNE_RATE = 0.01
+
+
+def _current_user_id():
+    from flask_jwt_extended import get_jwt_identity
+    try:
+        return get_jwt_identity()
+    except RuntimeError:
+        # The JWT has not been verified (yet) in this request
+        return None
+
+
+class ReplicaRouter:
+    """Decides per request whether reads may go to a replica"""
+
+    def __init__(self):
+        self.bind_keys = []
+        self.endpoints = frozenset()
+        self.sticky_seconds = 10
+        self.pins = None
+
+    def configure(self, bind_keys, endpoints, sticky_seconds, pin_path):
+        self.bind_keys = list(bind_keys)
+        self.endpoints = frozenset(endpoints)
+        self.sticky_seconds = sticky_seconds
+        # Opened on the first pin or lookup, and only when there are replicas
+        self.pins = SharedFile(pin_path, PIN_SCHEMA)
+
+    def mark_write(self, user_id):
+        """Pin a user's reads to the primary for a while after they wrote"""
+        if user_id is None or not self.bind_keys:
+            return
+        now = time.time()
+        conn = self.pins.connect()
+        conn.execute('INSERT INTO pins (user_id, until) VALUES (?, ?) '
+                     'ON CONFLICT(user_id) DO UPDATE SET until = excluded.until',
+                     (str(user_id), now + self.sticky_seconds))
+        if random.random() < PRUNE_RATE:
+            conn.execute('DELETE FROM pins WHERE until < ?', (now,))
+
+    def is_sticky(self, user_id):
+        if user_id is None:
+            return False
+        row = self.pins.connect().execute(
+            'SELECT until FROM pins WHERE user_id = ?', (str(user_id),)
+        ).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def replica_for_request(self):
+        """Bind key of a replica for the current request, or None for the primary"""
+        if not self.bind_keys or not has_request_context():
+            return None
+        if request.method not in ('GET', 'HEAD') or request.endpoint not in self.endpoints:
+            return None
+        if self.is_sticky(_current_user_id()):
+            return None
+        return random.choice(self.bind_keys)
+
+
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica when the router allows it"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or isinstance(clause, UpdateBase):
+                self.info['wrote'] = True
+            elif isinstance(clause, Select) and not self.info.get('wrote'):
+                # Decide once per session so one request reads one snapshot
+                if 'replica' not in self.info:
+                    self.info['replica'] = replica_router.replica_for_request()
+                if self.info['replica']:
+                    return self._db.engines[self.info['replica']]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _pin_writer(session):
+    if session.info.get('wrote') and has_request_context():
+        replica_router.mark_write(_current_user_id())
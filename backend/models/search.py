@@ -0,0 +1,214 @@
+"""
+Full-text search over opportunities.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers, MySQL a
+FULLTEXT index that the server maintains itself. Any other backend falls back
+to a LIKE scan so the endpoint still works in development.
+"""
+
+import html
+import re
+from sqlalchemy import text, or_, select
+from models import db, Opportunity
+
+SEARCH_COLUMNS = ('title', 'description', 'requirements', 'company', 'location')
+HIGHLIGHT_OPEN = '<mark>'
+HIGHLIGHT_CLOSE = '</mark>'
+SNIPPET_WORDS = 16
+# snippet() marks matches with control characters; the text around them is
+# HTML-escaped before they become tags, so only <mark> reaches the client
+_SNIPPET_OPEN = '\x02'
+_SNIPPET_CLOSE = '\x03'
+
+_SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS opportunities_fts USING fts5(
+        title, description, requirements, company, location,
+        content='opportunities', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_insert AFTER INSERT ON opportunities BEGIN
+        INSERT INTO opportunities_fts(rowid, title, description, requirements, company, location)
+        VALUES (new.id, new.title, new.description, new.requirements, new.company, new.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_delete AFTER DELETE ON opportunities BEGIN
+        INSERT INTO opportunities_fts(opportunities_fts, rowid, title, description, requirements, company, location)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements, old.company, old.location);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS opportunities_fts_update AFTER UPDATE ON opportunities BEGIN
+        INSERT INTO opportunities_fts(opportunities_fts, rowid, title, description, requirements, company, location)
+        VALUES ('delete', old.id, old.title, old.description, old.requirements, old.company, old.location);
+        INSERT INTO opportunities_fts(rowid, title, description, requirements, company, location)
+        VALUES (new.id, new.title, new.description, new.requirements, new.company, new.location);
+    END
+    """,
+]
+
+# Column weights for bm25(), in SEARCH_COLUMNS order
+_SQLITE_WEIGHTS = '10.0, 1.0, 2.0, 5.0, 3.0'
+
+_MYSQL_MATCH = 'MATCH(title, description, requirements, company, location) AGAINST (:q IN NATURAL LANGUAGE MODE)'
+
+
+def install_search_index(engine):
+    """Create the search index for ``engine`` if it does not exist yet"""
+    with engine.begin() as conn:
+        create_search_index(conn)
+
+
+def create_search_index(conn):
+    """Create the search index on an open connection (used by the migration too)"""
+    if conn.dialect.name == 'sqlite':
+        exists = conn.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'opportunities_fts'"
+        )).first()
+        for statement in _SQLITE_SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            # Index rows that were written before the triggers existed
+            conn.execute(text("INSERT INTO opportunities_fts(opportunities_fts) VALUES ('rebuild')"))
+    elif conn.dialect.name == 'mysql':
+        exists = conn.execute(text(
+            "SHOW INDEX FROM opportunities WHERE Key_name = 'ft_opportunities'"
+        )).first()
+        if not exists:
+            conn.execute(text(
+                'ALTER TABLE opportunities ADD FULLTEXT INDEX ft_opportunities '
+                '(title, description, requirements, company, location)'
+            ))
+
+
+def drop_search_index(conn):
+    """Remove what create_search_index added"""
+    if conn.dialect.name == 'sqlite':
+        for name in ('opportunities_fts_insert', 'opportunities_fts_delete', 'opportunities_fts_update'):
+            conn.execute(text(f'DROP TRIGGER IF EXISTS {name}'))
+        conn.execute(text('DROP TABLE IF EXISTS opportunities_fts'))
+    elif conn.dialect.name == 'mysql':
+        if conn.execute(text("SHOW INDEX FROM opportunities WHERE Key_name = 'ft_opportunities'")).first():
+            conn.execute(text('ALTER TABLE opportunities DROP INDEX ft_opportunities'))
+
+
+def is_search_object(type_, name):
+    """True for schema objects the search index owns, which the models do not declare"""
+    if type_ == 'table':
+        # The FTS5 table and its shadow tables (_data, _idx, _docsize, _config)
+        return name.startswith('opportunities_fts')
+    return type_ == 'index' and name == 'ft_opportunities'
+
+
+def search_terms(query):
+    """Split free text into the word tokens we search for"""
+    return re.findall(r'\w+', query.lower())
+
+
+def highlight(value, terms):
+    """Return an HTML-escaped excerpt of ``value`` around the first matching term"""
+    if not value:
+        return None
+    words = value.split()
+    hit = next((i for i, word in enumerate(words)
+                if any(word.lower().startswith(term) for term in terms)), None)
+    if hit is None:
+        return None
+    start = max(0, hit - SNIPPET_WORDS // 2)
+    excerpt = []
+    for word in words[start:start + SNIPPET_WORDS]:
+        matched = any(word.lower().startswith(term) for term in terms)
+        word = html.escape(word)
+        if matched:
+            word = f'{HIGHLIGHT_OPEN}{word}{HIGHLIGHT_CLOSE}'
+        excerpt.append(word)
+    prefix = '...' if start > 0 else ''
+    suffix = '...' if start + SNIPPET_WORDS < len(words) else ''
+    return prefix + ' '.join(excerpt) + suffix
+
+
+def _mark_snippet(snippet):
+    """Escape an FTS5 snippet and turn its match markers into <mark> tags"""
+    if snippet is None:
+        return None
+    return (html.escape(snippet)
+            .replace(_SNIPPET_OPEN, HIGHLIGHT_OPEN)
+            .replace(_SNIPPET_CLOSE, HIGHLIGHT_CLOSE))
+
+
+def _execute_read(sql, params):
+    """
+    Run raw search SQL on the bind an ORM read of opportunities would use.
+
+    The session routes a SELECT to a replica on allow-listed endpoints, but
+    cannot tell that text() is a read; without this the ranking would come
+    from the primary and the rows the route then loads from a replica.
+    """
+    return db.session.execute(text(sql), params, bind_arguments={'clause': select(Opportunity.id)})
+
+
+def _sqlite_search(terms, limit, opp_type):
+    # Quote every token so user input can never be parsed as FTS5 syntax
+    match = ' '.join(f'"{term}"*' for term in terms)
+    sql = f"""
+        SELECT opportunities_fts.rowid AS id,
+               -bm25(opportunities_fts, {_SQLITE_WEIGHTS}) AS score,
+               snippet(opportunities_fts, -1, :open, :close, '...', {SNIPPET_WORDS}) AS snippet
+        FROM opportunities_fts
+        {'JOIN opportunities ON opportunities.id = opportunities_fts.rowid' if opp_type else ''}
+        WHERE opportunities_fts MATCH :match
+        {'AND opportunities.type = :type' if opp_type else ''}
+        ORDER BY bm25(opportunities_fts, {_SQLITE_WEIGHTS})
+        LIMIT :limit
+    """
+    rows = _execute_read(sql, {'match': match, 'type': opp_type, 'limit': limit,
+                               'open': _SNIPPET_OPEN, 'close': _SNIPPET_CLOSE})
+    return [(row.id, row.score, _mark_snippet(row.snippet)) for row in rows]
+
+
+def _mysql_search(query, limit, opp_type):
+    sql = f"""
+        SELECT id, {_MYSQL_MATCH} AS score
+        FROM opportunities
+        WHERE {_MYSQL_MATCH}
+        {'AND type = :type' if opp_type else ''}
+        ORDER BY score DESC
+        LIMIT :limit
+    """
+    rows = _execute_read(sql, {'q': query, 'type': opp_type, 'limit': limit})
+    return [(row.id, row.score, None) for row in rows]
+
+
+def _fallback_search(terms, limit, opp_type):
+    query = db.session.query(Opportunity.id)
+    for term in terms:
+        pattern = f'%{term}%'
+        query = query.filter(or_(*[getattr(Opportunity, column).ilike(pattern)
+                                   for column in SEARCH_COLUMNS]))
+    if opp_type:
+        query = query.filter(Opportunity.type == opp_type)
+    rows = query.order_by(Opportunity.created_at.desc()).limit(limit).all()
+    return [(row.id, None, None) for row in rows]
+
+
+def search_opportunities(query, limit, opp_type=None):
+    """
+    Rank opportunities against free text.
+
+    Returns a list of (opportunity_id, score, snippet) tuples, best first.
+    ``snippet`` is escaped HTML whose only tags are <mark>; it is None when
+    the backend cannot produce one, and callers fall back to ``highlight()``.
+    The search runs on the same bind (primary or replica) as the route's
+    later load of the matching rows.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return _sqlite_search(terms, limit, opp_type)
+    if dialect == 'mysql':
+        return _mysql_search(query, limit, opp_type)
+    return _fallback_search(terms, limit, opp_type)
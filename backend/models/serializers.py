@@ -0,0 +1,97 @@
+"""
+Row serializers for list endpoints.
+
+``to_dict()`` needs a fully loaded ORM object per row (plus joined-eager
+related objects for names and titles). A Serializer instead selects
+labelled columns, including the joined name/title columns, in one query and
+turns each result row into the same dict. Dates become ISO strings. Clients
+can ask for a sparse fieldset (``?fields=id,title,deadline``), in which case
+only those columns are read from the database at all.
+
+The key columns used for ordering and keyset cursors are always selected but
+only returned when requested.
+"""
+
+from sqlalchemy import Date, DateTime
+from sqlalchemy.orm import aliased
+from models import db, User, Opportunity, Application
+
+
+class Serializer:
+    """Compiled row -> dict conversion for one model's list output"""
+
+    def __init__(self, model, fields, joins=(), key_fields=('created_at', 'id')):
+        # fields: (output name, column) in to_dict() order
+        self.model = model
+        self.columns = dict(fields)
+        self.names = tuple(name for name, _ in fields)
+        self.joins = joins
+        self.key_fields = tuple(key_fields)
+        self._compiled = {}
+
+    def parse_fields(self, value):
+        """Field names from a ``fields=`` parameter (None for all); ValueError on unknown ones"""
+        if not value:
+            return None
+        names = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(self.names)}")
+        # Keep the to_dict() order whatever order the client asked in
+        return tuple(name for name in self.names if name in names)
+
+    def _compile(self, names):
+        compiled = self._compiled.get(names)
+        if compiled is None:
+            hidden = tuple(name for name in self.key_fields if name not in names)
+            columns = [self.columns[name].label(name) for name in names + hidden]
+            dates = tuple(name for name in names if isinstance(self.columns[name].type, (Date, DateTime)))
+            compiled = self._compiled[names] = (columns, dates)
+        return compiled
+
+    def query(self, names=None):
+        """Query of labelled column rows; filter and order it like a model query"""
+        columns, _ = self._compile(names or self.names)
+        query = db.session.query(*columns).select_from(self.model)
+        for target, condition in self.joins:
+            query = query.outerjoin(target, condition)
+        return query
+
+    def dump(self, rows, names=None):
+        """Dicts for the rows of ``query(names)``, lazily"""
+        names = names or self.names
+        _, dates = self._compile(names)
+        for row in rows:
+            # Hidden key columns come last, so zip stops before them
+            data = dict(zip(names, row))
+            for name in dates:
+                value = data[name]
+                if value is not None:
+                    data[name] = value.isoformat()
+            yield data
+
+
+def _columns(model, names):
+    return [(name, getattr(model, name)) for name in names]
+
+
+Alumnus = aliased(User, name='alumnus')
+Student = aliased(User, name='student')
+
+opportunity_serializer = Serializer(
+    Opportunity,
+    _columns(Opportunity, [
+        'id', 'alumni_id', 'type', 'title', 'description', 'min_cgpa', 'category', 'company',
+        'location', 'duration', 'stipend', 'requirements', 'deadline', 'created_at',
+    ]) + [('alumni_name', Alumnus.name)],
+    joins=[(Alumnus, Alumnus.id == Opportunity.alumni_id)],
+)
+
+application_serializer = Serializer(
+    Application,
+    _columns(Application, ['id', 'student_id', 'opportunity_id', 'status', 'resume_file', 'applied_at'])
+    + [('student_name', Student.name), ('opportunity_title', Opportunity.title)],
+    joins=[(Student, Student.id == Application.student_id),
+           (Opportunity, Opportunity.id == Application.opportunity_id)],
+    key_fields=('id',),
+)
@@ -0,0 +1,114 @@
+"""
+Materialized row counts for the admin dashboard.
+
+Mapper events adjust ``stats_counters`` on the same connection (and so in
+the same transaction) as every ORM insert, delete or grouping-column update
+of a User, Opportunity or Application. Writes that bypass the ORM unit of
+work (bulk inserts, set-based UPDATEs) must call ``adjust_counter`` or
+``recount_stats`` themselves. The counters are seeded by the migration (a
+new database starts with none, i.e. all zero) and rebuilt only by
+``flask recount-stats``; reads never write.
+"""
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import db, User, Opportunity, Application, StatsCounter
+
+UPSERT_INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+# model -> (counter prefix, column the rows are grouped by)
+COUNTED_MODELS = {
+    User: ('users', 'role'),
+    Opportunity: ('opportunities', 'type'),
+    Application: ('applications', 'status'),
+}
+
+
+def counter_names(prefix, column, value):
+    return [prefix, f'{prefix}.{column}.{value}']
+
+
+def adjust_counter(connection, name, delta):
+    """Add ``delta`` to a counter, creating it if needed"""
+    if not delta:
+        return
+    table = StatsCounter.__table__
+    # One upsert, so two transactions creating the same counter cannot collide
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        statement = mysql_insert(table).values(name=name, value=delta)
+        connection.execute(statement.on_duplicate_key_update(value=table.c.value + statement.inserted.value))
+        return
+    if dialect in UPSERT_INSERTS:
+        statement = UPSERT_INSERTS[dialect](table).values(name=name, value=delta)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.name], set_={'value': table.c.value + statement.excluded.value}))
+        return
+    result = connection.execute(
+        table.update().where(table.c.name == name).values(value=table.c.value + delta)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(name=name, value=delta))
+
+
+def _after_insert(mapper, connection, target):
+    prefix, column = COUNTED_MODELS[mapper.class_]
+    for name in counter_names(prefix, column, getattr(target, column)):
+        adjust_counter(connection, name, 1)
+
+
+def _after_delete(mapper, connection, target):
+    prefix, column = COUNTED_MODELS[mapper.class_]
+    for name in counter_names(prefix, column, getattr(target, column)):
+        adjust_counter(connection, name, -1)
+
+
+def _after_update(mapper, connection, target):
+    prefix, column = COUNTED_MODELS[mapper.class_]
+    history = inspect(target).attrs[column].history
+    if not history.has_changes():
+        return
+    for old in history.deleted:
+        adjust_counter(connection, f'{prefix}.{column}.{old}', -1)
+    for new in history.added:
+        adjust_counter(connection, f'{prefix}.{column}.{new}', 1)
+
+
+for model in COUNTED_MODELS:
+    event.listen(model, 'after_insert', _after_insert)
+    event.listen(model, 'after_delete', _after_delete)
+    event.listen(model, 'after_update', _after_update)
+
+
+def recount_stats():
+    """Rebuild every counter from one grouped aggregate per table"""
+    counts = {}
+    for model, (prefix, column) in COUNTED_MODELS.items():
+        group_column = getattr(model, column)
+        counts[prefix] = 0
+        for value, count in db.session.query(group_column, func.count()).group_by(group_column):
+            counts[f'{prefix}.{column}.{value}'] = count
+            counts[prefix] += count
+    db.session.query(StatsCounter).delete()
+    db.session.add_all([StatsCounter(name=name, value=value) for name, value in counts.items()])
+    return counts
+
+
+def read_stats():
+    """All counters in one primary-key-ordered read"""
+    return dict(db.session.query(StatsCounter.name, StatsCounter.value))
+
+
+def read_counters(prefix, column, values):
+    """Counters for ``prefix`` and each ``prefix.column.value``, by primary key; missing ones are 0"""
+    names = [prefix] + [f'{prefix}.{column}.{value}' for value in values]
+    found = dict(db.session.query(StatsCounter.name, StatsCounter.value).filter(StatsCounter.name.in_(names)))
+    return {name: found.get(name, 0) for name in names}
+
+
+def grouped(counts, prefix, column):
+    """{'value': count} for the counters under prefix.column"""
+    start = f'{prefix}.{column}.'
+    return {name[len(start):]: value for name, value in counts.items() if name.startswith(start)}
@@ -0,0 +1,94 @@
+"""
+Dashboard summaries: counts and short recent-activity slices.
+
+Counts come from grouped aggregates (or the stats counters) instead of the
+full listings, and the recent slices are newest-first LIMIT queries over
+the list serializers, so a dashboard reads a few small result sets and the
+response stays at a few hundred bytes whatever the account's history.
+"""
+
+from sqlalchemy import func
+from models import db, Opportunity, Application
+from models.serializers import opportunity_serializer, application_serializer
+from models.stats import read_counters, grouped
+
+DEFAULT_RECENT = 5
+MAX_RECENT = 20
+
+OPPORTUNITY_TYPES = tuple(Opportunity.type.type.enums)
+APPLICATION_STATUSES = tuple(Application.status.type.enums)
+
+# Serializer field order, so query() and dump() share one compiled column list
+STUDENT_RECENT_APPLICATION_FIELDS = ('id', 'opportunity_id', 'status', 'applied_at', 'opportunity_title')
+ALUMNI_RECENT_APPLICATION_FIELDS = (
+    'id', 'student_id', 'opportunity_id', 'status', 'applied_at', 'student_name', 'opportunity_title')
+RECENT_OPPORTUNITY_FIELDS = ('id', 'type', 'title', 'company', 'deadline', 'created_at')
+
+
+def parse_recent(value):
+    """Clamp a requested slice length to [0, MAX_RECENT]"""
+    if value is None:
+        return DEFAULT_RECENT
+    return max(0, min(value, MAX_RECENT))
+
+
+def counts_by(query, column, values):
+    """{value: count} for every value in ``values`` (0 when absent) from one GROUP BY"""
+    counts = dict.fromkeys(values, 0)
+    counts.update(query.with_entities(column, func.count()).group_by(column))
+    return counts
+
+
+def recent(serializer, keys, fields, created_column, limit):
+    """The ``limit`` newest rows as dicts; ``keys`` is a filtered query of the model's ids"""
+    if not limit:
+        return []
+    model_id = serializer.model.id
+    # Pick the rows from the index first, then join names for just those
+    newest = keys.order_by(created_column.desc(), model_id.desc()).limit(limit).subquery()
+    rows = (serializer.query(fields).join(newest, newest.c.id == model_id)
+            .order_by(created_column.desc(), model_id.desc()))
+    return list(serializer.dump(rows, fields))
+
+
+def student_summary(student_id, limit=DEFAULT_RECENT):
+    applications = db.session.query(Application).filter(Application.student_id == student_id)
+    by_status = counts_by(applications, Application.status, APPLICATION_STATUSES)
+    # Every student sees every opportunity, so the maintained counters answer it
+    opportunities = read_counters('opportunities', 'type', OPPORTUNITY_TYPES)
+
+    return {
+        'total_applications': sum(by_status.values()),
+        'applications_by_status': by_status,
+        'pending_reviews': by_status['pending'],
+        'available_opportunities': opportunities['opportunities'],
+        'opportunities_by_type': grouped(opportunities, 'opportunities', 'type'),
+        'recent_applications': recent(
+            application_serializer, applications.with_entities(Application.id),
+            STUDENT_RECENT_APPLICATION_FIELDS, Application.applied_at, limit),
+        'latest_opportunities': recent(
+            opportunity_serializer, db.session.query(Opportunity.id),
+            RECENT_OPPORTUNITY_FIELDS, Opportunity.created_at, limit),
+    }
+
+
+def alumni_summary(alumni_id, limit=DEFAULT_RECENT):
+    opportunities = db.session.query(Opportunity).filter(Opportunity.alumni_id == alumni_id)
+    by_type = counts_by(opportunities, Opportunity.type, OPPORTUNITY_TYPES)
+    applications = db.session.query(Application).join(
+        Opportunity, Opportunity.id == Application.opportunity_id).filter(Opportunity.alumni_id == alumni_id)
+    by_status = counts_by(applications, Application.status, APPLICATION_STATUSES)
+
+    return {
+        'total_opportunities': sum(by_type.values()),
+        'opportunities_by_type': by_type,
+        'total_applications': sum(by_status.values()),
+        'applications_by_status': by_status,
+        'pending_reviews': by_status['pending'],
+        'recent_applications': recent(
+            application_serializer, applications.with_entities(Application.id),
+            ALUMNI_RECENT_APPLICATION_FIELDS, Application.applied_at, limit),
+        'recent_opportunities': recent(
+            opportunity_serializer, opportunities.with_entities(Opportunity.id),
+            RECENT_OPPORTUNITY_FIELDS, Opportunity.created_at, limit),
+    }
@@ -1,44 +1,175 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, User, AlumniProfile, StudentProfile
+from models.query_shapes import with_user_profiles
+from models.stats import read_stats, grouped
+from utils.auth import role_required, user_cache
+from utils.response_cache import opportunity_cache
+from utils.metrics import request_metrics
+from utils.pagination import parse_limit
+from utils.streaming import ndjson_response, csv_response
+from utils.bulk_import import parse_rows, import_users, ImportFormatError
+from utils.passwords import password_hasher, PasswordHasherBusy
+from routes.auth import hasher_busy_response
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
-def admin_required(f):
-    """Decorator to require admin role"""
-    def decorated_function(*args, **kwargs):
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        if not user or user.role != 'admin':
-            return jsonify({'error': 'Admin access required'}), 403
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+admin_required = role_required('admin', 'Admin access required')
+
+USER_SORT_COLUMNS = {
+    'id': User.id,
+    'name': User.name,
+    'email': User.email,
+    'role': User.role,
+    'created_at': User.created_at,
+}
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    'id', 'name', 'email', 'role', 'created_at',
+    'occupation', 'company', 'domain', 'cgpa', 'category',
+    'phone', 'location', 'linkedin', 'github'
+]
+
+def filtered_users():
+    """User query narrowed by the role/q/sort query parameters, or (None, error)"""
+    query = User.query
+    
+    role = request.args.get('role')
+    if role:
+        if role not in ['admin', 'alumni', 'student']:
+            return None, 'Invalid role'
+        query = query.filter(User.role == role)
+    
+    search = (request.args.get('q') or '').strip().lower()
+    if search:
+        query = query.filter(db.or_(
+            db.func.lower(User.name).contains(search, autoescape=True),
+            db.func.lower(User.email).contains(search, autoescape=True)
+        ))
+    
+    sort = request.args.get('sort', 'id')
+    column = USER_SORT_COLUMNS.get(sort.lstrip('-'))
+    if column is None:
+        return None, 'Invalid sort column'
+    if sort.startswith('-'):
+        query = query.order_by(column.desc(), User.id.desc())
+    else:
+        query = query.order_by(column.asc(), User.id.asc())
+    
+    return with_user_profiles(query), None
+
+def user_with_profile(user):
+    user_data = user.to_dict()
+    
+    # Add profile data
+    if user.role == 'alumni' and user.alumni_profile:
+        user_data['profile'] = user.alumni_profile.to_dict()
+    elif user.role == 'student' and user.student_profile:
+        user_data['profile'] = user.student_profile.to_dict()
+    
+    return user_data
 
 @admin_bp.route('/users', methods=['GET'])
 @jwt_required()
 @admin_required
 def get_all_users():
     try:
-        users = User.query.all()
-        users_data = []
-        
-        for user in users:
-            user_data = user.to_dict()
-            
-            # Add profile data
-            if user.role == 'alumni' and user.alumni_profile:
-                user_data['profile'] = user.alumni_profile.to_dict()
-            elif user.role == 'student' and user.student_profile:
-                user_data['profile'] = user.student_profile.to_dict()
-            
-            users_data.append(user_data)
-        
-        return jsonify({'users': users_data}), 200
+        query, error = filtered_users()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # Without paging parameters the whole directory is returned, as before
+        if 'page' not in request.args and 'per_page' not in request.args:
+            return jsonify({'users': [user_with_profile(user) for user in query.all()]}), 200
+        
+        page = max(1, request.args.get('page', 1, type=int))
+        per_page = parse_limit(request.args.get('per_page', type=int))
+        total = query.order_by(None).count()
+        users = query.offset((page - 1) * per_page).limit(per_page).all()
+        
+        return jsonify({
+            'users': [user_with_profile(user) for user in users],
+            'page': page,
+            'per_page': per_page,
+            'total': total
+        }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@admin_bp.route('/users/export', methods=['GET'])
+@jwt_required()
+@admin_required
+def export_users():
+    try:
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ['csv', 'ndjson']:
+            return jsonify({'error': 'Invalid format. Use csv or ndjson'}), 400
+        
+        query, error = filtered_users()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        # Rows (and their profiles) are fetched in batches while the response streams
+        users = query.yield_per(EXPORT_BATCH_SIZE)
+        if export_format == 'ndjson':
+            return ndjson_response(user_with_profile(user) for user in users)
+        
+        def flat_rows():
+            for user in users:
+                row = user.to_dict()
+                profile = user.alumni_profile if user.role == 'alumni' else user.student_profile
+                if profile:
+                    row.update({k: v for k, v in profile.to_dict().items()
+                                if k not in ('id', 'user_id', 'created_at')})
+                yield row
+        return csv_response(EXPORT_COLUMNS, flat_rows(), 'users.csv')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/users/import', methods=['POST'])
+@jwt_required()
+@admin_required
+def import_users_route():
+    try:
+        # Either a CSV/JSON file upload or a JSON body ({"users": [...]} or a list)
+        if 'file' in request.files:
+            upload = request.files['file']
+            rows = parse_rows(upload.read(), upload.filename or '')
+        else:
+            data = request.get_json(silent=True)
+            if data is None:
+                return jsonify({'error': 'Upload a CSV/JSON file or send a JSON body'}), 400
+            rows = data.get('users') if isinstance(data, dict) else data
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                return jsonify({'error': 'users must be a list of objects'}), 400
+        
+        if not rows:
+            return jsonify({'error': 'No users to import'}), 400
+        max_rows = current_app.config['IMPORT_MAX_ROWS']
+        if len(rows) > max_rows:
+            return jsonify({'error': f'At most {max_rows} users per request; '
+                                     'use flask --app app import-users for larger files'}), 413
+        
+        # Hash through the shared pool so an import shares the logins' back-pressure
+        report = import_users(
+            rows,
+            chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+            hasher=password_hasher
+        )
+        
+        return jsonify(report), 201 if report['created'] else 400
+        
+    except ImportFormatError as e:
+        return jsonify({'error': str(e)}), 400
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return hasher_busy_response()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @admin_bp.route('/users/<int:user_id>', methods=['DELETE'])
 @jwt_required()
 @admin_required
@@ -50,12 +181,14 @@ def delete_user(user_id):
             return jsonify({'error': 'User not found'}), 404
         
         # Don't allow admin to delete themselves
-        current_user_id = get_jwt_identity()
+        current_user_id = int(get_jwt_identity())
         if user_id == current_user_id:
             return jsonify({'error': 'Cannot delete your own account'}), 400
         
         db.session.delete(user)
         db.session.commit()
+        user_cache.invalidate(user_id)
+        opportunity_cache.invalidate()
         
         return jsonify({'message': 'User deleted successfully'}), 200
         
@@ -68,17 +201,42 @@ def delete_user(user_id):
 @admin_required
 def get_stats():
     try:
-        total_users = User.query.count()
-        admin_count = User.query.filter_by(role='admin').count()
-        alumni_count = User.query.filter_by(role='alumni').count()
-        student_count = User.query.filter_by(role='student').count()
+        counts = read_stats()
+        users_by_role = grouped(counts, 'users', 'role')
         
         return jsonify({
-            'total_users': total_users,
-            'admin_count': admin_count,
-            'alumni_count': alumni_count,
-            'student_count': student_count
+            'total_users': counts.get('users', 0),
+            'admin_count': users_by_role.get('admin', 0),
+            'alumni_count': users_by_role.get('alumni', 0),
+            'student_count': users_by_role.get('student', 0),
+            'total_opportunities': counts.get('opportunities', 0),
+            'opportunities_by_type': grouped(counts, 'opportunities', 'type'),
+            'total_applications': counts.get('applications', 0),
+            'applications_by_status': grouped(counts, 'applications', 'status')
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats():
+    try:
+        return jsonify({'opportunities': opportunity_cache.stats()}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/metrics', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_metrics():
+    """Request histograms of this worker in Prometheus text format"""
+    try:
+        if not request_metrics.enabled:
+            return jsonify({'error': 'Metrics are disabled'}), 404
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
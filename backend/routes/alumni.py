@@ -1,21 +1,20 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, User, Opportunity, Application, AlumniProfile
+from models.serializers import opportunity_serializer, application_serializer
+from models.stats import adjust_counter
+from models.summaries import alumni_summary, parse_recent
 from datetime import datetime
+from utils.auth import role_required, user_cache
+from utils.response_cache import opportunity_cache
 from utils.file_utils import save_uploaded_file, delete_file
 
 alumni_bp = Blueprint('alumni', __name__, url_prefix='/api/alumni')
 
-def alumni_required(f):
-    """Decorator to require alumni role"""
-    def decorated_function(*args, **kwargs):
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        if not user or user.role != 'alumni':
-            return jsonify({'error': 'Alumni access required'}), 403
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+alumni_required = role_required('alumni', 'Alumni access required')
+
+APPLICATION_STATUSES = ['pending', 'accepted', 'declined']
+MAX_BULK_STATUS_IDS = 1000
 
 @alumni_bp.route('/opportunities', methods=['GET'])
 @jwt_required()
@@ -23,10 +22,14 @@ def alumni_required(f):
 def get_my_opportunities():
     try:
         user_id = int(get_jwt_identity())
-        opportunities = Opportunity.query.filter_by(alumni_id=user_id).all()
+        try:
+            fields = opportunity_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        opportunities = opportunity_serializer.query(fields).filter(Opportunity.alumni_id == user_id)
         
         return jsonify({
-            'opportunities': [opp.to_dict() for opp in opportunities]
+            'opportunities': list(opportunity_serializer.dump(opportunities, fields))
         }), 200
         
     except Exception as e:
@@ -76,6 +79,7 @@ def create_opportunity():
         
         db.session.add(opportunity)
         db.session.commit()
+        opportunity_cache.invalidate()
         
         return jsonify({
             'message': 'Opportunity created successfully',
@@ -128,6 +132,7 @@ def update_opportunity(opportunity_id):
                 opportunity.deadline = None
         
         db.session.commit()
+        opportunity_cache.invalidate()
         
         return jsonify({
             'message': 'Opportunity updated successfully',
@@ -151,6 +156,7 @@ def delete_opportunity(opportunity_id):
         
         db.session.delete(opportunity)
         db.session.commit()
+        opportunity_cache.invalidate()
         
         return jsonify({'message': 'Opportunity deleted successfully'}), 200
         
@@ -165,18 +171,35 @@ def get_applications():
     try:
         user_id = int(get_jwt_identity())
         
+        try:
+            fields = application_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         # Get applications for opportunities created by this alumni
-        applications = db.session.query(Application).join(Opportunity).filter(
-            Opportunity.alumni_id == user_id
-        ).all()
+        applications = application_serializer.query(fields).filter(Opportunity.alumni_id == user_id)
         
         return jsonify({
-            'applications': [app.to_dict() for app in applications]
+            'applications': list(application_serializer.dump(applications, fields))
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@alumni_bp.route('/summary', methods=['GET'])
+@jwt_required()
+@alumni_required
+def get_summary():
+    try:
+        user_id = int(get_jwt_identity())
+        limit = parse_recent(request.args.get('limit', type=int))
+        
+        # Counts and the newest few rows only, for dashboards
+        return jsonify(alumni_summary(user_id, limit)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @alumni_bp.route('/applications/<int:application_id>/status', methods=['PUT'])
 @jwt_required()
 @alumni_required
@@ -196,7 +219,7 @@ def update_application_status(application_id):
         data = request.get_json()
         new_status = data.get('status')
         
-        if new_status not in ['pending', 'accepted', 'declined']:
+        if new_status not in APPLICATION_STATUSES:
             return jsonify({'error': 'Invalid status'}), 400
         
         application.status = new_status
@@ -211,6 +234,98 @@ def update_application_status(application_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@alumni_bp.route('/applications/status', methods=['PUT'])
+@jwt_required()
+@alumni_required
+def update_application_statuses():
+    try:
+        user_id = int(get_jwt_identity())
+        data = request.get_json() or {}
+        
+        new_status = data.get('status')
+        if new_status not in APPLICATION_STATUSES:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        # Select by explicit ids, or by filter (e.g. every pending application of one opportunity)
+        ids = data.get('ids')
+        criteria = data.get('filter')
+        if (ids is None) == (criteria is None):
+            return jsonify({'error': 'Provide either ids or filter'}), 400
+        
+        if ids is not None:
+            if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+                return jsonify({'error': 'ids must be a non-empty list of integers'}), 400
+            if len(ids) > MAX_BULK_STATUS_IDS:
+                return jsonify({'error': f'At most {MAX_BULK_STATUS_IDS} ids per request'}), 400
+            selection = [Application.id.in_(ids)]
+        else:
+            if not isinstance(criteria, dict) or not criteria.get('opportunity_id'):
+                return jsonify({'error': 'filter.opportunity_id required'}), 400
+            if not isinstance(criteria['opportunity_id'], int) or isinstance(criteria['opportunity_id'], bool):
+                return jsonify({'error': 'filter.opportunity_id must be an integer'}), 400
+            selection = [Application.opportunity_id == criteria['opportunity_id']]
+            if criteria.get('status'):
+                if criteria['status'] not in APPLICATION_STATUSES:
+                    return jsonify({'error': 'Invalid filter status'}), 400
+                selection.append(Application.status == criteria['status'])
+        
+        # Ownership is part of the WHERE clause of every statement
+        owned = Application.opportunity_id.in_(
+            db.session.query(Opportunity.id).filter(Opportunity.alumni_id == user_id)
+        )
+        
+        # Matched ids and their statuses for the per-id results; the row locks
+        # keep them exact where the database has them (not on SQLite)
+        previous = dict(
+            db.session.query(Application.id, Application.status)
+            .filter(owned, *selection)
+            .with_for_update()
+        )
+        
+        # One UPDATE per old status: the rows each statement changes give the
+        # stats_counters deltas (set-based UPDATEs skip the mapper hooks), so
+        # a concurrent update of the same rows cannot skew them
+        connection = db.session.connection()
+        returning = connection.dialect.update_returning
+        changed = set()
+        for status in APPLICATION_STATUSES:
+            if status == new_status:
+                continue
+            statement = db.update(Application).where(
+                owned, *selection, Application.status == status
+            ).values(status=new_status).execution_options(synchronize_session=False)
+            if returning:
+                changed_ids = db.session.execute(statement.returning(Application.id)).scalars().all()
+                count = len(changed_ids)
+            else:
+                count = db.session.execute(statement).rowcount
+                changed_ids = [i for i, old in previous.items() if old == status]
+            changed.update(changed_ids)
+            adjust_counter(connection, f'applications.status.{status}', -count)
+            adjust_counter(connection, f'applications.status.{new_status}', count)
+        
+        db.session.commit()
+        # Objects loaded earlier in this session may hold the old status
+        db.session.expire_all()
+        
+        def result(application_id):
+            if application_id in changed:
+                return 'updated'
+            return 'unchanged' if application_id in previous else 'not_found'
+        
+        results = [{'id': i, 'result': result(i)} for i in (ids if ids is not None else sorted(set(previous) | changed))]
+        
+        return jsonify({
+            'message': 'Application statuses updated successfully',
+            'status': new_status,
+            'updated': sum(1 for r in results if r['result'] == 'updated'),
+            'results': results
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @alumni_bp.route('/profile', methods=['GET'])
 @jwt_required()
 @alumni_required
@@ -263,6 +378,9 @@ def update_profile():
             profile.domain = data['domain']
         
         db.session.commit()
+        user_cache.invalidate(user_id)
+        if 'name' in data:
+            opportunity_cache.invalidate()
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -1,10 +1,18 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity
 from models import db, User, AlumniProfile, StudentProfile
+from utils.auth import create_user_token
+from utils.passwords import password_hasher, PasswordHasherBusy
 from email_validator import validate_email, EmailNotValidError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
+def hasher_busy_response():
+    """503 telling the client when to retry a login/registration"""
+    response = jsonify({'error': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = str(password_hasher.retry_after)
+    return response, 503
+
 @auth_bp.route('/register', methods=['POST'])
 def register():
     try:
@@ -63,7 +71,7 @@ def register():
             db.session.commit()
         
         # Generate JWT token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_user_token(user)
         
         return jsonify({
             'message': 'User registered successfully',
@@ -71,6 +79,9 @@ def register():
             'user': user.to_dict()
         }), 201
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return hasher_busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -89,8 +100,12 @@ def login():
         if not user or not user.check_password(data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
         
+        # Upgrade hashes made with a different cost factor while we have the password
+        if user.rehash_password_if_needed(data['password']):
+            db.session.commit()
+        
         # Generate JWT token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_user_token(user)
         
         return jsonify({
             'message': 'Login successful',
@@ -98,6 +113,9 @@ def login():
             'user': user.to_dict()
         }), 200
         
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return hasher_busy_response()
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
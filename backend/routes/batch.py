@@ -0,0 +1,154 @@
+"""
+Multiplexed requests: several API calls in one round trip.
+
+POST /api/batch takes ``{"requests": [{"method", "path", "body"}, ...]}`` and
+dispatches each item through the URL map as if it had been sent on its own:
+as the caller, whose token is verified once for the batch and reused by
+every item, and through the before/after_request hooks, so each item shows
+up in the metrics and the query detector under its own endpoint. Items run
+in order inside the batch request's app context, so they share one database
+session, which is rolled back after every item; the hooks' state in ``g``
+is put back after every item too. With ``"concurrency": n`` a batch of GETs
+instead runs up to n items at a time, each with its own app context and
+session.
+
+Every item gets its own status and body, so one failing item does not fail
+the batch. Bodies are JSON only; file uploads still go to their endpoints.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, current_app, request, jsonify, g
+from flask_jwt_extended import jwt_required, get_jwt
+from werkzeug.exceptions import HTTPException
+from models import db
+from utils.auth import BATCH_JWT_ENVIRON
+
+batch_bp = Blueprint('batch', __name__, url_prefix='/api')
+
+BATCH_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE'}
+READ_METHODS = {'GET', 'HEAD'}
+
+
+def parse_batch(data, max_requests):
+    """(items, concurrency) from a batch body; ValueError describes what is wrong"""
+    if isinstance(data, list):
+        data = {'requests': data}
+    if not isinstance(data, dict) or not isinstance(data.get('requests'), list):
+        raise ValueError('Expected {"requests": [{"method", "path", "body"}, ...]}')
+    items = data['requests']
+    if not items:
+        raise ValueError('No requests given')
+    if len(items) > max_requests:
+        raise ValueError(f'At most {max_requests} requests per batch')
+
+    parsed = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            raise ValueError(f'Request {index}: path is required')
+        method = str(item.get('method', 'GET')).upper()
+        path = item['path']
+        if method not in BATCH_METHODS:
+            raise ValueError(f'Request {index}: unsupported method {method}')
+        if not path.startswith('/api/'):
+            raise ValueError(f'Request {index}: path must start with /api/')
+        if path.split('?', 1)[0].rstrip('/') == '/api/batch':
+            raise ValueError(f'Request {index}: batches cannot be nested')
+        parsed.append((method, path, item.get('body')))
+
+    try:
+        concurrency = int(data.get('concurrency', 1))
+    except (TypeError, ValueError):
+        raise ValueError('concurrency must be an integer')
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+    return parsed, concurrency
+
+
+def _response_body(app, response):
+    """The sub-response body as JSON bytes"""
+    data = response.get_data()
+    if not data:
+        return b'null'
+    if response.is_json:
+        return data.rstrip()
+    if response.mimetype.startswith('text/'):
+        return app.json.dumps(data.decode('utf-8', 'replace')).encode('utf-8')
+    return b'null'
+
+
+def dispatch(app, method, path, body, headers, environ_base):
+    """Run one sub-request in a request context of its own; (status, JSON body bytes)"""
+    with app.test_request_context(path, method=method, json=body, headers=headers, environ_base=environ_base):
+        # A sequential item shares the batch request's ``g``; its hooks must not
+        # replace the batch's own metrics and detector state
+        outer = dict(vars(g))
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = app.dispatch_request()
+            except HTTPException as e:
+                rv = jsonify({'error': e.description}), e.code
+            except Exception as e:
+                try:
+                    # The JWT manager's handlers turn token errors into 401/422
+                    rv = app.handle_user_exception(e)
+                except Exception:
+                    app.logger.exception('Batch item %s %s failed', method, path)
+                    rv = jsonify({'error': str(e)}), 500
+            response = app.process_response(app.make_response(rv))
+            try:
+                return response.status_code, _response_body(app, response)
+            finally:
+                response.close()
+        finally:
+            vars(g).clear()
+            vars(g).update(outer)
+
+
+def run_batch(app, items, concurrency, headers, environ_base):
+    """[(status, body)] for ``items`` in order"""
+    concurrency = min(concurrency, app.config['BATCH_MAX_CONCURRENCY'], len(items))
+    if concurrency > 1 and all(method in READ_METHODS for method, _, _ in items):
+        def isolated(item):
+            with app.app_context():
+                return dispatch(app, *item, headers, environ_base)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(isolated, items))
+
+    results = []
+    for item in items:
+        # Each sub-request decides for itself whether it may read from a replica
+        db.session.info.pop('replica', None)
+        try:
+            results.append(dispatch(app, *item, headers, environ_base))
+        finally:
+            # Whatever an item left uncommitted (a 4xx that bailed after
+            # changing objects, a failed write) must not reach the next commit
+            db.session.rollback()
+    return results
+
+
+@batch_bp.route('/batch', methods=['POST'])
+@jwt_required()
+def batch():
+    try:
+        app = current_app._get_current_object()
+        try:
+            items, concurrency = parse_batch(request.get_json(silent=True), app.config['BATCH_MAX_REQUESTS'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        authorization = request.headers['Authorization']
+        headers = {'Authorization': authorization}
+        # Items reuse the identity verified for the batch instead of decoding the token again
+        token = authorization.split(None, 1)[-1]
+        environ_base = {'REMOTE_ADDR': request.remote_addr, BATCH_JWT_ENVIRON: (token, get_jwt())}
+        results = run_batch(app, items, concurrency, headers, environ_base)
+
+        # Sub-response bodies are already encoded; splice them in as they are
+        parts = [b'{"body":%s,"status":%d}' % (body, status) for status, body in results]
+        return app.response_class(b'{"responses":[' + b','.join(parts) + b']}\n', mimetype='application/json')
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
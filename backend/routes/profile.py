@@ -1,9 +1,47 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
+from sqlalchemy.orm import joinedload
 from models import db, User, AlumniProfile, StudentProfile
+from utils.auth import user_cache
+from utils.response_cache import opportunity_cache
 
 profile_bp = Blueprint('profile', __name__, url_prefix='/api')
 
+MAX_BATCH_PROFILES = 500
+
+PROFILE_RELATIONS = {
+    'alumni': User.alumni_profile,
+    'student': User.student_profile,
+}
+
+def profile_data(user_type, user):
+    """Profile response for ``user``; fields are None when no profile row exists yet"""
+    profile = user.alumni_profile if user_type == 'alumni' else user.student_profile
+    data = {
+        'id': profile.id if profile else None,
+        'user_id': user.id,
+        'name': user.name,
+        'email': user.email,
+        'phone': profile.phone if profile else None,
+        'location': profile.location if profile else None,
+        'bio': profile.bio if profile else None,
+        'linkedIn': profile.linkedin if profile else None,
+        'github': profile.github if profile else None,
+        'profile_pic': profile.profile_pic if profile else None,
+    }
+    if user_type == 'alumni':
+        data.update({
+            'occupation': profile.occupation if profile else None,
+            'company': profile.company if profile else None,
+            'workingDomain': profile.domain if profile else None,
+        })
+    else:
+        data.update({
+            'cgpa': profile.cgpa if profile else None,
+            'category': profile.category if profile else None,
+        })
+    return data
+
 @profile_bp.route('/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
@@ -13,54 +51,41 @@ def get_profile():
         if user_type not in ['alumni', 'student'] or not user_id:
             return jsonify({'error': 'Invalid parameters'}), 400
 
-        user = User.query.get(user_id)
+        # Read-only: a missing profile row is reported as empty fields, and
+        # created by the first PUT
+        user = User.query.options(joinedload(PROFILE_RELATIONS[user_type])).filter(
+            User.id == user_id, User.role == user_type).first()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        if user_type == 'alumni':
-            if not user.alumni_profile:
-                # Create an empty profile for robustness
-                profile = AlumniProfile(user_id=user_id)
-                db.session.add(profile)
-                db.session.commit()
-            profile = user.alumni_profile
-            data = {
-                'id': profile.id if profile else None,
-                'user_id': user.id,
-                'name': user.name,
-                'email': user.email,
-                'phone': profile.phone if profile else None,
-                'location': profile.location if profile else None,
-                'bio': profile.bio if profile else None,
-                'linkedIn': profile.linkedin if profile else None,
-                'github': profile.github if profile else None,
-                'profile_pic': profile.profile_pic if profile else None,
-                'occupation': profile.occupation if profile else None,
-                'company': profile.company if profile else None,
-                'workingDomain': getattr(profile, 'domain', None) if profile else None,
-            }
-        else:
-            if not user.student_profile:
-                profile = StudentProfile(user_id=user_id)
-                db.session.add(profile)
-                db.session.commit()
-            profile = user.student_profile
-            data = {
-                'id': profile.id if profile else None,
-                'user_id': user.id,
-                'name': user.name,
-                'email': user.email,
-                'phone': profile.phone if profile else None,
-                'location': profile.location if profile else None,
-                'bio': profile.bio if profile else None,
-                'linkedIn': profile.linkedin if profile else None,
-                'github': profile.github if profile else None,
-                'profile_pic': profile.profile_pic if profile else None,
-                'cgpa': profile.cgpa if profile else None,
-                'category': profile.category if profile else None,
-            }
-
-        return jsonify({'profile': data}), 200
+        return jsonify({'profile': profile_data(user_type, user)}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@profile_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+def get_profiles():
+    """Many profiles of one type in one query, e.g. every applicant on a list"""
+    try:
+        user_type = request.args.get('type')
+        try:
+            ids = list(dict.fromkeys(int(value) for value in request.args.get('ids', '').split(',') if value.strip()))
+        except ValueError:
+            return jsonify({'error': 'ids must be a comma-separated list of integers'}), 400
+        if user_type not in ['alumni', 'student'] or not ids:
+            return jsonify({'error': 'Invalid parameters'}), 400
+        if len(ids) > MAX_BATCH_PROFILES:
+            return jsonify({'error': f'At most {MAX_BATCH_PROFILES} ids per request'}), 400
+
+        # Users of another role count as missing, so admins are never listed
+        users = User.query.options(joinedload(PROFILE_RELATIONS[user_type])).filter(
+            User.id.in_(ids), User.role == user_type).all()
+        by_id = {user.id: user for user in users}
+
+        return jsonify({
+            'profiles': [profile_data(user_type, by_id[user_id]) for user_id in ids if user_id in by_id],
+            'missing': [user_id for user_id in ids if user_id not in by_id]
+        }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -131,40 +156,13 @@ def update_profile():
                 profile.category = data['category']
 
         db.session.commit()
+        user_cache.invalidate(user_id)
+        if user.role == 'alumni' and 'name' in data:
+            # Listings show the alumni name
+            opportunity_cache.invalidate()
 
         # Re-hydrate response from DB to ensure persisted values are returned
-        refreshed = user.alumni_profile if user_type == 'alumni' else user.student_profile
-        resp = {
-            'id': getattr(refreshed, 'id', None),
-            'user_id': user.id,
-            'name': user.name,
-            'email': user.email,
-        }
-        if user_type == 'alumni':
-            resp.update({
-                'phone': refreshed.phone,
-                'location': refreshed.location,
-                'bio': refreshed.bio,
-                'linkedIn': refreshed.linkedin,
-                'github': refreshed.github,
-                'profile_pic': refreshed.profile_pic,
-                'occupation': refreshed.occupation,
-                'company': refreshed.company,
-                'workingDomain': getattr(refreshed, 'domain', None),
-            })
-        else:
-            resp.update({
-                'phone': refreshed.phone,
-                'location': refreshed.location,
-                'bio': refreshed.bio,
-                'linkedIn': refreshed.linkedin,
-                'github': refreshed.github,
-                'profile_pic': refreshed.profile_pic,
-                'cgpa': refreshed.cgpa,
-                'category': refreshed.category,
-            })
-
-        return jsonify({'profile': resp}), 200
+        return jsonify({'profile': profile_data(user_type, user)}), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -1,20 +1,26 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 from models import db, User, Opportunity, Application, StudentProfile
-from utils.file_utils import save_uploaded_file, delete_file
+from models.query_shapes import with_opportunity_relations
+from models.serializers import opportunity_serializer, application_serializer
+from models.search import search_opportunities, search_terms, highlight
+from models.recommendations import opportunity_index
+from models.summaries import student_summary, parse_recent
+from utils.auth import role_required, user_cache
+from utils.file_utils import save_uploaded_file, delete_file, storage_lock
+from utils.pagination import keyset_page, keyset_order, parse_limit
+from utils.streaming import ndjson_response, json_array_response
+from utils.response_cache import opportunity_cache
+
+STREAM_BATCH_SIZE = 500
+DEFAULT_RECOMMENDATIONS = 10
+# Query parameters that change the opportunity listing, used as the cache key
+LISTING_PARAMS = ('type', 'category', 'min_cgpa', 'limit', 'cursor', 'fields')
 
 student_bp = Blueprint('student', __name__, url_prefix='/api/student')
 
-def student_required(f):
-    """Decorator to require student role"""
-    def decorated_function(*args, **kwargs):
-        user_id = int(get_jwt_identity())
-        user = User.query.get(user_id)
-        if not user or user.role != 'student':
-            return jsonify({'error': 'Student access required'}), 403
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+student_required = role_required('student', 'Student access required')
 
 @student_bp.route('/opportunities', methods=['GET'])
 @jwt_required()
@@ -25,22 +31,133 @@ def get_opportunities():
         opp_type = request.args.get('type')
         category = request.args.get('category')
         min_cgpa = request.args.get('min_cgpa', type=float)
+        try:
+            fields = opportunity_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Build query
-        query = Opportunity.query
+        # Build query over just the columns being returned
+        query = opportunity_serializer.query(fields)
         
         if opp_type:
-            query = query.filter_by(type=opp_type)
+            query = query.filter(Opportunity.type == opp_type)
         if category:
-            query = query.filter_by(category=category)
+            query = query.filter(Opportunity.category == category)
         if min_cgpa is not None:
             query = query.filter(Opportunity.min_cgpa <= min_cgpa)
         
-        opportunities = query.all()
+        # Streaming mode: rows are fetched from a server-side cursor in batches
+        stream = request.args.get('stream')
+        if stream in ('ndjson', 'json'):
+            rows = opportunity_serializer.dump(keyset_order(
+                query, Opportunity.created_at, Opportunity.id
+            ).yield_per(STREAM_BATCH_SIZE), fields)
+            if stream == 'ndjson':
+                return ndjson_response(rows)
+            return json_array_response('opportunities', rows)
+        
+        # Listings only change when an alumnus writes an opportunity
+        cache_key = opportunity_cache.key({
+            name: request.args[name] for name in LISTING_PARAMS if name in request.args
+        })
+        cached = opportunity_cache.get(cache_key)
+        if cached is not None:
+            return current_app.response_class(cached, mimetype='application/json'), 200
+        
+        # Keyset pagination when the client asks for a page
+        if 'limit' in request.args or 'cursor' in request.args:
+            limit = parse_limit(request.args.get('limit', type=int))
+            try:
+                opportunities, next_cursor = keyset_page(
+                    query, Opportunity.created_at, Opportunity.id,
+                    limit, request.args.get('cursor')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            response = jsonify({
+                'opportunities': list(opportunity_serializer.dump(opportunities, fields)),
+                'next_cursor': next_cursor
+            })
+        else:
+            opportunities = keyset_order(query, Opportunity.created_at, Opportunity.id)
+            response = jsonify({
+                'opportunities': list(opportunity_serializer.dump(opportunities, fields))
+            })
+        
+        opportunity_cache.set(cache_key, response.get_data())
+        return response, 200
         
-        return jsonify({
-            'opportunities': [opp.to_dict() for opp in opportunities]
-        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@student_bp.route('/opportunities/search', methods=['GET'])
+@jwt_required()
+@student_required
+def search():
+    try:
+        q = (request.args.get('q') or '').strip()
+        if not q:
+            return jsonify({'error': 'q is required'}), 400
+        
+        limit = parse_limit(request.args.get('limit', type=int))
+        hits = search_opportunities(q, limit, request.args.get('type'))
+        
+        # Load the matching rows in one query and keep the ranking order
+        ids = [opp_id for opp_id, _, _ in hits]
+        opportunities = {
+            opp.id: opp for opp in
+            with_opportunity_relations(Opportunity.query.filter(Opportunity.id.in_(ids))).all()
+        } if ids else {}
+        
+        terms = search_terms(q)
+        results = []
+        for opp_id, score, snippet in hits:
+            opp = opportunities.get(opp_id)
+            if not opp:
+                continue
+            data = opp.to_dict()
+            data['score'] = score
+            data['snippet'] = snippet or highlight(opp.description, terms) or highlight(opp.title, terms)
+            results.append(data)
+        
+        return jsonify({'opportunities': results}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@student_bp.route('/recommendations', methods=['GET'])
+@jwt_required()
+@student_required
+def get_recommendations():
+    try:
+        user_id = int(get_jwt_identity())
+        limit = parse_limit(request.args.get('limit', DEFAULT_RECOMMENDATIONS, type=int))
+        
+        profile = StudentProfile.query.filter_by(user_id=user_id).first()
+        applied = [opp_id for (opp_id,) in
+                   db.session.query(Application.opportunity_id).filter_by(student_id=user_id)]
+        
+        # Over-fetch a little in case some ranked rows were deleted by another worker
+        ranked = opportunity_index.recommend(
+            profile.to_dict() if profile else {}, limit * 2, exclude_ids=applied
+        )
+        ids = [opp_id for opp_id, _ in ranked]
+        opportunities = {
+            opp.id: opp for opp in
+            with_opportunity_relations(Opportunity.query.filter(Opportunity.id.in_(ids))).all()
+        } if ids else {}
+        
+        results = []
+        for opp_id, score in ranked:
+            opp = opportunities.get(opp_id)
+            if not opp:
+                continue
+            data = opp.to_dict()
+            data['score'] = score
+            results.append(data)
+        
+        return jsonify({'opportunities': results[:limit]}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -72,24 +189,37 @@ def apply_to_opportunity(opportunity_id):
             if opportunity.min_cgpa and student.student_profile.cgpa < opportunity.min_cgpa:
                 return jsonify({'error': 'Your CGPA does not meet the minimum requirement'}), 400
         
-        # Handle file upload
+        # Handle file upload; the lock keeps delete_file from removing a
+        # shared resume before this application's reference is committed
         resume_file = None
-        if 'resume' in request.files:
-            file = request.files['resume']
-            if file.filename:
-                resume_file = save_uploaded_file(file)
-                if not resume_file:
-                    return jsonify({'error': 'Invalid file format. Only PDF, DOC, DOCX allowed'}), 400
-        
-        # Create application
-        application = Application(
-            student_id=user_id,
-            opportunity_id=opportunity_id,
-            resume_file=resume_file
-        )
-        
-        db.session.add(application)
-        db.session.commit()
+        with storage_lock():
+            if 'resume' in request.files:
+                file = request.files['resume']
+                if file.filename:
+                    resume_file = save_uploaded_file(file)
+                    if not resume_file:
+                        return jsonify({'error': 'Invalid file format. Only PDF, DOC, DOCX allowed'}), 400
+            
+            # Create application
+            application = Application(
+                student_id=user_id,
+                opportunity_id=opportunity_id,
+                resume_file=resume_file
+            )
+            
+            db.session.add(application)
+            try:
+                db.session.commit()
+                duplicate = False
+            except IntegrityError:
+                # A concurrent request won the race past the check above
+                db.session.rollback()
+                duplicate = True
+        
+        if duplicate:
+            if resume_file:
+                delete_file(resume_file)
+            return jsonify({'error': 'You have already applied to this opportunity'}), 400
         
         return jsonify({
             'message': 'Application submitted successfully',
@@ -106,15 +236,33 @@ def apply_to_opportunity(opportunity_id):
 def get_my_applications():
     try:
         user_id = int(get_jwt_identity())
-        applications = Application.query.filter_by(student_id=user_id).all()
+        try:
+            fields = application_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        applications = application_serializer.query(fields).filter(Application.student_id == user_id)
         
         return jsonify({
-            'applications': [app.to_dict() for app in applications]
+            'applications': list(application_serializer.dump(applications, fields))
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@student_bp.route('/summary', methods=['GET'])
+@jwt_required()
+@student_required
+def get_summary():
+    try:
+        user_id = int(get_jwt_identity())
+        limit = parse_recent(request.args.get('limit', type=int))
+        
+        # Counts and the newest few rows only, for dashboards
+        return jsonify(student_summary(user_id, limit)), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @student_bp.route('/applications/<int:application_id>', methods=['DELETE'])
 @jwt_required()
 @student_required
@@ -133,13 +281,14 @@ def withdraw_application(application_id):
         if application.status != 'pending':
             return jsonify({'error': 'Cannot withdraw application that has been processed'}), 400
         
-        # Delete resume file if exists
-        if application.resume_file:
-            delete_file(application.resume_file)
-        
+        resume_file = application.resume_file
         db.session.delete(application)
         db.session.commit()
         
+        # Shared resumes are only removed with their last application
+        if resume_file:
+            delete_file(resume_file)
+        
         return jsonify({'message': 'Application withdrawn successfully'}), 200
         
     except Exception as e:
@@ -196,6 +345,7 @@ def update_profile():
             profile.category = data['category']
         
         db.session.commit()
+        user_cache.invalidate(user_id)
         
         return jsonify({
             'message': 'Profile updated successfully',
@@ -7,7 +7,7 @@ echo "Installing dependencies..."
 pip install -r requirements.txt
 
 echo
-echo "Starting Flask server..."
+echo "Starting Flask server (pending database migrations are applied first)..."
 echo "Backend will be available at: http://localhost:5000"
 echo
 echo "Default admin credentials:"
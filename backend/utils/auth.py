@@ -0,0 +1,118 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from flask import jsonify, request, has_request_context
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt, get_jwt_identity
+from models import db, User
+
+# WSGI environ key under which /api/batch hands its items the token it verified
+BATCH_JWT_ENVIRON = 'alumni_connect.batch_jwt'
+
+# What the role decorators need to know about a user; safe to share across threads
+CachedUser = namedtuple('CachedUser', ['id', 'role', 'token_version'])
+
+
+class UserCache:
+    """Bounded, TTL-evicting per-process cache of CachedUser entries"""
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def configure(self, max_size, ttl):
+        with self._lock:
+            self.max_size = max_size
+            self.ttl = ttl
+            self._entries.clear()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            user, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user):
+        with self._lock:
+            self._entries[user.id] = (user, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+class BatchJWTManager(JWTManager):
+    """
+    JWTManager that reuses the claims /api/batch already verified.
+
+    Batch items carry (encoded token, claims) in their WSGI environ, which a
+    client cannot set, so jwt_required() on every item resolves the caller's
+    identity without decoding and verifying the token again.
+    """
+
+    def _decode_jwt_from_config(self, encoded_token, csrf_value=None, allow_expired=False):
+        if has_request_context():
+            shared = request.environ.get(BATCH_JWT_ENVIRON)
+            if shared is not None and shared[0] == encoded_token:
+                return dict(shared[1])
+        return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+
+def create_user_token(user):
+    """Issue an access token carrying the user's role and token version"""
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims={'role': user.role, 'ver': user.token_version}
+    )
+
+
+def load_cached_user(user_id):
+    """Return a CachedUser, hitting the database only on a cache miss"""
+    cached = user_cache.get(user_id)
+    if cached is None:
+        row = db.session.query(User.id, User.role, User.token_version).filter_by(id=user_id).first()
+        if row is None:
+            return None
+        cached = CachedUser(row.id, row.role, row.token_version)
+        user_cache.set(cached)
+    return cached
+
+
+def role_required(role, message):
+    """Decorator to require ``role``; must be applied after ``jwt_required()``"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            claims = get_jwt()
+            # Tokens issued before role claims existed carry no 'role'
+            if claims.get('role', role) != role:
+                return jsonify({'error': message}), 403
+
+            user = load_cached_user(int(get_jwt_identity()))
+            if not user or user.role != role:
+                return jsonify({'error': message}), 403
+            # Tokens without 'ver' predate versioning, i.e. were issued at version 1,
+            # so bumping the version revokes them too
+            if claims.get('ver', 1) != user.token_version:
+                return jsonify({'error': 'Token has been revoked'}), 401
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
@@ -0,0 +1,216 @@
+"""
+Bulk user import for onboarding a whole class at once.
+
+Rows are validated up front (field types, email syntax, duplicates in the
+file and in the database), passwords are hashed in parallel in a dedicated
+process pool (the CLI) or through the shared password hasher (the HTTP
+route) and users plus their profiles are written with executemany inserts,
+one transaction per chunk. The result is a per-row report instead of an
+all-or-nothing failure.
+"""
+
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import func
+from email_validator import validate_email, EmailNotValidError
+from models import db, User, AlumniProfile, StudentProfile
+from models.stats import adjust_counter
+from utils.passwords import password_hasher, hash_password
+
+ROLES = ['admin', 'alumni', 'student']
+PROFILE_FIELDS = {
+    'alumni': ['occupation', 'company', 'domain', 'phone', 'location', 'bio', 'linkedin', 'github'],
+    'student': ['cgpa', 'category', 'phone', 'location', 'bio', 'linkedin', 'github'],
+}
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class ImportFormatError(Exception):
+    """Raised when the uploaded file cannot be parsed at all"""
+
+
+def parse_rows(data, filename=''):
+    """Parse CSV or JSON (a list, or {"users": [...]}) into a list of dicts"""
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    text = data.strip()
+    if filename.lower().endswith('.json') or text.startswith(('[', '{')):
+        try:
+            parsed = json.loads(text)
+        except ValueError as e:
+            raise ImportFormatError(f'Invalid JSON: {e}')
+        rows = parsed.get('users') if isinstance(parsed, dict) else parsed
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ImportFormatError('JSON must be a list of user objects')
+        return rows
+    return [
+        {key.strip(): (value.strip() if isinstance(value, str) else value)
+         for key, value in row.items() if key}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def validate_rows(rows):
+    """
+    Split rows into (valid, errors).
+
+    ``valid`` holds (row_number, normalized dict); ``errors`` holds report
+    entries. Row numbers are 1-based positions in the input.
+    """
+    valid, errors, seen = [], [], set()
+    for number, row in enumerate(rows, start=1):
+        def fail(message):
+            errors.append({'row': number, 'email': row.get('email'), 'error': message})
+
+        missing = [field for field in ['name', 'email', 'password', 'role'] if not row.get(field)]
+        if missing:
+            fail(f"{', '.join(missing)} required")
+            continue
+        # JSON rows can carry numbers, lists or objects where text is expected
+        not_text = [field for field in ['name', 'email', 'password', 'role'] if not isinstance(row[field], str)]
+        if not_text:
+            fail(f"{', '.join(not_text)} must be text")
+            continue
+        if row['role'] not in ROLES:
+            fail('Invalid role. Must be admin, alumni, or student')
+            continue
+        not_text = [field for field in PROFILE_FIELDS.get(row['role'], [])
+                    if field != 'cgpa' and row.get(field) is not None and not isinstance(row[field], str)]
+        if not_text:
+            fail(f"{', '.join(not_text)} must be text")
+            continue
+        try:
+            # Deliverability needs a DNS lookup per row; syntax is enough here
+            email = validate_email(row['email'], check_deliverability=False).normalized
+        except EmailNotValidError:
+            fail('Invalid email format')
+            continue
+        if email.lower() in seen:
+            fail('Duplicate email in file')
+            continue
+        seen.add(email.lower())
+
+        profile = {}
+        for field in PROFILE_FIELDS.get(row['role'], []):
+            value = row.get(field)
+            if value in (None, ''):
+                continue
+            profile[field] = value
+        if 'cgpa' in profile:
+            try:
+                if isinstance(profile['cgpa'], bool):
+                    raise TypeError
+                profile['cgpa'] = float(profile['cgpa'])
+            except (TypeError, ValueError):
+                fail('cgpa must be a number')
+                continue
+
+        valid.append((number, {
+            'name': row['name'],
+            'email': email,
+            'password': row['password'],
+            'role': row['role'],
+            'profile': profile,
+        }))
+    return valid, errors
+
+
+def hash_passwords(passwords, rounds, pool=None, workers=1, hasher=None):
+    """Hash many passwords, in parallel when given a process pool"""
+    if hasher is not None:
+        # In parallel on the shared pool, within its pending-job limit; raises
+        # PasswordHasherBusy like a login would
+        return hasher.hash_many(passwords)
+    if pool is None:
+        return [hash_password(password, rounds) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(pool.map(hash_password, passwords, [rounds] * len(passwords), chunksize=chunksize))
+
+
+def _insert_chunk(chunk, hashes):
+    """Insert one chunk of validated rows in the current transaction"""
+    emails = [row['email'] for _, row in chunk]
+    db.session.execute(User.__table__.insert(), [
+        {'name': row['name'], 'email': row['email'], 'role': row['role'],
+         'password_hash': password_hash, 'token_version': 1}
+        for (_, row), password_hash in zip(chunk, hashes)
+    ])
+    ids = dict(db.session.query(User.email, User.id).filter(User.email.in_(emails)))
+
+    alumni = [dict(row['profile'], user_id=ids[row['email']])
+              for _, row in chunk if row['role'] == 'alumni']
+    students = [dict(row['profile'], user_id=ids[row['email']])
+                for _, row in chunk if row['role'] == 'student']
+    # executemany needs the same keys in every row
+    if alumni:
+        db.session.execute(AlumniProfile.__table__.insert(), [
+            {field: profile.get(field) for field in ['user_id'] + PROFILE_FIELDS['alumni']}
+            for profile in alumni
+        ])
+    if students:
+        db.session.execute(StudentProfile.__table__.insert(), [
+            {field: profile.get(field) for field in ['user_id'] + PROFILE_FIELDS['student']}
+            for profile in students
+        ])
+
+    # Core inserts bypass the ORM hooks that maintain stats_counters
+    connection = db.session.connection()
+    adjust_counter(connection, 'users', len(chunk))
+    for role in ROLES:
+        adjust_counter(connection, f'users.role.{role}',
+                       sum(1 for _, row in chunk if row['role'] == role))
+
+
+def import_users(rows, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, rounds=None, hasher=None):
+    """
+    Validate, hash and insert users with their profiles.
+
+    Returns {'total', 'created', 'failed', 'errors': [{'row', 'email', 'error'}]}.
+    ``rounds`` defaults to BCRYPT_LOG_ROUNDS; a lower cost is upgraded by the
+    rehash-on-login path the first time each user signs in. With ``hasher``
+    (a PasswordHasher) passwords go through its bounded pool at its cost
+    instead of a pool of the import's own; PasswordHasherBusy then stops the
+    import after the chunks already committed.
+    """
+    workers = workers or os.cpu_count() or 1
+    rounds = rounds or password_hasher.rounds
+    valid, errors = validate_rows(rows)
+
+    # A pool of its own, so a CLI import does not queue behind (or starve) logins
+    pool = None
+    if hasher is None and workers > 1 and len(valid) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    created = 0
+    try:
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+
+            # Case-insensitive, like the duplicate check within the file
+            existing = {email.lower() for (email,) in db.session.query(User.email).filter(
+                func.lower(User.email).in_([row['email'].lower() for _, row in chunk]))}
+            for number, row in chunk:
+                if row['email'].lower() in existing:
+                    errors.append({'row': number, 'email': row['email'],
+                                   'error': 'User with this email already exists'})
+            chunk = [(number, row) for number, row in chunk if row['email'].lower() not in existing]
+            if not chunk:
+                continue
+
+            hashes = hash_passwords([row['password'] for _, row in chunk], rounds, pool, workers, hasher)
+            try:
+                _insert_chunk(chunk, hashes)
+                db.session.commit()
+                created += len(chunk)
+            except Exception as e:
+                db.session.rollback()
+                errors.extend({'row': number, 'email': row['email'], 'error': f'Insert failed: {e}'}
+                              for number, row in chunk)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    errors.sort(key=lambda error: error['row'])
+    return {'total': len(rows), 'created': created, 'failed': len(errors), 'errors': errors}
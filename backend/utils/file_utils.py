@@ -1,36 +1,165 @@
+import hashlib
+import mimetypes
 import os
-import uuid
-from werkzeug.utils import secure_filename
-from flask import current_app
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from flask import current_app, request, send_from_directory
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to a lock shared by this process's threads
+    fcntl = None
+
+CHUNK_SIZE = 64 * 1024
+CONTENT_ADDRESSED = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.\w+$')
+# Starts with .upload- so migrate_uploads.py skips it like the temp files
+LOCK_NAME = '.upload-lock'
+
+_thread_lock = threading.Lock()
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def content_path(digest, extension):
+    """Relative, sharded storage path for a SHA-256 hex digest: ab/cd/abcd...ext"""
+    return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+def file_digest(path):
+    """SHA-256 hex digest of a file on disk"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def store_content(source, extension, upload_dir):
+    """
+    Copy a readable binary stream into content-addressed storage.
+
+    Returns the relative stored filename. Identical content is stored once.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                tmp.write(chunk)
+        
+        filename = content_path(digest.hexdigest(), extension)
+        file_path = os.path.join(upload_dir, filename)
+        if os.path.exists(file_path):
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            os.replace(tmp_path, file_path)
+        return filename
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 def save_uploaded_file(file):
-    """Save uploaded file and return filename"""
+    """Save uploaded file and return its content-addressed filename"""
     if file and allowed_file(file.filename):
-        # Generate unique filename
-        filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        
-        # Ensure upload directory exists
-        upload_dir = current_app.config['UPLOAD_FOLDER']
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Save file
-        file_path = os.path.join(upload_dir, unique_filename)
-        file.save(file_path)
-        
-        return unique_filename
+        # allowed_file checked this extension; the name itself may be just ".pdf"
+        extension = file.filename.rsplit('.', 1)[1].lower()
+        return store_content(file.stream, extension, current_app.config['UPLOAD_FOLDER'])
     return None
 
+@contextmanager
+def storage_lock(exclusive=False):
+    """
+    Order storing a file and committing its reference against deleting it.
+
+    Writers hold it shared from storing a file until the row that points at
+    it is committed; delete_file holds it exclusively while it counts the
+    references and unlinks, so it cannot remove a file that an uncommitted
+    application is about to use. Do not call delete_file while holding it.
+    """
+    if fcntl is None:
+        with _thread_lock:
+            yield
+        return
+    upload_dir = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_dir, exist_ok=True)
+    with open(os.path.join(upload_dir, LOCK_NAME), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield  # closing the file releases the lock
+
+def reference_count(filename):
+    """Number of applications that point at a stored file"""
+    from models import Application
+    return Application.query.filter_by(resume_file=filename).count()
+
 def delete_file(filename):
-    """Delete file from uploads directory"""
-    if filename:
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        if os.path.exists(file_path):
-            os.remove(file_path)
-            return True
+    """
+    Delete file from uploads directory once nothing references it.
+
+    Call after the referencing Application has been deleted and committed
+    (so the count runs in a fresh transaction).
+    """
+    if not filename:
+        return False
+    with storage_lock(exclusive=True):
+        if reference_count(filename) == 0:
+            file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+                return True
     return False
+
+@lru_cache(maxsize=4096)
+def _cached_digest(path, mtime_ns, size):
+    return file_digest(path)
+
+def stored_file_etag(filename, file_path):
+    """Strong ETag for a stored file: its SHA-256, read from the name when possible"""
+    match = CONTENT_ADDRESSED.match(filename)
+    if match:
+        return match.group(1)
+    # Old uuid_filename uploads have to be hashed (once per file version)
+    stat = os.stat(file_path)
+    return _cached_digest(file_path, stat.st_mtime_ns, stat.st_size)
+
+def send_stored_file(filename):
+    """
+    Serve a file from the uploads directory with a strong ETag.
+
+    Depending on FILE_SERVE_MODE the bytes are sent by Flask (with
+    conditional GET and Range support), or handed to the front proxy through
+    X-Accel-Redirect (nginx) or X-Sendfile (Apache/lighttpd).
+    """
+    upload_dir = current_app.config['UPLOAD_FOLDER']
+    file_path = safe_join(upload_dir, filename)
+    if file_path is None or not os.path.isfile(file_path):
+        raise NotFound()
+    
+    etag = stored_file_etag(filename, file_path)
+    # Content-addressed files never change under the same name
+    max_age = current_app.config['UPLOAD_MAX_AGE'] if CONTENT_ADDRESSED.match(filename) else 0
+    
+    if current_app.config['FILE_SERVE_MODE'] == 'x-accel-redirect':
+        response = current_app.response_class()
+        response.headers['X-Accel-Redirect'] = current_app.config['X_ACCEL_REDIRECT_PREFIX'] + filename
+        response.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response.set_etag(etag)
+        response.last_modified = os.path.getmtime(file_path)
+        response.cache_control.private = True
+        response.cache_control.max_age = max_age
+        # Answer revalidations here so they never reach the proxy's file handler
+        return response.make_conditional(request.environ)
+    
+    response = send_from_directory(upload_dir, filename, as_attachment=False,
+                                   etag=etag, max_age=max_age, conditional=True)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
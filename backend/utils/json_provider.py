@@ -0,0 +1,45 @@
+"""
+Optional orjson encoding for every JSON response.
+
+Installed as ``app.json``, so ``jsonify``, the streaming helpers and the
+response cache all use it. Output matches Flask's default provider: keys are
+sorted, and dates, decimals and the like still go through Flask's ``default``
+(orjson would otherwise write datetimes as ISO strings instead of HTTP
+dates). Pretty-printed output (debug mode, ``indent=``) falls back to the
+standard library.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding"""
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    """Use orjson when JSON_BACKEND is 'orjson' and the package is installed"""
+    if app.config['JSON_BACKEND'] == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
@@ -0,0 +1,164 @@
+"""
+Per-request performance metrics in Prometheus text format.
+
+Request hooks time every request and engine events add up the SQL
+statements it runs; the password hasher reports bcrypt time through
+``record_bcrypt``. Totals are kept on ``flask.g`` while the request runs and
+folded into per-endpoint histograms when it finishes, so the hot path is a
+few additions and one locked bucket update per histogram. Like the user
+cache, the histograms belong to the worker process that served the request.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        for label_values, (counts, total) in series:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {cumulative}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RequestMetrics:
+    """Histograms per (endpoint, method) fed by the request and engine hooks"""
+
+    def __init__(self):
+        self.enabled = True
+        self.server_timing = False
+        labels = ('endpoint', 'method')
+        self.duration = Histogram('http_request_duration_seconds', 'Wall time per request',
+                                  DURATION_BUCKETS, labels)
+        self.statements = Histogram('http_request_sql_statements', 'SQL statements per request',
+                                    STATEMENT_BUCKETS, labels)
+        self.sql_time = Histogram('http_request_sql_duration_seconds', 'Time spent in SQL per request',
+                                  DURATION_BUCKETS, labels)
+        self.bcrypt_time = Histogram('http_request_bcrypt_duration_seconds',
+                                     'bcrypt time per request that hashed or checked a password',
+                                     DURATION_BUCKETS, labels)
+        self.size = Histogram('http_response_size_bytes', 'Response body size, when known up front',
+                              SIZE_BUCKETS, labels)
+        self.histograms = [self.duration, self.statements, self.sql_time, self.bcrypt_time, self.size]
+
+    def configure(self, enabled, server_timing):
+        self.enabled = enabled
+        self.server_timing = server_timing
+        for histogram in self.histograms:
+            histogram.clear()
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        return '\n'.join(lines) + '\n'
+
+    def _start(self):
+        g._metrics = {'started': time.perf_counter(), 'statements': 0, 'sql': 0.0, 'bcrypt': 0.0}
+
+    def _finish(self, response):
+        state = g.pop('_metrics', None)
+        if state is None:
+            return response
+        elapsed = time.perf_counter() - state['started']
+        labels = (request.endpoint or 'unmatched', request.method)
+        self.duration.observe(labels, elapsed)
+        self.statements.observe(labels, state['statements'])
+        self.sql_time.observe(labels, state['sql'])
+        if state['bcrypt']:
+            self.bcrypt_time.observe(labels, state['bcrypt'])
+        if response.content_length is not None:
+            self.size.observe(labels, response.content_length)
+        if self.server_timing:
+            timings = [f"app;dur={elapsed * 1000:.1f}",
+                       f"db;dur={state['sql'] * 1000:.1f};desc=\"{state['statements']} queries\""]
+            if state['bcrypt']:
+                timings.append(f"bcrypt;dur={state['bcrypt'] * 1000:.1f}")
+            response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+
+request_metrics = RequestMetrics()
+
+
+def _current():
+    return g.get('_metrics') if has_request_context() else None
+
+
+def record_bcrypt(seconds):
+    """Add password hashing time to the current request, if any"""
+    state = _current()
+    if state is not None:
+        state['bcrypt'] += seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    state = _current()
+    started = getattr(context, '_metrics_started', None)
+    if state is not None and started is not None:
+        state['statements'] += 1
+        state['sql'] += time.perf_counter() - started
+
+
+def instrument_engine(engine):
+    if not event.contains(engine, 'after_cursor_execute', _after_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def install_request_metrics(app, engines):
+    """Register the request hooks on ``app`` and the SQL timers on ``engines``"""
+    request_metrics.configure(app.config['METRICS_ENABLED'], app.config['SERVER_TIMING_HEADER'])
+    if not request_metrics.enabled:
+        return
+    for engine in engines:
+        instrument_engine(engine)
+    app.before_request(request_metrics._start)
+    app.after_request(request_metrics._finish)
@@ -0,0 +1,63 @@
+import base64
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at, row_id):
+    """Build an opaque cursor pointing just past (created_at, id)"""
+    raw = f"{created_at.isoformat() if created_at else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) from a cursor, raising ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        created_at, row_id = raw.split('|', 1)
+        return (datetime.fromisoformat(created_at) if created_at else None), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def parse_limit(value):
+    """Clamp a requested page size to [1, MAX_PAGE_SIZE]"""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(value, MAX_PAGE_SIZE))
+
+
+def keyset_order(query, created_column, id_column):
+    """Newest first, with the primary key as a tie-breaker"""
+    return query.order_by(created_column.desc(), id_column.desc())
+
+
+def keyset_filter(query, created_column, id_column, cursor):
+    """Restrict an ordered query to the rows after ``cursor``"""
+    created_at, row_id = decode_cursor(cursor)
+    if created_at is None:
+        return query.filter(created_column.is_(None), id_column < row_id)
+    return query.filter(or_(
+        created_column < created_at,
+        and_(created_column == created_at, id_column < row_id),
+        created_column.is_(None)
+    ))
+
+
+def keyset_page(query, created_column, id_column, limit, cursor=None):
+    """
+    Fetch one page of a keyset-paginated query.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = keyset_filter(query, created_column, id_column, cursor)
+    rows = keyset_order(query, created_column, id_column).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
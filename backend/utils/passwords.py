@@ -0,0 +1,199 @@
+"""
+Password hashing off the request threads.
+
+bcrypt is deliberately slow, so a burst of logins can occupy every worker
+thread. Hashes are computed in a small process pool with a bounded number of
+pending jobs; when the pool is saturated (or a job outlives the timeout)
+callers get PasswordHasherBusy and the routes answer 503 with Retry-After
+instead of queueing without limit. A pool whose worker process died is
+replaced on the next call.
+"""
+
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+from utils.metrics import record_bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing jobs are already pending"""
+
+
+def _hashpw(password, rounds):
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def hash_password(password, rounds):
+    """bcrypt hash of ``password`` at cost ``rounds``, in the calling process"""
+    return _hashpw(password.encode('utf-8'), rounds)
+
+
+def _checkpw(password, password_hash):
+    return bcrypt.checkpw(password, password_hash)
+
+
+class PasswordHasher:
+    """bcrypt hashing in a bounded process pool (or inline when workers is 0)"""
+
+    def __init__(self, rounds=12, workers=0, max_pending=32, timeout=30, retry_after=1):
+        self._slots = None
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        self._configure_lock = threading.Lock()
+        self.configure(rounds, workers, max_pending, timeout, retry_after)
+
+    def configure(self, rounds, workers, max_pending, timeout=30, retry_after=1):
+        with self._configure_lock:
+            if self._slots is not None:
+                self._drain()
+            self.rounds = rounds
+            self.workers = workers
+            self.max_pending = max_pending
+            self.timeout = timeout
+            self.retry_after = retry_after
+            self._slots = threading.BoundedSemaphore(max_pending)
+
+    def _drain(self):
+        """Wait for the jobs in flight, then shut the old pool down"""
+        # Taking every slot turns new callers away (PasswordHasherBusy) and
+        # returns once the jobs holding the others have finished
+        deadline = time.monotonic() + self.timeout
+        drained = all(self._slots.acquire(timeout=max(0, deadline - time.monotonic()))
+                      for _ in range(self.max_pending))
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            # A job stuck past the timeout keeps releasing the semaphore it
+            # was submitted with, never the new one
+            pool.shutdown(wait=drained, cancel_futures=not drained)
+
+    def _get_pool(self):
+        # Created lazily so every forked server worker gets its own pool
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _discard_pool(self, pool):
+        """Drop a pool whose worker died so the next job starts a fresh one"""
+        with self._pool_lock:
+            if self._pool is pool:
+                self._pool = None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _submit(self, pool, slots, fn, args):
+        future = pool.submit(fn, *args)
+        # The slot stays taken until the job actually finishes, even when the
+        # caller stops waiting, so abandoned jobs still count against max_pending
+        future.add_done_callback(lambda _: slots.release())
+        return future
+
+    def _run(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many password operations in progress')
+        started = time.perf_counter()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+                record_bcrypt(time.perf_counter() - started)
+
+        pool = None
+        try:
+            pool = self._get_pool()
+            future = self._submit(pool, slots, fn, args)
+        except BaseException as e:
+            slots.release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard_pool(pool)
+                raise PasswordHasherBusy('Password worker restarted')
+            raise
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy('Password operation timed out')
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise PasswordHasherBusy('Password worker restarted')
+        finally:
+            record_bcrypt(time.perf_counter() - started)
+
+    def _run_many(self, fn, calls):
+        """Submit every call at once, each holding a slot, and gather the results in order"""
+        slots = self._slots
+        acquired = 0
+        while acquired < len(calls) and slots.acquire(blocking=False):
+            acquired += 1
+        if acquired < len(calls):
+            for _ in range(acquired):
+                slots.release()
+            raise PasswordHasherBusy('Too many password operations in progress')
+        started = time.perf_counter()
+        pool = None
+        futures = []
+        try:
+            pool = self._get_pool()
+            for args in calls:
+                futures.append(self._submit(pool, slots, fn, args))
+        except BaseException as e:
+            for _ in range(len(calls) - len(futures)):
+                slots.release()
+            if isinstance(e, BrokenProcessPool):
+                self._discard_pool(pool)
+                raise PasswordHasherBusy('Password worker restarted')
+            raise
+        deadline = time.monotonic() + self.timeout
+        try:
+            return [future.result(timeout=max(0, deadline - time.monotonic())) for future in futures]
+        except FutureTimeoutError:
+            raise PasswordHasherBusy('Password operation timed out')
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise PasswordHasherBusy('Password worker restarted')
+        finally:
+            record_bcrypt(time.perf_counter() - started)
+
+    def hash(self, password):
+        return self._run(_hashpw, password.encode('utf-8'), self.rounds)
+
+    def hash_many(self, passwords):
+        """
+        Hash a batch in parallel on the pool.
+
+        Jobs are submitted together in waves of up to half the pending slots,
+        so logins keep the other half; PasswordHasherBusy when a wave does
+        not fit.
+        """
+        if not self.workers:
+            return [self.hash(password) for password in passwords]
+        wave = max(1, self.max_pending // 2)
+        hashes = []
+        for start in range(0, len(passwords), wave):
+            hashes.extend(self._run_many(_hashpw, [(password.encode('utf-8'), self.rounds)
+                                                   for password in passwords[start:start + wave]]))
+        return hashes
+
+    def verify(self, password, password_hash):
+        return self._run(_checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        """True when a stored hash was made with a different cost factor"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,163 @@
+"""
+Opt-in N+1 and slow-query detector for development and the check scripts.
+
+Engine events group the statements of each request by normalized SQL
+(literals and IN lists collapsed), and an ORM event tags lazy relationship
+loads with the class they were loaded from. When a request finishes, any
+SELECT shape that ran QUERY_DETECTOR_REPEAT_THRESHOLD times or more is
+reported as a likely N+1, and statements slower than QUERY_DETECTOR_SLOW_MS
+are reported with their parameters and EXPLAIN plan (taken when they ran).
+Reports go to the app logger; with QUERY_DETECTOR_RAISE the request also
+fails with QueryProblem, so the check scripts stop on a regression.
+"""
+
+import re
+import time
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERALS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LISTS = re.compile(r'\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)')
+
+
+class QueryProblem(AssertionError):
+    """Raised at the end of a request with problems when QUERY_DETECTOR_RAISE is set"""
+
+
+def normalize_sql(statement):
+    """Statement shape: literals become ?, parameter lists become (...)"""
+    shape = _STRING_LITERALS.sub('?', statement)
+    shape = _NUMBER_LITERALS.sub('?', shape)
+    shape = _IN_LISTS.sub('(...)', shape)
+    return ' '.join(shape.split())
+
+
+def explain(dbapi_connection, dialect_name, statement, parameters):
+    """Query plan lines for a SELECT, read on a raw cursor so no events fire"""
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect_name == 'sqlite' else 'EXPLAIN '
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+    except Exception as e:
+        return [f'EXPLAIN failed: {e}']
+    finally:
+        cursor.close()
+    if dialect_name == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [' | '.join(str(value) for value in row) for row in rows]
+
+
+class QueryDetector:
+    """Per-request statement groups and the checks run on them"""
+
+    def __init__(self):
+        self.enabled = False
+        self.repeat_threshold = 5
+        self.slow_seconds = 0.1
+        self.raise_on_problem = False
+
+    def configure(self, enabled, repeat_threshold, slow_ms, raise_on_problem):
+        self.enabled = enabled
+        self.repeat_threshold = repeat_threshold
+        self.slow_seconds = slow_ms / 1000
+        self.raise_on_problem = raise_on_problem
+
+    def _start(self):
+        # shape -> {'count', 'seconds', 'parameters' (first seen), 'origins'}
+        g._query_groups = {}
+        g._query_problems = []
+        g._query_origin = None
+
+    def _finish(self, response):
+        groups = g.pop('_query_groups', None)
+        if groups is None:
+            return response
+        problems = g.pop('_query_problems', [])
+        for shape, group in groups.items():
+            if group['count'] < self.repeat_threshold or not shape.upper().startswith('SELECT'):
+                continue
+            origins = ', '.join(sorted(group['origins'])) or 'direct queries'
+            problems.append(
+                f"possible N+1 in {request.endpoint}: {group['count']} x ({origins}), "
+                f"{group['seconds'] * 1000:.1f}ms total\n  {shape}\n  first parameters: {group['parameters']!r}"
+            )
+        for problem in problems:
+            current_app.logger.warning(problem)
+        if problems and self.raise_on_problem:
+            raise QueryProblem('\n'.join(problems))
+        return response
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany, seconds):
+        groups = g._query_groups
+        shape = normalize_sql(statement)
+        group = groups.get(shape)
+        if group is None:
+            group = groups[shape] = {'count': 0, 'seconds': 0.0, 'parameters': parameters, 'origins': set()}
+        group['count'] += 1
+        group['seconds'] += seconds
+        if g._query_origin:
+            group['origins'].add(g._query_origin)
+
+        if seconds >= self.slow_seconds:
+            plan = []
+            if not executemany and shape.upper().startswith('SELECT'):
+                plan = explain(cursor.connection, conn.dialect.name, statement, parameters)
+            g._query_problems.append(
+                f"slow query in {request.endpoint}: {seconds * 1000:.1f}ms\n  {' '.join(statement.split())}\n"
+                f"  parameters: {parameters!r}" + ''.join(f'\n  plan: {line}' for line in plan)
+            )
+
+
+query_detector = QueryDetector()
+
+
+def _active():
+    return has_request_context() and '_query_groups' in g
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _active():
+        context._detector_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_detector_started', None)
+    if started is not None and _active():
+        query_detector._record(conn, cursor, statement, parameters, context, executemany,
+                               time.perf_counter() - started)
+
+
+def _do_orm_execute(orm_execute_state):
+    # Run the lazy load here so its statements know where they came from
+    if not orm_execute_state.is_relationship_load or not _active():
+        return None
+    parent = orm_execute_state.lazy_loaded_from
+    previous = g._query_origin
+    g._query_origin = f'lazy load from {parent.class_.__name__}' if parent is not None else 'relationship load'
+    try:
+        return orm_execute_state.invoke_statement()
+    finally:
+        g._query_origin = previous
+
+
+def install_query_detector(app, engines, session_class):
+    """Register the detector on ``app``, ``engines`` and ORM sessions of ``session_class``"""
+    query_detector.configure(
+        app.config['QUERY_DETECTOR'],
+        app.config['QUERY_DETECTOR_REPEAT_THRESHOLD'],
+        app.config['QUERY_DETECTOR_SLOW_MS'],
+        app.config['QUERY_DETECTOR_RAISE']
+    )
+    if not query_detector.enabled:
+        return
+    for engine in engines:
+        if not event.contains(engine, 'after_cursor_execute', _after_cursor_execute):
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    if not event.contains(session_class, 'do_orm_execute', _do_orm_execute):
+        event.listen(session_class, 'do_orm_execute', _do_orm_execute)
+    app.before_request(query_detector._start)
+    app.after_request(query_detector._finish)
@@ -0,0 +1,227 @@
+"""
+Response cache for read-heavy listings.
+
+Cached bodies are keyed by namespace, generation and request parameters.
+Write routes call ``invalidate()``, which bumps the namespace generation so
+every older entry becomes unreachable at once. The generation lives in a
+SQLite file that every worker on the host shares (read at most once per
+GENERATION_TTL per worker), so a write on one worker retires the entries of
+all of them within that time. Two backends hold the bodies: an in-process
+LRU per worker, and the same SQLite file (shared by the workers).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from utils.shared_file import SharedFile
+
+# Hits refresh an entry's accessed_at at most this often (seconds), so a hot
+# key does not turn every read into a write
+TOUCH_INTERVAL = 1.0
+# How long a worker trusts the generation it last read (seconds)
+GENERATION_TTL = 1.0
+
+CACHE_SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS entries ('
+    'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+    'expires_at REAL NOT NULL, accessed_at REAL NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)',
+    'CREATE TABLE IF NOT EXISTS generations ('
+    'namespace TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+]
+
+
+class SharedGenerations:
+    """Namespace generations in the shared file, cached briefly per worker"""
+
+    def __init__(self, shared, ttl=GENERATION_TTL):
+        self.shared = shared
+        self.ttl = ttl
+        self._cached = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace):
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cached.get(namespace)
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        row = self.shared.connect().execute(
+            'SELECT value FROM generations WHERE namespace = ?', (namespace,)
+        ).fetchone()
+        return self._remember(namespace, row[0] if row else 0)
+
+    def bump(self, namespace):
+        conn = self.shared.connect()
+        conn.execute('INSERT INTO generations (namespace, value) VALUES (?, 1) '
+                     'ON CONFLICT(namespace) DO UPDATE SET value = value + 1', (namespace,))
+        row = conn.execute('SELECT value FROM generations WHERE namespace = ?', (namespace,)).fetchone()
+        # This worker sees its own write at once; the others within the TTL
+        return self._remember(namespace, row[0])
+
+    def _remember(self, namespace, value):
+        with self._lock:
+            self._cached[namespace] = (value, time.monotonic() + self.ttl)
+        return value
+
+
+class LRUBackend:
+    """In-process LRU of bodies; generations come from the shared file"""
+
+    name = 'lru'
+
+    def __init__(self, generations, max_entries=256, ttl=300):
+        self.generations = generations
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generation(self, namespace):
+        return self.generations.get(namespace)
+
+    def bump(self, namespace):
+        self.generations.bump(namespace)
+        # Other workers' old entries are unreachable now and age out of their LRU
+        with self._lock:
+            prefix = f'{namespace}:'
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def size(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """Bodies in the shared file too, so every worker on the host reuses them"""
+
+    name = 'sqlite'
+
+    def __init__(self, shared, generations, max_entries=1024, ttl=300):
+        self.shared = shared
+        self.generations = generations
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+    def get(self, key):
+        now = time.time()
+        conn = self.shared.connect()
+        row = conn.execute(
+            'SELECT value, accessed_at FROM entries WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < now - TOUCH_INTERVAL:
+            # Keeps eviction least-recently-used rather than oldest-inserted
+            conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+        return row[0]
+
+    def set(self, key, value):
+        now = time.time()
+        conn = self.shared.connect()
+        conn.execute('INSERT OR REPLACE INTO entries (key, value, expires_at, accessed_at) '
+                     'VALUES (?, ?, ?, ?)', (key, value, now + self.ttl, now))
+        conn.execute('DELETE FROM entries WHERE key IN (SELECT key FROM entries '
+                     'ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def generation(self, namespace):
+        return self.generations.get(namespace)
+
+    def bump(self, namespace):
+        self.generations.bump(namespace)
+        self.shared.connect().execute('DELETE FROM entries WHERE key >= ? AND key < ?',
+                                      (f'{namespace}:', f'{namespace};'))
+
+    def size(self):
+        return self.shared.connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+
+class ResponseCache:
+    """Cache of serialized response bodies for one endpoint family"""
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.backend = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def configure(self, backend):
+        self.backend = backend
+        self.hits = self.misses = 0
+
+    def key(self, params):
+        """Build a cache key for the current generation; None when caching is off"""
+        if self.backend is None:
+            return None
+        generation = self.backend.generation(self.namespace)
+        return f'{self.namespace}:{generation}:{urlencode(sorted(params.items()))}'
+
+    def get(self, key):
+        if key is None:
+            return None
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if key is not None:
+            self.backend.set(key, value)
+
+    def invalidate(self):
+        if self.backend is not None:
+            self.backend.bump(self.namespace)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.backend.name if self.backend else None,
+            'generation': self.backend.generation(self.namespace) if self.backend else None,
+            'entries': self.backend.size() if self.backend else 0,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else None,
+        }
+
+
+opportunity_cache = ResponseCache('opportunities')
+
+
+def configure_response_caches(config):
+    """Create the backend chosen by RESPONSE_CACHE_BACKEND ('lru', 'sqlite' or 'none')"""
+    kind = config['RESPONSE_CACHE_BACKEND']
+    # Opened on the first cached request, not here
+    shared = SharedFile(config['RESPONSE_CACHE_PATH'], CACHE_SCHEMA)
+    generations = SharedGenerations(shared)
+    if kind == 'lru':
+        backend = LRUBackend(generations, config['RESPONSE_CACHE_SIZE'], config['RESPONSE_CACHE_TTL'])
+    elif kind == 'sqlite':
+        backend = SQLiteBackend(shared, generations,
+                                config['RESPONSE_CACHE_SIZE'], config['RESPONSE_CACHE_TTL'])
+    else:
+        backend = None
+    opportunity_cache.configure(backend)
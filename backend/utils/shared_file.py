@@ -0,0 +1,39 @@
+"""
+A SQLite file shared by the worker processes on one host.
+
+Holds small pieces of state that every worker has to agree on without a
+server of its own, such as the response cache's generations. Nothing is
+opened until the first query, so building the app does no file I/O; the
+directory and the schema are created then.
+"""
+
+import os
+import sqlite3
+import threading
+
+
+class SharedFile:
+    """Lazily created SQLite file with one connection per thread"""
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self.schema = tuple(schema)
+        self._local = threading.local()
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if not self._ready:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._lock:
+                if not self._ready:
+                    for statement in self.schema:
+                        conn.execute(statement)
+                    self._ready = True
+            self._local.conn = conn
+        return conn
@@ -0,0 +1,47 @@
+import csv
+import io
+from flask import Response, current_app, stream_with_context
+
+
+def ndjson_response(rows):
+    """Stream an iterable of dicts as newline-delimited JSON"""
+    def generate():
+        for row in rows:
+            yield current_app.json.dumps(row) + '\n'
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+def json_array_response(key, rows):
+    """Stream an iterable of dicts as ``{"<key>": [...]}`` without buffering the list"""
+    def generate():
+        yield '{"%s": [' % key
+        first = True
+        for row in rows:
+            yield ('' if first else ',') + current_app.json.dumps(row)
+            first = False
+        yield ']}'
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+
+def _csv_safe(value):
+    # Keep spreadsheet apps from evaluating user-entered text as formulas
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@'):
+        return "'" + value
+    return value
+
+
+def csv_response(columns, rows, filename):
+    """Stream an iterable of dicts as CSV with the given column order"""
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_csv_safe(row.get(column)) for column in columns])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+    response = Response(stream_with_context(generate()), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
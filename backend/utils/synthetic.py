@@ -0,0 +1,232 @@
+"""
+Synthetic data at production scale for benchmarks and index work.
+
+Rows are generated in numpy and written with executemany inserts, one
+transaction per chunk, with explicit ids so profiles and applications can
+reference users and opportunities without reading them back. Every user
+shares one precomputed bcrypt hash of the same password. Distributions are
+skewed the way real data is: most users are students, cgpa clusters around
+7, a few alumni post most opportunities and a few opportunities get most
+applications.
+
+Generation only appends to existing tables, so it can run on top of the
+default users. Counters are rebuilt and the opportunity caches invalidated
+at the end.
+"""
+
+from datetime import datetime, timedelta
+import numpy as np
+from models import db, User, AlumniProfile, StudentProfile, Opportunity, Application
+from models.recommendations import opportunity_index
+from models.stats import recount_stats
+from utils.auth import user_cache
+from utils.passwords import hash_password
+from utils.response_cache import opportunity_cache
+
+DEFAULT_CHUNK_SIZE = 50000
+DEFAULT_PASSWORD = 'admin123'
+
+ALUMNI_SHARE = 0.15
+CATEGORIES = ['General', 'OBC', 'SC', 'ST', 'EWS']
+CATEGORY_WEIGHTS = [0.45, 0.27, 0.15, 0.08, 0.05]
+TYPES = ['internship', 'scholarship', 'mentorship', 'success_story']
+TYPE_WEIGHTS = [0.5, 0.2, 0.2, 0.1]
+STATUSES = ['pending', 'accepted', 'declined']
+STATUS_WEIGHTS = [0.7, 0.1, 0.2]
+MIN_CGPA_CHOICES = [None, 6.0, 6.5, 7.0, 7.5, 8.0, 8.5]
+MIN_CGPA_WEIGHTS = [0.4, 0.15, 0.1, 0.15, 0.1, 0.07, 0.03]
+
+FIRST_NAMES = ['Aarav', 'Aditi', 'Arjun', 'Diya', 'Ishaan', 'Kavya', 'Meera', 'Nikhil', 'Priya',
+               'Rahul', 'Riya', 'Rohan', 'Sanya', 'Vikram', 'Ananya', 'Karan', 'Neha', 'Sameer']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Reddy', 'Nair', 'Gupta', 'Singh', 'Das', 'Menon',
+              'Kulkarni', 'Joshi', 'Rao', 'Mehta', 'Bose', 'Khan', 'Verma']
+COMPANIES = ['Tech Corp', 'Infosys', 'TCS', 'Wipro', 'Google', 'Microsoft', 'Amazon', 'Flipkart',
+             'Zoho', 'Freshworks', 'Razorpay', 'Swiggy', 'Accenture', 'Deloitte', 'ISRO']
+DOMAINS = ['Computer Science', 'Electronics', 'Mechanical', 'Civil', 'Finance', 'Data Science',
+           'Product Management', 'Research']
+LOCATIONS = ['Bengaluru', 'Hyderabad', 'Chennai', 'Pune', 'Mumbai', 'Delhi', 'Kochi', 'Remote']
+SKILLS = ['python', 'java', 'data', 'machine learning', 'cloud', 'security', 'design', 'finance',
+          'research', 'marketing', 'robotics', 'web', 'embedded', 'analytics', 'devops', 'sql']
+ROLES = ['Engineer', 'Analyst', 'Intern', 'Researcher', 'Developer', 'Designer', 'Fellow']
+
+
+def _chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def _skewed(rng, size, count, exponent):
+    """Indexes in [0, count) where low indexes are drawn far more often"""
+    return np.minimum((rng.random(size) ** exponent * count).astype(np.int64), count - 1)
+
+
+def _next_id(model):
+    return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+
+def _insert(model, rows):
+    db.session.execute(model.__table__.insert(), rows)
+
+
+def generate_users(rng, count, first_id, password_hash, chunk_size, now):
+    """Insert users with profiles; returns (student ids, alumni ids) as arrays"""
+    ids = np.arange(first_id, first_id + count)
+    is_alumni = rng.random(count) < ALUMNI_SHARE
+    for start, size in _chunks(count, chunk_size):
+        chunk = ids[start:start + size]
+        alumni = is_alumni[start:start + size]
+        first = rng.integers(len(FIRST_NAMES), size=size)
+        last = rng.integers(len(LAST_NAMES), size=size)
+        age = rng.integers(0, 3 * 365 * 24 * 60, size=size)
+        _insert(User, [{
+            'id': int(user_id),
+            'name': f'{FIRST_NAMES[f]} {LAST_NAMES[l]}',
+            'email': f'user{user_id}@synthetic.example.com',
+            'password_hash': password_hash,
+            'role': 'alumni' if is_alum else 'student',
+            'token_version': 1,
+            'created_at': now - timedelta(minutes=int(minutes)),
+        } for user_id, is_alum, f, l, minutes in zip(chunk, alumni, first, last, age)])
+
+        students = chunk[~alumni]
+        cgpa = np.clip(rng.normal(7.2, 1.1, size=len(students)), 4.0, 10.0).round(2)
+        category = rng.choice(len(CATEGORIES), size=len(students), p=CATEGORY_WEIGHTS)
+        location = rng.integers(len(LOCATIONS), size=len(students))
+        if len(students):
+            _insert(StudentProfile, [{
+                'user_id': int(user_id), 'cgpa': float(c), 'category': CATEGORIES[k],
+                'location': LOCATIONS[loc],
+            } for user_id, c, k, loc in zip(students, cgpa, category, location)])
+
+        alumni_ids = chunk[alumni]
+        company = rng.integers(len(COMPANIES), size=len(alumni_ids))
+        domain = rng.integers(len(DOMAINS), size=len(alumni_ids))
+        if len(alumni_ids):
+            _insert(AlumniProfile, [{
+                'user_id': int(user_id), 'company': COMPANIES[c], 'domain': DOMAINS[d],
+                'occupation': f'{DOMAINS[d]} {ROLES[d % len(ROLES)]}',
+                'location': LOCATIONS[(c + d) % len(LOCATIONS)],
+            } for user_id, c, d in zip(alumni_ids, company, domain)])
+        db.session.commit()
+    return ids[~is_alumni], ids[is_alumni]
+
+
+def generate_opportunities(rng, count, first_id, alumni_ids, chunk_size, now):
+    """Insert opportunities, most of them posted by a few alumni; returns their ids"""
+    ids = np.arange(first_id, first_id + count)
+    # Shuffle so the prolific posters are not simply the oldest accounts
+    posters = rng.permutation(alumni_ids)
+    for start, size in _chunks(count, chunk_size):
+        poster = posters[_skewed(rng, size, len(posters), 3)]
+        kind = rng.choice(len(TYPES), size=size, p=TYPE_WEIGHTS)
+        min_cgpa = rng.choice(len(MIN_CGPA_CHOICES), size=size, p=MIN_CGPA_WEIGHTS)
+        category = rng.choice(len(CATEGORIES) + 1, size=size, p=[0.5] + [w / 2 for w in CATEGORY_WEIGHTS])
+        company = rng.integers(len(COMPANIES), size=size)
+        location = rng.integers(len(LOCATIONS), size=size)
+        skills = rng.integers(len(SKILLS), size=(size, 3))
+        age = rng.integers(0, 365 * 24 * 60, size=size)
+        # About a quarter have passed their deadline, a tenth have none
+        deadline = rng.integers(-60, 180, size=size)
+        no_deadline = rng.random(size) < 0.1
+        _insert(Opportunity, [{
+            'id': int(opportunity_id),
+            'alumni_id': int(poster[i]),
+            'type': TYPES[kind[i]],
+            'title': f'{SKILLS[skills[i, 0]].title()} {ROLES[i % len(ROLES)]} at {COMPANIES[company[i]]}',
+            'description': (f'Work on {SKILLS[skills[i, 0]]} and {SKILLS[skills[i, 1]]} '
+                            f'with the {COMPANIES[company[i]]} team in {LOCATIONS[location[i]]}.'),
+            'requirements': f'Experience with {SKILLS[skills[i, 2]]}',
+            'min_cgpa': MIN_CGPA_CHOICES[min_cgpa[i]],
+            'category': CATEGORIES[category[i] - 1] if category[i] else None,
+            'company': COMPANIES[company[i]],
+            'location': LOCATIONS[location[i]],
+            'duration': None,
+            'stipend': None,
+            'deadline': None if no_deadline[i] else (now + timedelta(days=int(deadline[i]))).date(),
+            'created_at': now - timedelta(minutes=int(age[i])),
+        } for i, opportunity_id in enumerate(ids[start:start + size])])
+        db.session.commit()
+    return ids
+
+
+def generate_applications(rng, count, first_id, student_ids, opportunity_ids, chunk_size, now):
+    """
+    Insert about ``count`` unique (student, opportunity) applications; returns how many.
+
+    Students are processed in slices with a share of the total proportional
+    to the slice, so pairs only need deduplicating within a slice.
+    """
+    if not count or not len(student_ids) or not len(opportunity_ids):
+        return 0
+    popular = rng.permutation(opportunity_ids)
+    per_student = count / len(student_ids)
+    students_per_slice = max(1, int(chunk_size / max(per_student, 1)))
+    next_id, created = first_id, 0
+    for start, size in _chunks(len(student_ids), students_per_slice):
+        wanted = min(round((start + size) * per_student) - created, size * len(popular))
+        if wanted <= 0:
+            continue
+        students = student_ids[start:start + size]
+        pairs = np.empty(0, dtype=np.int64)
+        # Popular opportunities collide often; draw again until the slice is full
+        for _ in range(10):
+            draw = int((wanted - len(pairs)) * 1.2) + 1
+            student = students[rng.integers(size, size=draw)]
+            opportunity = popular[_skewed(rng, draw, len(popular), 2)]
+            pairs = np.unique(np.concatenate([pairs, student * (popular.max() + 1) + opportunity]))
+            if len(pairs) >= wanted:
+                break
+        pairs = rng.permutation(pairs)[:wanted]
+        students, opportunities = np.divmod(pairs, popular.max() + 1)
+        status = rng.choice(len(STATUSES), size=len(pairs), p=STATUS_WEIGHTS)
+        age = rng.integers(0, 180 * 24 * 60, size=len(pairs))
+        _insert(Application, [{
+            'id': next_id + i, 'student_id': int(s), 'opportunity_id': int(o),
+            'status': STATUSES[k], 'resume_file': None,
+            'applied_at': now - timedelta(minutes=int(minutes)),
+        } for i, (s, o, k, minutes) in enumerate(zip(students, opportunities, status, age))])
+        db.session.commit()
+        next_id += len(pairs)
+        created += len(pairs)
+    return created
+
+
+def generate_dataset(users, opportunities, applications, chunk_size=DEFAULT_CHUNK_SIZE,
+                     seed=0, password=DEFAULT_PASSWORD, rounds=4, progress=None):
+    """
+    Append a synthetic dataset to the current database; returns row counts.
+
+    Every generated user can log in with ``password``. ``rounds`` is the
+    bcrypt cost of the shared hash; logins upgrade it to BCRYPT_LOG_ROUNDS
+    like imported users. ``progress`` is called with a message per table.
+    """
+    report = progress or (lambda message: None)
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    password_hash = hash_password(password, rounds)
+
+    report(f'users: {users}')
+    student_ids, alumni_ids = generate_users(rng, users, _next_id(User), password_hash, chunk_size, now)
+    if opportunities and not len(alumni_ids):
+        alumni_ids = np.array([row[0] for row in db.session.query(User.id).filter_by(role='alumni')])
+    report(f'opportunities: {opportunities}')
+    opportunity_ids = (generate_opportunities(rng, opportunities, _next_id(Opportunity), alumni_ids,
+                                              chunk_size, now)
+                       if opportunities and len(alumni_ids) else np.empty(0, dtype=np.int64))
+    report(f'applications: {applications}')
+    created = generate_applications(rng, applications, _next_id(Application), student_ids,
+                                    opportunity_ids, chunk_size, now)
+
+    report('counters')
+    recount_stats()
+    db.session.commit()
+    opportunity_cache.invalidate()
+    opportunity_index.invalidate()
+    user_cache.clear()
+    return {
+        'users': users,
+        'students': len(student_ids),
+        'alumni': len(alumni_ids),
+        'opportunities': len(opportunity_ids),
+        'applications': created,
+    }
@@ -1,45 +1,72 @@
-import React from 'react';
-import { mockOpportunities, mockApplications } from '../../utils/mockData';
+import React, { useState, useEffect } from 'react';
+import apiService from '../../services/api';
 import QuickActionCard from '../../components/QuickActionCard';
 
 const AlumniDashboard = () => {
-  const myOpportunities = mockOpportunities.filter(opp => opp.postedBy === 2); // Assuming current user is alumni with ID 2
-  const myApplications = mockApplications.filter(app => 
-    mockOpportunities.find(opp => opp.id === app.opportunityId)?.postedBy === 2
-  );
+  const [summary, setSummary] = useState(null);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    loadSummary();
+  }, []);
+
+  const loadSummary = async () => {
+    try {
+      // Counts and a few recent rows instead of the full listings
+      const response = await apiService.getAlumniSummary(5);
+      setSummary(response);
+      setError(null);
+    } catch (error) {
+      console.error('Failed to load dashboard summary:', error);
+      setError('Failed to load dashboard');
+    }
+  };
+
+  const handleStatusUpdate = async (applicationId, status) => {
+    try {
+      await apiService.updateApplicationStatus(applicationId, status);
+      await loadSummary();
+    } catch (error) {
+      console.error('Failed to update application status:', error);
+      setError('Failed to update application status');
+    }
+  };
+
+  const applicationsByStatus = summary?.applications_by_status || {};
 
   const stats = [
     {
       title: 'My Opportunities',
-      value: myOpportunities.length,
+      value: summary?.total_opportunities ?? 0,
       icon: '💼',
       color: 'bg-blue-500',
-      change: '+2 this month'
+      change: 'Posted by you'
     },
     {
       title: 'Total Applications',
-      value: myApplications.length,
+      value: summary?.total_applications ?? 0,
       icon: '📋',
       color: 'bg-green-500',
-      change: '+5 this week'
+      change: 'Across your opportunities'
     },
     {
       title: 'Pending Reviews',
-      value: myApplications.filter(app => app.status === 'pending').length,
+      value: summary?.pending_reviews ?? 0,
       icon: '⏳',
       color: 'bg-orange-500',
       change: 'Needs attention'
     },
     {
       title: 'Accepted Applications',
-      value: myApplications.filter(app => app.status === 'accepted').length,
+      value: applicationsByStatus.accepted ?? 0,
       icon: '✅',
       color: 'bg-purple-500',
-      change: '+3 this month'
+      change: 'Students you accepted'
     }
   ];
 
-  const recentApplications = myApplications.slice(0, 5);
+  const recentApplications = summary?.recent_applications || [];
+  const recentOpportunities = summary?.recent_opportunities || [];
 
   const getStatusBadgeColor = (status) => {
     switch (status) {
@@ -62,6 +89,10 @@ const AlumniDashboard = () => {
         <p className="text-gray-600 mt-2">Welcome back! Manage your opportunities and help students succeed.</p>
       </div>
 
+      {error && (
+        <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg">{error}</div>
+      )}
+
       {/* Stats Grid */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
         {stats.map((stat, index) => (
@@ -101,41 +132,46 @@ const AlumniDashboard = () => {
         </div>
         
         <div className="space-y-4">
-          {recentApplications.map((application) => {
-            const opportunity = mockOpportunities.find(opp => opp.id === application.opportunityId);
-            return (
-              <div key={application.id} className="flex items-center justify-between p-4 border border-gray-200 rounded-lg">
-                <div className="flex items-center space-x-4">
-                  <div className="w-10 h-10 bg-gray-200 rounded-full flex items-center justify-center">
-                    <span className="text-sm font-medium text-gray-700">
-                      {application.studentId === 5 ? 'A' : application.studentId === 6 ? 'B' : 'C'}
-                    </span>
-                  </div>
-                  <div>
-                    <p className="font-medium text-gray-900">
-                      {application.studentId === 5 ? 'Alice Brown' : 
-                       application.studentId === 6 ? 'Bob Wilson' : 'Carol Davis'}
-                    </p>
-                    <p className="text-sm text-gray-600">{opportunity?.title}</p>
-                    <p className="text-xs text-gray-500">Applied {new Date(application.appliedAt).toLocaleDateString()}</p>
-                  </div>
-                </div>
-                <div className="flex items-center space-x-3">
-                  <span className={`inline-flex px-2 py-1 text-xs font-semibold rounded-full ${getStatusBadgeColor(application.status)}`}>
-                    {application.status.charAt(0).toUpperCase() + application.status.slice(1)}
+          {recentApplications.map((application) => (
+            <div key={application.id} className="flex items-center justify-between p-4 border border-gray-200 rounded-lg">
+              <div className="flex items-center space-x-4">
+                <div className="w-10 h-10 bg-gray-200 rounded-full flex items-center justify-center">
+                  <span className="text-sm font-medium text-gray-700">
+                    {application.student_name?.charAt(0).toUpperCase()}
                   </span>
+                </div>
+                <div>
+                  <p className="font-medium text-gray-900">{application.student_name}</p>
+                  <p className="text-sm text-gray-600">{application.opportunity_title}</p>
+                  <p className="text-xs text-gray-500">Applied {new Date(application.applied_at).toLocaleDateString()}</p>
+                </div>
+              </div>
+              <div className="flex items-center space-x-3">
+                <span className={`inline-flex px-2 py-1 text-xs font-semibold rounded-full ${getStatusBadgeColor(application.status)}`}>
+                  {application.status.charAt(0).toUpperCase() + application.status.slice(1)}
+                </span>
+                {application.status === 'pending' && (
                   <div className="flex space-x-2">
-                    <button className="text-green-600 hover:text-green-700 text-sm font-medium">
+                    <button
+                      onClick={() => handleStatusUpdate(application.id, 'accepted')}
+                      className="text-green-600 hover:text-green-700 text-sm font-medium"
+                    >
                       Accept
                     </button>
-                    <button className="text-red-600 hover:text-red-700 text-sm font-medium">
+                    <button
+                      onClick={() => handleStatusUpdate(application.id, 'declined')}
+                      className="text-red-600 hover:text-red-700 text-sm font-medium"
+                    >
                       Decline
                     </button>
                   </div>
-                </div>
+                )}
               </div>
-            );
-          })}
+            </div>
+          ))}
+          {summary && recentApplications.length === 0 && (
+            <p className="text-sm text-gray-500">No applications yet.</p>
+          )}
         </div>
       </div>
 
@@ -149,20 +185,20 @@ const AlumniDashboard = () => {
         </div>
         
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-          {myOpportunities.map((opportunity) => (
+          {recentOpportunities.map((opportunity) => (
             <div key={opportunity.id} className="border border-gray-200 rounded-lg p-4 hover:shadow-md transition-shadow">
               <div className="flex items-start justify-between mb-2">
                 <h4 className="font-medium text-gray-900 text-sm">{opportunity.title}</h4>
-                <span className={`inline-flex px-2 py-1 text-xs font-semibold rounded-full ${
-                  opportunity.status === 'active' ? 'bg-green-100 text-green-800' : 'bg-gray-100 text-gray-800'
-                }`}>
-                  {opportunity.status}
+                <span className="inline-flex px-2 py-1 text-xs font-semibold rounded-full bg-green-100 text-green-800">
+                  {opportunity.type.charAt(0).toUpperCase() + opportunity.type.slice(1)}
                 </span>
               </div>
-              <p className="text-sm text-gray-600 mb-3">{opportunity.description}</p>
+              <p className="text-sm text-gray-600 mb-3">
+                {opportunity.deadline ? `Apply by ${new Date(opportunity.deadline).toLocaleDateString()}` : 'No deadline'}
+              </p>
               <div className="flex items-center justify-between text-xs text-gray-500">
-                <span>{opportunity.type.charAt(0).toUpperCase() + opportunity.type.slice(1)}</span>
-                <span>{new Date(opportunity.postedAt).toLocaleDateString()}</span>
+                <span>{opportunity.company}</span>
+                <span>{new Date(opportunity.created_at).toLocaleDateString()}</span>
               </div>
             </div>
           ))}
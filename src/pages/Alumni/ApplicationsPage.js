@@ -3,6 +3,9 @@ import { useLocation, Link } from 'react-router-dom';
 import apiService from '../../services/api';
 import { profileApi } from '../../services/profileApi';
 
+// Matches MAX_BATCH_PROFILES on the backend
+const PROFILE_BATCH_SIZE = 500;
+
 const AlumniApplicationsPage = () => {
   const location = useLocation();
   const [applications, setApplications] = useState([]);
@@ -52,26 +55,24 @@ const AlumniApplicationsPage = () => {
       try {
         const uniqueIds = Array.from(new Set((applications || []).map(a => a.student_id)));
         if (uniqueIds.length === 0) return;
+        // One request per PROFILE_BATCH_SIZE applicants instead of one per applicant
+        const batches = [];
+        for (let i = 0; i < uniqueIds.length; i += PROFILE_BATCH_SIZE) {
+          batches.push(uniqueIds.slice(i, i + PROFILE_BATCH_SIZE));
+        }
         const results = await Promise.all(
-          uniqueIds.map(async (id) => {
-            try {
-              const { profile } = await profileApi.getProfile('student', id);
-              return { id, profile };
-            } catch (e) {
-              return { id, profile: null };
-            }
-          })
+          batches.map(ids => profileApi.getProfiles('student', ids).catch(() => ({ profiles: [] })))
         );
         const map = {};
-        results.forEach(({ id, profile }) => {
-          if (profile) {
-            map[id] = {
-              id,
+        results.forEach(({ profiles }) => {
+          (profiles || []).forEach(profile => {
+            map[profile.user_id] = {
+              id: profile.user_id,
               name: profile.name,
               email: profile.email,
               profile_pic: profile.profile_pic,
             };
-          }
+          });
         });
         setStudentMap(map);
       } catch (err) {
@@ -14,9 +14,9 @@ const StudentInternshipPage = () => {
   const load = async () => {
     try {
       setLoading(true);
-      const [oppRes, appRes] = await Promise.all([
-        apiService.getOpportunities({ type: 'internship' }),
-        apiService.getMyApplications()
+      const [oppRes, appRes] = await apiService.batch([
+        { method: 'GET', path: '/student/opportunities?type=internship' },
+        { method: 'GET', path: '/student/applications' }
       ]);
       setOpportunities((oppRes.opportunities || []).filter(o => o.type === 'internship'));
       setApplications(appRes.applications || []);
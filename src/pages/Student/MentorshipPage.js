@@ -14,9 +14,9 @@ const StudentMentorshipPage = () => {
   const load = async () => {
     try {
       setLoading(true);
-      const [oppRes, appRes] = await Promise.all([
-        apiService.getOpportunities({ type: 'mentorship' }),
-        apiService.getMyApplications()
+      const [oppRes, appRes] = await apiService.batch([
+        { method: 'GET', path: '/student/opportunities?type=mentorship' },
+        { method: 'GET', path: '/student/applications' }
       ]);
       setOpportunities((oppRes.opportunities || []).filter(o => o.type === 'mentorship'));
       setApplications(appRes.applications || []);
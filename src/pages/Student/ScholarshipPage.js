@@ -14,9 +14,9 @@ const StudentScholarshipPage = () => {
   const load = async () => {
     try {
       setLoading(true);
-      const [oppRes, appRes] = await Promise.all([
-        apiService.getOpportunities({ type: 'scholarship' }),
-        apiService.getMyApplications()
+      const [oppRes, appRes] = await apiService.batch([
+        { method: 'GET', path: '/student/opportunities?type=scholarship' },
+        { method: 'GET', path: '/student/applications' }
       ]);
       setOpportunities((oppRes.opportunities || []).filter(o => o.type === 'scholarship'));
       setApplications(appRes.applications || []);
@@ -1,43 +1,62 @@
-import React from 'react';
-import { mockOpportunities, getApplicationsByStudent } from '../../utils/mockData';
+import React, { useState, useEffect } from 'react';
+import apiService from '../../services/api';
 import QuickActionCard from '../../components/QuickActionCard';
 
 const StudentDashboard = () => {
-  const myApplications = getApplicationsByStudent(5); // Assuming current user is student with ID 5
-  const availableOpportunities = mockOpportunities.filter(opp => opp.status === 'active');
+  const [summary, setSummary] = useState(null);
+  const [error, setError] = useState(null);
+
+  useEffect(() => {
+    loadSummary();
+  }, []);
+
+  const loadSummary = async () => {
+    try {
+      // Counts and a few recent rows instead of the full listings
+      const response = await apiService.getStudentSummary(3);
+      setSummary(response);
+      setError(null);
+    } catch (error) {
+      console.error('Failed to load dashboard summary:', error);
+      setError('Failed to load dashboard');
+    }
+  };
+
+  const applicationsByStatus = summary?.applications_by_status || {};
 
   const stats = [
     {
       title: 'Available Opportunities',
-      value: availableOpportunities.length,
+      value: summary?.available_opportunities ?? 0,
       icon: '💼',
       color: 'bg-blue-500',
       change: 'New opportunities available'
     },
     {
       title: 'My Applications',
-      value: myApplications.length,
+      value: summary?.total_applications ?? 0,
       icon: '📋',
       color: 'bg-green-500',
       change: 'Applications submitted'
     },
     {
       title: 'Pending Reviews',
-      value: myApplications.filter(app => app.status === 'pending').length,
+      value: summary?.pending_reviews ?? 0,
       icon: '⏳',
       color: 'bg-orange-500',
       change: 'Awaiting response'
     },
     {
       title: 'Accepted Applications',
-      value: myApplications.filter(app => app.status === 'accepted').length,
+      value: applicationsByStatus.accepted ?? 0,
       icon: '✅',
       color: 'bg-purple-500',
       change: 'Congratulations!'
     }
   ];
 
-  const recentApplications = myApplications.slice(0, 3);
+  const recentApplications = summary?.recent_applications || [];
+  const latestOpportunities = summary?.latest_opportunities || [];
 
   const getStatusBadgeColor = (status) => {
     switch (status) {
@@ -60,6 +79,10 @@ const StudentDashboard = () => {
         <p className="text-gray-600 mt-2">Welcome back! Discover opportunities and track your applications.</p>
       </div>
 
+      {error && (
+        <div className="bg-red-50 border border-red-200 text-red-700 px-4 py-3 rounded-lg">{error}</div>
+      )}
+
       {/* Stats Grid */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
         {stats.map((stat, index) => (
@@ -99,30 +122,29 @@ const StudentDashboard = () => {
         </div>
         
         <div className="space-y-4">
-          {recentApplications.map((application) => {
-            const opportunity = mockOpportunities.find(opp => opp.id === application.opportunityId);
-            return (
-              <div key={application.id} className="flex items-center justify-between p-4 border border-gray-200 rounded-lg">
-                <div className="flex items-center space-x-4">
-                  <div className="w-10 h-10 bg-gray-200 rounded-full flex items-center justify-center">
-                    <span className="text-sm font-medium text-gray-700">
-                      {opportunity?.type.charAt(0).toUpperCase()}
-                    </span>
-                  </div>
-                  <div>
-                    <p className="font-medium text-gray-900">{opportunity?.title}</p>
-                    <p className="text-sm text-gray-600">{opportunity?.company}</p>
-                    <p className="text-xs text-gray-500">Applied {new Date(application.appliedAt).toLocaleDateString()}</p>
-                  </div>
-                </div>
-                <div className="flex items-center space-x-3">
-                  <span className={`inline-flex px-2 py-1 text-xs font-semibold rounded-full ${getStatusBadgeColor(application.status)}`}>
-                    {application.status.charAt(0).toUpperCase() + application.status.slice(1)}
+          {recentApplications.map((application) => (
+            <div key={application.id} className="flex items-center justify-between p-4 border border-gray-200 rounded-lg">
+              <div className="flex items-center space-x-4">
+                <div className="w-10 h-10 bg-gray-200 rounded-full flex items-center justify-center">
+                  <span className="text-sm font-medium text-gray-700">
+                    {application.opportunity_title?.charAt(0).toUpperCase()}
                   </span>
                 </div>
+                <div>
+                  <p className="font-medium text-gray-900">{application.opportunity_title}</p>
+                  <p className="text-xs text-gray-500">Applied {new Date(application.applied_at).toLocaleDateString()}</p>
+                </div>
+              </div>
+              <div className="flex items-center space-x-3">
+                <span className={`inline-flex px-2 py-1 text-xs font-semibold rounded-full ${getStatusBadgeColor(application.status)}`}>
+                  {application.status.charAt(0).toUpperCase() + application.status.slice(1)}
+                </span>
               </div>
-            );
-          })}
+            </div>
+          ))}
+          {summary && recentApplications.length === 0 && (
+            <p className="text-sm text-gray-500">No applications yet.</p>
+          )}
         </div>
       </div>
 
@@ -136,7 +158,7 @@ const StudentDashboard = () => {
         </div>
         
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4">
-          {availableOpportunities.slice(0, 3).map((opportunity) => (
+          {latestOpportunities.map((opportunity) => (
             <div key={opportunity.id} className="border border-gray-200 rounded-lg p-4 hover:shadow-md transition-shadow">
               <div className="flex items-start justify-between mb-2">
                 <h4 className="font-medium text-gray-900 text-sm">{opportunity.title}</h4>
@@ -149,7 +171,9 @@ const StudentDashboard = () => {
                   {opportunity.type.charAt(0).toUpperCase() + opportunity.type.slice(1)}
                 </span>
               </div>
-              <p className="text-sm text-gray-600 mb-3">{opportunity.description}</p>
+              <p className="text-sm text-gray-600 mb-3">
+                {opportunity.deadline ? `Apply by ${new Date(opportunity.deadline).toLocaleDateString()}` : 'Open'}
+              </p>
               <div className="flex items-center justify-between text-xs text-gray-500">
                 <span>{opportunity.company}</span>
                 <button className="text-primary-600 hover:text-primary-700 font-medium">
@@ -63,6 +63,26 @@ class ApiService {
     }
   }
 
+  // Several calls in one round trip. Paths are written like request()'s
+  // endpoints; resolves to the bodies in order and throws on the first item
+  // that failed
+  async batch(requests) {
+    const response = await this.request('/batch', {
+      method: 'POST',
+      body: JSON.stringify({
+        requests: requests.map(({ method = 'GET', path, body }) => ({ method, path: `/api${path}`, body })),
+      }),
+    });
+
+    return response.responses.map((item, index) => {
+      if (item.status >= 400) {
+        const error = (item.body && (item.body.error || item.body.msg)) || 'Request failed';
+        throw new Error(`${requests[index].path}: ${error}`);
+      }
+      return item.body;
+    });
+  }
+
   // Authentication endpoints
   async register(userData) {
     return this.request('/auth/register', {
@@ -131,6 +151,11 @@ class ApiService {
     });
   }
 
+  // Counts and the newest few applications/opportunities for the dashboard
+  async getAlumniSummary(limit = 5) {
+    return this.request(`/alumni/summary?limit=${limit}`);
+  }
+
   async getAlumniApplications() {
     return this.request('/alumni/applications');
   }
@@ -186,6 +211,10 @@ class ApiService {
     return data;
   }
 
+  async getStudentSummary(limit = 3) {
+    return this.request(`/student/summary?limit=${limit}`);
+  }
+
   async getMyApplications() {
     return this.request('/student/applications');
   }
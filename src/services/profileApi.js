@@ -34,6 +34,11 @@ export const profileApi = {
     const qs = new URLSearchParams({ type, id: String(id) }).toString();
     return request(`/profile?${qs}`);
   },
+  // Many profiles of one type in one request; resolves to { profiles, missing }
+  async getProfiles(type, ids) {
+    const qs = new URLSearchParams({ type, ids: ids.map(String).join(',') }).toString();
+    return request(`/profiles?${qs}`);
+  },
   async updateProfile(type, id, payload) {
     const qs = new URLSearchParams({ type, id: String(id) }).toString();
     return request(`/profile?${qs}`, { method: 'PUT', body: JSON.stringify(payload) });